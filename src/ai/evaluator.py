@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+局面评估 - 基于总高度、空洞、凹凸度和消除行数的启发式评分
+
+棋盘统一表示为行位掩码元组（第col列对应第col位），可以直接作为缓存的键。
+"""
+
+from typing import Dict, NamedTuple, Optional, Tuple
+from core.board import Board
+from core.bit_board import BitBoard
+from core.piece_geometry import PieceGeometry
+
+
+Rows = Tuple[int, ...]
+
+
+class EvaluationWeights(NamedTuple):
+    """各项特征的权重"""
+    aggregate_height: float = -0.510066
+    holes: float = -0.35663
+    bumpiness: float = -0.184483
+    lines_cleared: float = 0.760666
+
+
+class BoardFeatures(NamedTuple):
+    """棋盘特征"""
+    # 每列高度（从底部算起）
+    column_heights: Tuple[int, ...]
+    aggregate_height: int
+    holes: int
+    bumpiness: int
+
+
+def board_to_rows(board: Board) -> Rows:
+    """把游戏板转换为行位掩码元组"""
+    if isinstance(board, BitBoard):
+        return tuple(board.rows)
+
+    return tuple(sum(1 << col for col, cell in enumerate(row) if cell is not None)
+                 for row in board.grid)
+
+
+def place_on_rows(rows: Rows, geometry: PieceGeometry, x: int, y: int,
+                  width: int) -> Optional[Tuple[Rows, int]]:
+    """在行掩码上放置方块并消除完整行，返回(新棋盘, 消除行数)；方块超出顶部时返回None"""
+    new_rows = list(rows)
+    for offset, mask in enumerate(geometry.row_masks):
+        if not mask:
+            continue
+
+        board_y = y + offset
+        if board_y < 0:
+            return None
+        new_rows[board_y] |= mask << x if x >= 0 else mask >> -x
+
+    full = (1 << width) - 1
+    kept = [row for row in new_rows if row != full]
+    lines_cleared = len(new_rows) - len(kept)
+    if lines_cleared:
+        kept[:0] = [0] * lines_cleared
+    return tuple(kept), lines_cleared
+
+
+class BoardEvaluator:
+    """局面评估器 - 棋盘特征按行掩码缓存，相同局面只计算一次"""
+
+    def __init__(self, width: int, weights: Optional[EvaluationWeights] = None,
+                 cache_size: int = 200000):
+        self.width = width
+        self.weights = weights if weights is not None else EvaluationWeights()
+        self.cache_size = cache_size
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self._cache: Dict[Rows, BoardFeatures] = {}
+
+    def evaluate(self, rows: Rows, lines_cleared: int = 0) -> float:
+        """计算局面得分，越高越好"""
+        features = self.get_features(rows)
+        weights = self.weights
+        return (weights.aggregate_height * features.aggregate_height +
+                weights.holes * features.holes +
+                weights.bumpiness * features.bumpiness +
+                weights.lines_cleared * lines_cleared)
+
+    def get_features(self, rows: Rows) -> BoardFeatures:
+        """获取棋盘特征（带缓存）"""
+        features = self._cache.get(rows)
+        if features is not None:
+            self.cache_hits += 1
+            return features
+
+        self.cache_misses += 1
+        if len(self._cache) >= self.cache_size:
+            self._cache.clear()
+        features = self._cache[rows] = self._compute_features(rows)
+        return features
+
+    def clear_cache(self):
+        """清空缓存和计数"""
+        self._cache.clear()
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    def _compute_features(self, rows: Rows) -> BoardFeatures:
+        """自上而下扫描一遍计算所有特征"""
+        height = len(rows)
+        heights = [0] * self.width
+        holes = 0
+        covered = 0  # 上方已有方块的列
+
+        # 跳过顶部的空行
+        first = 0
+        while first < height and not rows[first]:
+            first += 1
+
+        for row_index in range(first, height):
+            row = rows[row_index]
+            holes += bin(covered & ~row).count("1")
+
+            # 每列第一次出现方块的行决定该列高度
+            new_columns = row & ~covered
+            while new_columns:
+                lowest = new_columns & -new_columns
+                heights[lowest.bit_length() - 1] = height - row_index
+                new_columns ^= lowest
+            covered |= row
+
+        bumpiness = sum(abs(a - b) for a, b in zip(heights, heights[1:]))
+        return BoardFeatures(tuple(heights), sum(heights), holes, bumpiness)
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+AI玩家 - 用局面评估器为当前方块选择落点，并逐帧输出到达落点的操作
+
+搜索过的局面按Zobrist哈希存入置换表：根局面的哈希取自Board.zobrist_hash，
+子局面的哈希由父局面异或方块格子的键得到，消行时按行掩码重新计算。
+"""
+
+from collections import deque
+from typing import Iterator, List, Optional, Tuple
+from ai.evaluator import BoardEvaluator, Rows, board_to_rows, place_on_rows
+from ai.transposition import TranspositionTable
+from core.game_engine import GameEngine
+from core.piece_geometry import PieceGeometry, PIECE_GEOMETRY
+from core.placement import Placement
+from core.zobrist import get_sequence_key, get_zobrist_keys, hash_rows
+
+
+class AIPlayer:
+    """AI玩家 - 当前方块使用可到达的落点，预览方块按直接下落估计"""
+
+    def __init__(self, width: int, lookahead: int = 1,
+                 evaluator: Optional[BoardEvaluator] = None,
+                 table: Optional[TranspositionTable] = None):
+        self.width = width
+        # 向前看的预览方块数：0只考虑当前方块，1加上next_piece，更多时从方块序列中查看
+        self.lookahead = lookahead
+        self.evaluator = evaluator if evaluator is not None else BoardEvaluator(width)
+        # 置换表：局面加剩余预览方块的最优值，以及当前方块的最佳落点
+        self.table = table if table is not None else TranspositionTable()
+
+        # 当前执行中的计划：目标落点，以及(动作, 执行后的(x, y, 旋转))序列
+        self._piece = None
+        self._target = None
+        self._expected = None
+        self._plan = deque()
+
+    def get_action(self, engine: GameEngine) -> str:
+        """返回下一个操作；方块变化或位置偏离计划（例如被自动下落打断）时重新规划"""
+        game_state = engine.game_state
+        piece = game_state.current_piece
+        if piece is None or game_state.paused or game_state.game_over:
+            return "none"
+
+        x, y = game_state.get_piece_position()
+        if piece is not self._piece:
+            self._make_plan(engine, self.choose_placement(engine))
+        elif (x, y, piece.rotation) != self._expected:
+            # 目标仍可到达时只重新规划路径，不重新搜索
+            placement = next((p for p in engine.get_placements()
+                              if (p.x, p.y, p.rotation) == self._target), None)
+            self._make_plan(engine, placement or self.choose_placement(engine))
+
+        if not self._plan:
+            return "none"
+        action, self._expected = self._plan.popleft()
+        return action
+
+    def choose_placement(self, engine: GameEngine) -> Optional[Placement]:
+        """为当前方块选择得分最高的落点，没有可用落点时返回None"""
+        game_state = engine.game_state
+        piece = game_state.current_piece
+        rows = board_to_rows(engine.board)
+        board_hash = engine.board.zobrist_hash
+        preview = self._get_preview(engine)
+        # suffix_keys[depth]：剩余预览方块preview[depth:]的键
+        suffix_keys = [get_sequence_key(tuple(preview[depth:])) for depth in range(len(preview) + 1)]
+        table = self.table
+        table.new_search()
+
+        # 可到达的落点还取决于方块当前的位置和旋转状态
+        x, y = game_state.get_piece_position()
+        key = board_hash ^ get_sequence_key((f"{piece.type}@{x},{y},{piece.rotation}",) + tuple(preview))
+        placements = engine.get_placements()
+        entry = table.get(key)
+        if entry is not None:
+            cached = next((p for p in placements if (p.x, p.y, p.rotation) == entry.move), None)
+            if cached is not None:
+                return cached
+
+        weight = self.evaluator.weights.lines_cleared
+        best = None
+        best_value = float("-inf")
+        for placement in placements:
+            result = place_on_rows(rows, placement.geometry, placement.x, placement.y, self.width)
+            if result is None:
+                continue
+
+            # 叶子局面直接评估不查表，不需要哈希
+            child_hash = (self._child_hash(board_hash, result, placement.geometry, placement.x, placement.y)
+                          if preview else 0)
+            value = weight * result[1] + self._search(result[0], child_hash, preview, suffix_keys, 0)
+            if best is None or value > best_value:
+                best = placement
+                best_value = value
+
+        if best is not None:
+            table.put(key, len(preview) + 1, best_value, (best.x, best.y, best.rotation))
+        return best
+
+    def _make_plan(self, engine: GameEngine, placement: Optional[Placement]):
+        """把落点的操作序列展开为带预期状态的计划"""
+        piece = engine.game_state.current_piece
+        self._piece = piece
+        self._plan.clear()
+        x, y = engine.game_state.get_piece_position()
+        self._expected = (x, y, piece.rotation)
+
+        if placement is None:
+            self._target = None
+            return
+        self._target = (placement.x, placement.y, placement.rotation)
+
+        finder = engine.placement_finder
+        geometries = PIECE_GEOMETRY[piece.type]
+        state = self._expected
+        for action in placement.path:
+            state = dict(finder.get_moves(engine.board, geometries, *state))[action]
+            self._plan.append((action, state))
+
+    def _get_preview(self, engine: GameEngine) -> List[str]:
+        """获取向前看的方块类型"""
+        if self.lookahead <= 0 or engine.game_state.next_piece is None:
+            return []
+
+        preview = [engine.game_state.next_piece.type]
+        if self.lookahead > 1:
+            preview.extend(engine.peek_pieces(self.lookahead - 1))
+        return preview[:self.lookahead]
+
+    def _search(self, rows: Rows, board_hash: int, preview: List[str], suffix_keys: List[int],
+                depth: int) -> float:
+        """对剩余的预览方块取最优值（不含已消除行数的得分），所有落点都会封顶时返回负无穷"""
+        # 叶子局面的特征由评估器按行掩码缓存
+        if depth == len(preview):
+            return self.evaluator.evaluate(rows)
+
+        table = self.table
+        key = board_hash ^ suffix_keys[depth]
+        entry = table.get(key)
+        if entry is not None:
+            return entry.value
+
+        weight = self.evaluator.weights.lines_cleared
+        best_value = float("-inf")
+        best_move = None
+        for geometry, x, y in self._drop_placements(rows, preview[depth]):
+            result = place_on_rows(rows, geometry, x, y, self.width)
+            if result is None:
+                continue
+
+            child_hash = (self._child_hash(board_hash, result, geometry, x, y)
+                          if depth + 1 < len(preview) else 0)
+            value = weight * result[1] + self._search(result[0], child_hash, preview, suffix_keys, depth + 1)
+            if value > best_value:
+                best_value = value
+                best_move = (x, y, geometry.rotation)
+
+        table.put(key, len(preview) - depth, best_value, best_move)
+        return best_value
+
+    def _child_hash(self, board_hash: int, result: Tuple[Rows, int], geometry: PieceGeometry,
+                    x: int, y: int) -> int:
+        """放置方块后的局面哈希：没有消行时异或方块格子的键，消行时重新计算"""
+        rows, lines_cleared = result
+        if lines_cleared:
+            return hash_rows(rows, self.width)
+        cell_keys = get_zobrist_keys(self.width, len(rows)).cell_keys
+        for col, row in geometry.cells:
+            board_hash ^= cell_keys[y + row][x + col]
+        return board_hash
+
+    def _drop_placements(self, rows: Rows, piece_type: str) -> Iterator[Tuple[PieceGeometry, int, int]]:
+        """每个旋转状态在每一列直接下落的落点，下落高度由列高度和方块底部轮廓算出"""
+        heights = self.evaluator.get_features(rows).column_heights
+        top = len(rows)
+        for geometry in PIECE_GEOMETRY[piece_type]:
+            columns = [col for col, bottom in enumerate(geometry.column_bottoms) if bottom >= 0]
+            for x in range(-columns[0], self.width - columns[-1]):
+                y = min(top - heights[x + col] - 1 - geometry.column_bottoms[col]
+                        for col in columns)
+                yield geometry, x, y
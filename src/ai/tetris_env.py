@@ -0,0 +1,346 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+强化学习环境 - 用Gym风格的reset/step接口包装无界面游戏，规则与正式游戏完全一致
+
+观测是预先分配的NumPy数组，每步原地更新，不分配新数组：
+    board  uint8[高, 宽]   已固定的方块格子为1
+    piece  uint8[高, 宽]   当前方块占据的格子为1
+    state  int64[8]        当前方块类型、旋转、x、y，下一个方块类型，分数、行数、等级
+方块类型按PIECE_SHAPES的顺序从0编号，没有方块时为-1。
+
+VectorTetrisEnv在子进程中运行多个环境，观测、动作和奖励都放在共享内存中，
+每步只通过管道传递一条命令。需要安装numpy。
+"""
+
+import multiprocessing
+import random
+import signal
+from multiprocessing import shared_memory
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+import numpy as np
+from config.game_config import GameConfig
+from core.headless import HeadlessGame
+from utils.constants import PIECE_SHAPES
+
+
+PIECE_TYPES = tuple(PIECE_SHAPES.keys())
+PIECE_IDS = {piece_type: index for index, piece_type in enumerate(PIECE_TYPES)}
+
+# state向量各字段的下标
+STATE_FIELDS = ("piece", "rotation", "x", "y", "next_piece", "score", "lines", "level")
+STATE_SIZE = len(STATE_FIELDS)
+
+Action = Union[int, str]
+
+
+def make_observation(width: int, height: int) -> Dict[str, np.ndarray]:
+    """分配一个环境的观测数组"""
+    return {
+        "board": np.zeros((height, width), dtype=np.uint8),
+        "piece": np.zeros((height, width), dtype=np.uint8),
+        "state": np.zeros(STATE_SIZE, dtype=np.int64),
+    }
+
+
+class TetrisEnv:
+    """Gym风格的单个环境
+
+    动作是HeadlessGame.ACTIONS中的名称或下标。每次step执行一个动作，
+    然后空转到下一次操作时间（默认为GameConfig.AI_ACTION_DELAY，与游戏内AI模式一致），
+    奖励为这一步得到的分数。step返回的观测始终是同一组数组，需要保留历史时由调用方复制。
+    """
+
+    ACTIONS = HeadlessGame.ACTIONS
+
+    def __init__(self, config: Optional[GameConfig] = None, tick_ms: Optional[float] = None,
+                 action_ms: Optional[float] = None, game_mode: str = "classic",
+                 level_id: Optional[int] = None, max_ticks: Optional[int] = None,
+                 observation: Optional[Dict[str, np.ndarray]] = None):
+        self.game = HeadlessGame(config, tick_ms)
+        self.config = self.game.config
+        self.engine = self.game.engine
+        self.width = self.config.BOARD_WIDTH
+        self.height = self.config.BOARD_HEIGHT
+        action_ms = action_ms if action_ms is not None else self.config.AI_ACTION_DELAY
+        self.action_ticks = max(1, round(action_ms / self.game.tick_ms))
+        self.game_mode = game_mode
+        self.level_id = level_id
+        self.max_ticks = max_ticks
+
+        # 可以传入外部数组（例如共享内存），观测直接写入其中
+        if observation is None:
+            observation = make_observation(self.width, self.height)
+        self.observation = observation
+        self._board_obs = self.observation["board"]
+        self._piece_obs = self.observation["piece"]
+        self._state_obs = self.observation["state"]
+        self._action_names = {index: name for index, name in enumerate(self.ACTIONS)}
+        self._action_names.update((name, name) for name in self.ACTIONS)
+        self._board_version = -1
+        self._piece_cells: List[Tuple[int, int]] = []
+        self.ticks = 0
+
+    def reset(self, seed: Optional[int] = None) -> Dict[str, np.ndarray]:
+        """开始新的一局，返回观测"""
+        self.game.reset(self.game_mode, self.level_id, seed)
+        self.ticks = 0
+        self._board_version = -1
+        self._update_observation()
+        return self.observation
+
+    def step(self, action: Action) -> Tuple[Dict[str, np.ndarray], float, bool, dict]:
+        """执行一个动作，返回(观测, 奖励, 是否结束, 信息)
+
+        观测数组每步原地更新；信息是每步新建的字典，可以直接保存。
+        """
+        name = self._action_names.get(action)
+        if name is None:
+            raise ValueError(f"未知的动作: {action}")
+
+        game = self.game
+        state = self.engine.game_state
+        score = state.score
+        game.step(name)
+        ticks = 1
+        while ticks < self.action_ticks and not game.is_done():
+            game.step("none")
+            ticks += 1
+        self.ticks += ticks
+
+        truncated = self.max_ticks is not None and self.ticks >= self.max_ticks
+        done = game.is_done() or truncated
+        self._update_observation()
+
+        info = {"score": state.score, "lines": state.lines_cleared, "ticks": self.ticks,
+                "truncated": truncated and not game.is_done()}
+        return self.observation, float(state.score - score), done, info
+
+    def _update_observation(self):
+        """把游戏板和游戏状态写入观测数组"""
+        board = self.engine.board
+        state = self.engine.game_state
+
+        # 游戏板只在内容变化后重写，最高列以上的行整体清零
+        if board.version != self._board_version:
+            self._board_version = board.version
+            top = board.height - board.max_height
+            board_obs = self._board_obs
+            board_obs[:top] = 0
+            for row in range(top, board.height):
+                line = board_obs[row]
+                for col, cell in enumerate(board.grid[row]):
+                    line[col] = cell is not None
+
+        piece_obs = self._piece_obs
+        for col, row in self._piece_cells:
+            piece_obs[row, col] = 0
+        cells = self._piece_cells
+        cells.clear()
+
+        state_obs = self._state_obs
+        piece = state.current_piece
+        x, y = state.get_piece_position()
+        if piece is not None:
+            for dx, dy in piece.geometry.cells:
+                col, row = x + dx, y + dy
+                if 0 <= col < board.width and 0 <= row < board.height:
+                    piece_obs[row, col] = 1
+                    cells.append((col, row))
+            state_obs[0] = PIECE_IDS[piece.type]
+            state_obs[1] = piece.rotation
+        else:
+            state_obs[0] = -1
+            state_obs[1] = 0
+        state_obs[2] = x
+        state_obs[3] = y
+        state_obs[4] = PIECE_IDS[state.next_piece.type] if state.next_piece is not None else -1
+        state_obs[5] = state.score
+        state_obs[6] = state.lines_cleared
+        state_obs[7] = state.level
+
+
+def _worker(pipe, names: Dict[str, str], num_envs: int, start: int, stop: int, kwargs: dict):
+    """子进程：运行下标为[start, stop)的环境，结束的环境自动开始新的一局"""
+    # 主进程初始化过pygame时SDL会接管SIGTERM，恢复默认处理以便close时能终止子进程
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    blocks = {key: shared_memory.SharedMemory(name=name) for key, name in names.items()}
+    try:
+        _serve(pipe, blocks, num_envs, start, stop, kwargs)
+    finally:
+        _close_blocks(blocks)
+        pipe.close()
+
+
+def _serve(pipe, blocks: Dict[str, shared_memory.SharedMemory], num_envs: int, start: int,
+           stop: int, kwargs: dict):
+    """处理主进程的命令直到收到close，返回后共享内存的视图全部释放"""
+    config = kwargs.get("config") or GameConfig()
+    arrays = _attach_arrays(blocks, num_envs, config.BOARD_WIDTH, config.BOARD_HEIGHT)
+    envs = []
+    for index in range(start, stop):
+        observation = {key: arrays[key][index] for key in ("board", "piece", "state")}
+        envs.append(TetrisEnv(observation=observation, **kwargs))
+    rngs = [random.Random() for _ in envs]
+    actions, rewards, dones = arrays["actions"], arrays["rewards"], arrays["dones"]
+    scores, lines = arrays["scores"], arrays["lines"]
+
+    while True:
+        command, argument = pipe.recv()
+        if command == "step":
+            for index, env in enumerate(envs, start):
+                _, reward, done, info = env.step(int(actions[index]))
+                rewards[index] = reward
+                dones[index] = done
+                # 信息保留本局结束时的值，观测是新一局的开始
+                scores[index] = info["score"]
+                lines[index] = info["lines"]
+                if done:
+                    env.reset(rngs[index - start].getrandbits(32))
+        elif command == "reset":
+            for index, env in enumerate(envs, start):
+                seed = None if argument is None else argument + index
+                rngs[index - start].seed(seed)
+                env.reset(seed)
+                rewards[index] = 0
+                dones[index] = False
+                scores[index] = 0
+                lines[index] = 0
+        elif command == "close":
+            break
+        pipe.send(None)
+
+
+def _close_blocks(blocks: Dict[str, shared_memory.SharedMemory]):
+    """关闭共享内存块，调用方仍持有数组视图时由进程退出时释放映射"""
+    for block in blocks.values():
+        try:
+            block.close()
+        except BufferError:
+            pass
+
+
+def _array_specs(num_envs: int, width: int, height: int) -> Dict[str, Tuple[tuple, type]]:
+    """共享内存中各数组的形状和类型"""
+    return {
+        "board": ((num_envs, height, width), np.uint8),
+        "piece": ((num_envs, height, width), np.uint8),
+        "state": ((num_envs, STATE_SIZE), np.int64),
+        "actions": ((num_envs,), np.int64),
+        "rewards": ((num_envs,), np.float64),
+        "dones": ((num_envs,), np.bool_),
+        "scores": ((num_envs,), np.int64),
+        "lines": ((num_envs,), np.int64),
+    }
+
+
+def _attach_arrays(blocks: Dict[str, shared_memory.SharedMemory], num_envs: int,
+                   width: int, height: int) -> Dict[str, np.ndarray]:
+    """把共享内存块包装成NumPy数组"""
+    return {key: np.ndarray(shape, dtype=dtype, buffer=blocks[key].buf)
+            for key, (shape, dtype) in _array_specs(num_envs, width, height).items()}
+
+
+class VectorTetrisEnv:
+    """在子进程中同时运行多个环境
+
+    reset和step返回的数组都是共享内存的视图，下一次调用时原地更新；
+    infos每次返回同一个字典，其中的score、lines也是共享内存数组，需要保存时先复制。
+    某个环境结束时自动开始新的一局：这一步返回的观测是新一局的开始，
+    奖励、结束标记和infos中的分数、行数仍属于结束的那一局。
+    """
+
+    ACTIONS = HeadlessGame.ACTIONS
+
+    def __init__(self, num_envs: int, num_workers: Optional[int] = None, **kwargs):
+        config = kwargs.get("config") or GameConfig()
+        self.num_envs = num_envs
+        self.num_workers = max(1, min(num_envs, num_workers or multiprocessing.cpu_count()))
+        self.width = config.BOARD_WIDTH
+        self.height = config.BOARD_HEIGHT
+
+        self._blocks = {}
+        self._pipes = []
+        self._processes = []
+        self.closed = False
+        try:
+            for key, (shape, dtype) in _array_specs(num_envs, self.width, self.height).items():
+                size = max(1, int(np.prod(shape)) * np.dtype(dtype).itemsize)
+                self._blocks[key] = shared_memory.SharedMemory(create=True, size=size)
+            self._arrays = _attach_arrays(self._blocks, num_envs, self.width, self.height)
+            self.observation = {key: self._arrays[key] for key in ("board", "piece", "state")}
+            self.infos = {"score": self._arrays["scores"], "lines": self._arrays["lines"]}
+
+            names = {key: block.name for key, block in self._blocks.items()}
+            bounds = np.linspace(0, num_envs, self.num_workers + 1).astype(int)
+            for start, stop in zip(bounds[:-1], bounds[1:]):
+                parent, child = multiprocessing.Pipe()
+                process = multiprocessing.Process(
+                    target=_worker, args=(child, names, num_envs, int(start), int(stop), kwargs),
+                    daemon=True)
+                process.start()
+                child.close()
+                self._pipes.append(parent)
+                self._processes.append(process)
+        except BaseException:
+            self.close()
+            raise
+
+    def _broadcast(self, command: str, argument=None):
+        """向所有子进程发送命令并等待完成"""
+        for pipe in self._pipes:
+            pipe.send((command, argument))
+        for pipe in self._pipes:
+            pipe.recv()
+
+    def reset(self, seed: Optional[int] = None) -> Dict[str, np.ndarray]:
+        """重置所有环境，第i个环境使用种子seed + i"""
+        self._broadcast("reset", seed)
+        return self.observation
+
+    def step(self, actions: Sequence[Action]) -> Tuple[Dict[str, np.ndarray], np.ndarray,
+                                                       np.ndarray, Dict[str, np.ndarray]]:
+        """每个环境执行一个动作，返回(观测, 奖励, 结束标记, 信息)"""
+        if len(actions) != self.num_envs:
+            raise ValueError(f"动作数量应为{self.num_envs}，实际为{len(actions)}")
+        if isinstance(actions, np.ndarray) and actions.dtype.kind in "iu":
+            self._arrays["actions"][:] = actions
+        else:
+            for index, action in enumerate(actions):
+                self._arrays["actions"][index] = (self.ACTIONS.index(action)
+                                                  if isinstance(action, str) else action)
+        self._broadcast("step")
+        return self.observation, self._arrays["rewards"], self._arrays["dones"], self.infos
+
+    def close(self):
+        """结束子进程并释放共享内存"""
+        if self.closed:
+            return
+        self.closed = True
+        for pipe in self._pipes:
+            try:
+                pipe.send(("close", None))
+            except (BrokenPipeError, OSError):
+                pass
+        for process in self._processes:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+        for pipe in self._pipes:
+            pipe.close()
+        self._arrays = {}
+        self.observation = {}
+        self.infos = {}
+        _close_blocks(self._blocks)
+        for block in self._blocks.values():
+            block.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __del__(self):
+        if hasattr(self, "_blocks"):
+            self.close()
@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+锦标赛运行器 - 用进程池并行运行大量无界面关卡对局，汇总每个关卡的分数、行数、时间和星级分布
+
+每局使用由基础种子、关卡、机器人和局序号确定的种子，结果与进程数和完成顺序无关。
+游戏本身不使用关卡配置的speed_multiplier，默认按正常重力运行；加--level-speed时重力按该倍数加快，用于平衡关卡速度。
+
+用法（在src目录下）：
+    python -m ai.tournament --levels 1-5 --games 200
+    python -m ai.tournament --levels 11 --bots ai0,random --games 1000 --csv results.csv
+    python -m ai.tournament --levels 1-20 --games 200 --level-speed
+"""
+
+import argparse
+import csv
+import multiprocessing
+import os
+import random
+import signal
+import sys
+from typing import Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+from config.game_config import GameConfig
+from config.level_config import LevelConfig
+from core.headless import HeadlessGame
+
+
+# 单局结果
+OUTCOMES = ("complete", "failed", "game_over", "timeout")
+
+
+class GameRecord(NamedTuple):
+    """单局结果，字段都是小整数或短字符串，从工作进程传回时开销很小"""
+    level_id: int
+    bot: str
+    seed: int
+    score: int
+    lines: int
+    ticks: int
+    stars: int
+    outcome: str
+
+
+class Distribution(NamedTuple):
+    """一组数值的分布"""
+    mean: float
+    minimum: float
+    p10: float
+    p50: float
+    p90: float
+    maximum: float
+
+
+class LevelSummary(NamedTuple):
+    """一个关卡、一个机器人的汇总结果"""
+    level_id: int
+    bot: str
+    games: int
+    outcomes: Dict[str, int]
+    stars: Dict[int, int]
+    score: Distribution
+    lines: Distribution
+    seconds: Distribution
+
+
+def make_random_bot(width: int, seed: int) -> Callable[[HeadlessGame], str]:
+    """随机操作的机器人"""
+    rng = random.Random(seed)
+    return lambda game: rng.choice(HeadlessGame.ACTIONS)
+
+
+def make_ai_bot(lookahead: int) -> Callable[[int, int], Callable[[HeadlessGame], str]]:
+    """使用AIPlayer的机器人，lookahead为向前看的预览方块数"""
+    def factory(width: int, seed: int) -> Callable[[HeadlessGame], str]:
+        from ai.player import AIPlayer
+        player = AIPlayer(width, lookahead)
+        return lambda game: player.get_action(game.engine)
+    return factory
+
+
+# 机器人名称 -> factory(游戏板宽度, 种子)，返回每次操作调用的policy(game)
+BOTS = {
+    "random": make_random_bot,
+    "ai0": make_ai_bot(0),
+    "ai1": make_ai_bot(1),
+}
+
+
+def game_seed(base_seed: int, level_id: int, bot: str, index: int) -> int:
+    """对局种子，只由基础种子、关卡、机器人和局序号决定"""
+    return random.Random(f"{base_seed}:{level_id}:{bot}:{index}").getrandbits(32)
+
+
+# 每个进程复用一个无界面游戏（创建LevelManager和引擎的开销只付一次）
+_games: Dict[float, HeadlessGame] = {}
+
+
+def play_game(level_id: int, bot: str, seed: int, max_ticks: int = 36000,
+              tick_ms: Optional[float] = None, action_ms: Optional[float] = None,
+              level_speed: bool = False) -> GameRecord:
+    """运行一局关卡对局
+
+    机器人每隔action_ms（默认为GameConfig.AI_ACTION_DELAY）操作一次，与游戏内AI模式的操作频率一致；
+    达到max_ticks仍未结束的对局记为timeout。level_speed为True时重力按关卡的速度倍数加快。
+    """
+    config = GameConfig()
+    tick_ms = tick_ms if tick_ms is not None else 1000.0 / config.LOGIC_TICK_RATE
+    game = _games.get(tick_ms)
+    if game is None:
+        game = _games[tick_ms] = HeadlessGame(config, tick_ms)
+    state = game.reset(game_mode="level", level_id=level_id, seed=seed, level_speed=level_speed)
+
+    policy = BOTS[bot](config.BOARD_WIDTH, seed)
+    action_ms = action_ms if action_ms is not None else config.AI_ACTION_DELAY
+    action_ticks = max(1, round(action_ms / tick_ms))
+
+    ticks = 0
+    while ticks < max_ticks and not game.is_done():
+        game.step(policy(game) if ticks % action_ticks == 0 else "none")
+        ticks += 1
+
+    if state.level_complete:
+        outcome = "complete"
+    elif state.level_failed:
+        outcome = "failed"
+    elif state.game_over:
+        outcome = "game_over"
+    else:
+        outcome = "timeout"
+    return GameRecord(level_id, bot, seed, state.score, state.lines_cleared, ticks,
+                      state.level_stars if state.level_complete else 0, outcome)
+
+
+def _play_task(task: tuple) -> GameRecord:
+    """进程池任务：(关卡, 机器人, 种子, 最大tick数, tick毫秒数, 操作间隔毫秒数, 是否按关卡速度)"""
+    return play_game(*task)
+
+
+def _init_worker():
+    """工作进程恢复SIGTERM的默认处理
+
+    主进程初始化过pygame时SDL会接管SIGTERM，fork出的工作进程继承后，进程池结束时无法终止空闲的工作进程。
+    """
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+
+
+def make_tasks(levels: Iterable[int], bots: Sequence[str], games: int, base_seed: int = 0,
+               max_ticks: int = 36000, tick_ms: Optional[float] = None,
+               action_ms: Optional[float] = None, level_speed: bool = False) -> List[tuple]:
+    """生成所有对局任务"""
+    return [(level_id, bot, game_seed(base_seed, level_id, bot, index), max_ticks, tick_ms, action_ms,
+             level_speed)
+            for level_id in levels for bot in bots for index in range(games)]
+
+
+def run_tournament(tasks: Sequence[tuple], workers: Optional[int] = None,
+                   chunksize: int = 4) -> Iterator[GameRecord]:
+    """运行所有对局，按完成顺序逐个返回结果
+
+    workers默认为CPU核数，为1时在当前进程中运行。
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        for task in tasks:
+            yield _play_task(task)
+        return
+
+    with multiprocessing.Pool(workers, _init_worker) as pool:
+        yield from pool.imap_unordered(_play_task, tasks, chunksize)
+
+
+def get_distribution(values: Sequence[float]) -> Distribution:
+    """计算平均值、最小值、最大值和p10/p50/p90（最近秩）"""
+    ordered = sorted(values)
+    if not ordered:
+        return Distribution(0.0, 0.0, 0.0, 0.0, 0.0, 0.0)
+
+    def percentile(fraction: float) -> float:
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+    return Distribution(sum(ordered) / len(ordered), ordered[0], percentile(0.1),
+                        percentile(0.5), percentile(0.9), ordered[-1])
+
+
+class TournamentStats:
+    """按(关卡, 机器人)累计对局结果"""
+
+    def __init__(self, tick_ms: Optional[float] = None):
+        self.tick_ms = tick_ms if tick_ms is not None else 1000.0 / GameConfig.LOGIC_TICK_RATE
+        self._records: Dict[Tuple[int, str], List[GameRecord]] = {}
+
+    def add(self, record: GameRecord):
+        """加入一局结果"""
+        self._records.setdefault((record.level_id, record.bot), []).append(record)
+
+    def get_summaries(self) -> List[LevelSummary]:
+        """每个(关卡, 机器人)的汇总结果，按关卡和机器人排序"""
+        summaries = []
+        for (level_id, bot), records in sorted(self._records.items()):
+            outcomes = {outcome: 0 for outcome in OUTCOMES}
+            stars = {star: 0 for star in range(4)}
+            for record in records:
+                outcomes[record.outcome] += 1
+                stars[record.stars] = stars.get(record.stars, 0) + 1
+            summaries.append(LevelSummary(
+                level_id, bot, len(records), outcomes, stars,
+                get_distribution([r.score for r in records]),
+                get_distribution([r.lines for r in records]),
+                get_distribution([r.ticks * self.tick_ms / 1000.0 for r in records]),
+            ))
+        return summaries
+
+
+def format_summary(summary: LevelSummary, level_speed: bool = False) -> List[str]:
+    """格式化一个关卡的汇总结果，level_speed为True时显示对局使用的速度倍数"""
+    config = LevelConfig.get_level_config(summary.level_id) or {}
+    completed = summary.outcomes["complete"]
+    speed = f"速度x{config.get('speed_multiplier', 1.0)} " if level_speed else ""
+    lines = [
+        f"关卡 {summary.level_id} {config.get('name', '')} [{summary.bot}] "
+        f"{speed}目标{config.get('target_lines', '-')}行: "
+        f"{summary.games}局, 完成{completed / summary.games:.0%}, "
+        + ", ".join(f"{outcome} {count}" for outcome, count in summary.outcomes.items() if count),
+        "  星级: " + "  ".join(f"{star}星 {count / summary.games:.0%}"
+                              for star, count in sorted(summary.stars.items())),
+    ]
+    for name, dist in (("分数", summary.score), ("行数", summary.lines), ("时间(秒)", summary.seconds)):
+        lines.append(f"  {name:<8} 平均 {dist.mean:>9.1f}  最小 {dist.minimum:>8.0f}  "
+                     f"p10 {dist.p10:>8.0f}  p50 {dist.p50:>8.0f}  p90 {dist.p90:>8.0f}  "
+                     f"最大 {dist.maximum:>8.0f}")
+    return lines
+
+
+def parse_levels(text: str) -> List[int]:
+    """解析关卡列表，例如"1-5,11"或"all" """
+    if text == "all":
+        return sorted(LevelConfig.LEVELS)
+
+    levels = []
+    for part in text.split(","):
+        first, _, last = part.partition("-")
+        levels.extend(range(int(first), int(last or first) + 1))
+    unknown = [level_id for level_id in levels if LevelConfig.get_level_config(level_id) is None]
+    if unknown:
+        raise ValueError(f"未知的关卡: {unknown}")
+    return levels
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """命令行入口"""
+    parser = argparse.ArgumentParser(description="关卡锦标赛：并行运行无界面对局并汇总结果")
+    parser.add_argument("--levels", default="all", help='关卡列表，例如"1-5,11"，默认all')
+    parser.add_argument("--bots", default="ai0", help=f"机器人列表，可选 {','.join(BOTS)}")
+    parser.add_argument("--games", type=int, default=100, help="每个关卡、每个机器人的对局数")
+    parser.add_argument("--seed", type=int, default=0, help="基础种子")
+    parser.add_argument("--workers", type=int, default=None, help="进程数，默认为CPU核数")
+    parser.add_argument("--max-ticks", type=int, default=36000, help="单局最大tick数")
+    parser.add_argument("--action-ms", type=float, default=None, help="机器人操作间隔（毫秒）")
+    parser.add_argument("--level-speed", action="store_true", help="重力按关卡配置的速度倍数加快")
+    parser.add_argument("--csv", help="把每局结果写入CSV文件")
+    args = parser.parse_args(argv)
+
+    bots = args.bots.split(",")
+    for bot in bots:
+        if bot not in BOTS:
+            parser.error(f"未知的机器人: {bot}")
+
+    tasks = make_tasks(parse_levels(args.levels), bots, args.games, args.seed,
+                       args.max_ticks, action_ms=args.action_ms, level_speed=args.level_speed)
+    stats = TournamentStats()
+    writer = None
+    csv_file = open(args.csv, 'w', newline='', encoding='utf-8') if args.csv else None
+    try:
+        if csv_file is not None:
+            writer = csv.writer(csv_file)
+            writer.writerow(GameRecord._fields)
+        for done, record in enumerate(run_tournament(tasks, args.workers), 1):
+            stats.add(record)
+            if writer is not None:
+                writer.writerow(record)
+            if done % 100 == 0 or done == len(tasks):
+                print(f"\r已完成 {done}/{len(tasks)} 局", end="", file=sys.stderr, flush=True)
+    finally:
+        if csv_file is not None:
+            csv_file.close()
+    print(file=sys.stderr)
+
+    for summary in stats.get_summaries():
+        print("\n".join(format_summary(summary, args.level_speed)))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+置换表 - 按Zobrist哈希缓存搜索结果（局面得分和最佳落点），容量固定
+
+每个桶有两个槽：深度优先槽保留剩余搜索深度更大（代价更高）的结果，总是替换槽保存其他结果。
+每次搜索开始时调用new_search，上一次搜索留下的结果即使深度更大也可以被替换。
+"""
+
+from typing import List, NamedTuple, Optional, Tuple
+
+
+# 落点：(x, y, 旋转)
+Move = Tuple[int, int, int]
+
+
+class TranspositionEntry(NamedTuple):
+    """置换表中的一项"""
+    key: int
+    # 剩余搜索深度，0为直接评估的局面
+    depth: int
+    value: float
+    move: Optional[Move]
+    generation: int
+
+
+class TableStats(NamedTuple):
+    """置换表的命中和替换统计"""
+    hits: int
+    misses: int
+    stores: int
+    # 覆盖了其他局面的存储次数
+    replacements: int
+    size: int
+    capacity: int
+
+    @property
+    def hit_rate(self) -> float:
+        """命中率，没有查询时为0"""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class TranspositionTable:
+    """置换表 - 2^bits个桶，每桶两个槽"""
+
+    def __init__(self, bits: int = 16):
+        self.bits = bits
+        self._mask = (1 << bits) - 1
+        self._slots: List[Optional[TranspositionEntry]] = [None] * (2 << bits)
+        self._generation = 0
+        self._size = 0
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.replacements = 0
+
+    @property
+    def capacity(self) -> int:
+        """最多保存的结果数"""
+        return len(self._slots)
+
+    @property
+    def stats(self) -> TableStats:
+        """当前的统计"""
+        return TableStats(self.hits, self.misses, self.stores, self.replacements,
+                          self._size, self.capacity)
+
+    def get(self, key: int) -> Optional[TranspositionEntry]:
+        """查找局面的结果，没有时返回None"""
+        index = (key & self._mask) << 1
+        slots = self._slots
+        entry = slots[index]
+        if entry is None or entry.key != key:
+            entry = slots[index + 1]
+            if entry is None or entry.key != key:
+                self.misses += 1
+                return None
+        self.hits += 1
+        return entry
+
+    def put(self, key: int, depth: int, value: float, move: Optional[Move] = None):
+        """保存局面的结果"""
+        index = (key & self._mask) << 1
+        slots = self._slots
+        entry = TranspositionEntry(key, depth, value, move, self._generation)
+        self.stores += 1
+
+        deep = slots[index]
+        shallow = slots[index + 1]
+        if deep is None:
+            slots[index] = entry
+            self._size += 1
+            return
+        if deep.key == key:
+            slots[index] = entry
+            return
+
+        # 深度更大或深度优先槽中是上一次搜索的结果时写入深度优先槽，原来的结果降到总是替换槽
+        if depth >= deep.depth or deep.generation != self._generation:
+            slots[index] = entry
+            slots[index + 1] = deep
+        else:
+            slots[index + 1] = entry
+        # 总是替换槽中原来是同一局面时只是更新
+        if shallow is None or shallow.key != key:
+            self._count_eviction(shallow)
+
+    def new_search(self):
+        """开始新一次搜索，之前的结果仍可查到，但不再受深度保护"""
+        self._generation += 1
+
+    def clear(self):
+        """清空所有结果和统计"""
+        self._slots = [None] * len(self._slots)
+        self._generation = 0
+        self._size = 0
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.replacements = 0
+
+    def _count_eviction(self, evicted: Optional[TranspositionEntry]):
+        """总是替换槽换成了另一个局面：原来为空时结果数加一，否则记一次替换"""
+        if evicted is None:
+            self._size += 1
+        else:
+            self.replacements += 1
@@ -17,9 +17,20 @@ class GameConfig:
     CELL_SIZE = 30
     BOARD_X = 200
     BOARD_Y = 50
+    BOARD_BACKEND = "grid"  # "grid"（二维列表）或 "bitboard"（行位掩码）
+    RENDER_MODE = "full"  # "full"（每帧全屏重绘）、"layered"（缓存棋盘层）或 "dirty"（只重绘变化区域）
+    SHOW_GHOST_PIECE = True  # 在当前方块的落地位置绘制阴影预览
+    HUD_DIGIT_ATLAS = False  # 为True时界面上的数字由预渲染的0~9字形拼接，计数器变化时不再光栅化文字
     
     # 游戏参数
-    TARGET_FPS = 60
+    TARGET_FPS = 60  # 渲染帧率上限
+    LOGIC_TICK_RATE = 60  # 逻辑tick频率（每秒），重力、计时和AI都按逻辑tick推进
+    MAX_FRAME_TIME = 250  # 单帧计入的最长时间（毫秒），超出部分丢弃，避免卡顿后长时间追赶
+    MAX_CATCH_UP_TICKS = 5  # 单帧最多执行的逻辑tick数
+    RENDER_INTERPOLATION = True  # 在上一个和当前逻辑tick之间插值绘制当前方块
+    PROFILER_ENABLED = False  # 为True时始终记录帧时间（F3切换叠加显示，显示期间总会记录）
+    PROFILER_CAPACITY = 600  # 帧时间环形缓冲保存的帧数
+    PROFILER_DUMP_PATH = None  # 设置为文件路径（.csv或.json）时，游戏结束后导出帧时间记录
     KEY_REPEAT_DELAY = 200
     KEY_REPEAT_INTERVAL = 50
     DOWN_KEY_HOLD_DELAY = 100
@@ -27,6 +38,12 @@ class GameConfig:
     DOWN_KEY_ACCELERATION_MAX = 2000
     DOWN_KEY_MIN_INTERVAL = 50
     DOWN_KEY_MAX_INTERVAL = 200
+    PIECE_RANDOMIZER = "uniform"  # "uniform"、"bag"（7-bag）或 "history"
+    REPLAY_DIR = None  # 设置为目录路径时，每局游戏录制回放文件到该目录
+    
+    # AI模式参数
+    AI_LOOKAHEAD = 1  # 向前看的预览方块数，每多一个搜索量约乘以落点数
+    AI_ACTION_DELAY = 50  # AI两次操作之间的间隔（毫秒）
     
     @classmethod
     def get_score(cls, lines_cleared: int, level: int) -> int:
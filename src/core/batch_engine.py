@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+批量游戏引擎 - 使用NumPy数组同步推进N个游戏板（经典模式）
+规则与GameEngine + HeadlessGame完全一致：Board的放置/消行、墙踢旋转、
+GameConfig的计分/等级/下落延迟，以及由模拟tick驱动的重力
+"""
+
+from typing import List, Optional, Tuple
+import numpy as np
+from config.game_config import GameConfig
+from core.game_state import GameState
+from core.piece_geometry import PIECE_GEOMETRY, WALL_KICK_OFFSETS
+from utils.constants import PIECE_COLORS
+
+
+class BatchEngine:
+    """批量游戏引擎 - 每次step对所有游戏板执行移动/旋转/下落/锁定/消行"""
+
+    # 动作编码，与HeadlessGame.ACTIONS的前五个动作顺序一致（不支持硬降）
+    ACTION_NONE = 0
+    ACTION_LEFT = 1
+    ACTION_RIGHT = 2
+    ACTION_DOWN = 3
+    ACTION_ROTATE = 4
+
+    # 方块类型编号，棋盘中存储 编号 + 1，0表示空格子
+    PIECE_TYPES = tuple(PIECE_GEOMETRY.keys())
+
+    def __init__(self, num_boards: int, config: Optional[GameConfig] = None,
+                 tick_ms: Optional[float] = None, seed: Optional[int] = None):
+        self.num_boards = num_boards
+        self.config = config if config is not None else GameConfig()
+        self.width = self.config.BOARD_WIDTH
+        self.height = self.config.BOARD_HEIGHT
+        self.tick_ms = tick_ms if tick_ms is not None else 1000.0 / self.config.LOGIC_TICK_RATE
+        self._build_geometry_tables()
+
+        n = num_boards
+        self.boards = np.zeros((n, self.height, self.width), dtype=np.uint8)
+        self.current_type = np.zeros(n, dtype=np.int64)
+        self.next_type = np.zeros(n, dtype=np.int64)
+        self.geometry = np.zeros(n, dtype=np.int64)
+        self.x = np.zeros(n, dtype=np.int64)
+        self.y = np.zeros(n, dtype=np.int64)
+        self.score = np.zeros(n, dtype=np.int64)
+        self.level = np.zeros(n, dtype=np.int64)
+        self.lines_cleared = np.zeros(n, dtype=np.int64)
+        self.drop_delay = np.zeros(n, dtype=np.int64)
+        self.game_over = np.zeros(n, dtype=bool)
+        self.pieces_spawned = np.zeros(n, dtype=np.int64)
+        self.last_drop_time = np.zeros(n, dtype=np.float64)
+        self.ticks = 0
+        self._all = np.arange(n)
+
+        self.reset(seed)
+
+    def _build_geometry_tables(self):
+        """把方块几何表展开成NumPy查找表，几何编号g对应(类型, 旋转)"""
+        cells_x, cells_y, widths, next_geometry, base = [], [], [], [], []
+        for piece_type in self.PIECE_TYPES:
+            geometries = PIECE_GEOMETRY[piece_type]
+            start = len(widths)
+            base.append(start)
+            for geometry in geometries:
+                cells_x.append([col for col, _ in geometry.cells])
+                cells_y.append([row for _, row in geometry.cells])
+                widths.append(geometry.width)
+                next_geometry.append(start + (geometry.rotation + 1) % len(geometries))
+
+        self._cells_x = np.array(cells_x, dtype=np.int64)
+        self._cells_y = np.array(cells_y, dtype=np.int64)
+        self._widths = np.array(widths, dtype=np.int64)
+        self._next_geometry = np.array(next_geometry, dtype=np.int64)
+        self._geometry_base = np.array(base, dtype=np.int64)
+        self._kicks = np.array(((0, 0),) + WALL_KICK_OFFSETS, dtype=np.int64)
+        self._drop_delay_table = np.zeros(0, dtype=np.int64)
+        self._ensure_level_tables(16)
+
+    def reset(self, seed: Optional[int] = None):
+        """重置所有游戏板"""
+        self.rng = np.random.default_rng(seed)
+        defaults = GameState()
+        self.boards[:] = 0
+        self.score[:] = defaults.score
+        self.level[:] = defaults.level
+        self.lines_cleared[:] = defaults.lines_cleared
+        self.drop_delay[:] = defaults.drop_delay
+        self.game_over[:] = False
+        self.pieces_spawned[:] = 0
+        self.ticks = 0
+        self.last_drop_time[:] = self._now()
+
+        # 与GameEngine.spawn_new_piece一致：先生成当前方块，再生成下一个方块
+        self.next_type[:] = self._draw_pieces(self.num_boards)
+        self._spawn(self._all)
+
+    def step(self, actions) -> np.ndarray:
+        """对所有游戏板执行一个动作并推进一个tick，返回game_over数组"""
+        actions = np.asarray(actions)
+        active = ~self.game_over
+
+        # 左右移动和软降
+        dx = (actions == self.ACTION_RIGHT).astype(np.int64) - (actions == self.ACTION_LEFT)
+        dy = (actions == self.ACTION_DOWN).astype(np.int64)
+        moving = np.nonzero(active & ((dx != 0) | (dy != 0)))[0]
+        if moving.size:
+            new_x = self.x[moving] + dx[moving]
+            new_y = self.y[moving] + dy[moving]
+            ok = self._is_valid(moving, self.geometry[moving], new_x, new_y)
+            self.x[moving[ok]] = new_x[ok]
+            self.y[moving[ok]] = new_y[ok]
+
+        # 旋转（含墙踢）
+        rotating = np.nonzero(active & (actions == self.ACTION_ROTATE))[0]
+        if rotating.size:
+            self._rotate(rotating)
+
+        # 重力
+        self.ticks += 1
+        now = self._now()
+        falling = np.nonzero(active & (now - self.last_drop_time > self.drop_delay / 1000.0))[0]
+        if falling.size:
+            self.last_drop_time[falling] = now
+            can_fall = self._is_valid(falling, self.geometry[falling],
+                                      self.x[falling], self.y[falling] + 1)
+            self.y[falling[can_fall]] += 1
+            locking = falling[~can_fall]
+            if locking.size:
+                self._lock(locking)
+
+        return self.game_over
+
+    def get_grid(self, index: int) -> List[List[Optional[Tuple[int, int, int]]]]:
+        """以Board.get_grid的格式获取第index个游戏板的网格"""
+        colors = [None] + [PIECE_COLORS[piece_type] for piece_type in self.PIECE_TYPES]
+        return [[colors[cell] for cell in row] for row in self.boards[index].tolist()]
+
+    def get_piece(self, index: int) -> Tuple[str, int, Tuple[int, int]]:
+        """获取第index个游戏板当前方块的(类型, 旋转, 位置)"""
+        piece_type = int(self.current_type[index])
+        rotation = int(self.geometry[index] - self._geometry_base[piece_type])
+        return self.PIECE_TYPES[piece_type], rotation, (int(self.x[index]), int(self.y[index]))
+
+    def _now(self) -> float:
+        """当前模拟时间（秒），计算方式与TickClock相同"""
+        return self.ticks * self.tick_ms / 1000.0
+
+    def _draw_pieces(self, count: int) -> np.ndarray:
+        """随机生成count个方块类型"""
+        return self.rng.integers(0, len(self.PIECE_TYPES), size=count)
+
+    def _is_valid(self, boards: np.ndarray, geometry: np.ndarray,
+                  x: np.ndarray, y: np.ndarray) -> np.ndarray:
+        """批量检查位置是否有效，规则与Board.is_valid_position一致"""
+        cx = x[:, None] + self._cells_x[geometry]
+        cy = y[:, None] + self._cells_y[geometry]
+        in_bounds = (cx >= 0) & (cx < self.width) & (cy < self.height)
+        on_board = in_bounds & (cy >= 0)
+        occupied = self.boards[boards[:, None],
+                               np.clip(cy, 0, self.height - 1),
+                               np.clip(cx, 0, self.width - 1)] != 0
+        return np.all(in_bounds & ~(on_board & occupied), axis=1)
+
+    def _rotate(self, boards: np.ndarray):
+        """批量旋转，依次尝试原位置和各墙踢偏移"""
+        geometry = self._next_geometry[self.geometry[boards]]
+        candidates = np.empty((boards.size, len(self._kicks)), dtype=bool)
+        for i, (kick_x, kick_y) in enumerate(self._kicks):
+            candidates[:, i] = self._is_valid(boards, geometry,
+                                              self.x[boards] + kick_x, self.y[boards] + kick_y)
+
+        ok = candidates.any(axis=1)
+        kick = self._kicks[np.argmax(candidates, axis=1)]
+        rotated = boards[ok]
+        self.geometry[rotated] = geometry[ok]
+        self.x[rotated] += kick[ok, 0]
+        self.y[rotated] += kick[ok, 1]
+
+    def _lock(self, boards: np.ndarray):
+        """批量锁定方块、消行、计分并生成新方块"""
+        geometry = self.geometry[boards]
+        cx = self.x[boards, None] + self._cells_x[geometry]
+        cy = self.y[boards, None] + self._cells_y[geometry]
+        visible = cy >= 0
+        rows = np.broadcast_to(boards[:, None], cx.shape)
+        values = np.broadcast_to((self.current_type[boards] + 1)[:, None], cx.shape)
+        self.boards[rows[visible], cy[visible], cx[visible]] = values[visible]
+
+        self._clear_lines(boards)
+        self._spawn(boards)
+
+    def _clear_lines(self, boards: np.ndarray):
+        """批量消行：完整行移到顶部并清空，其余行保持相对顺序"""
+        full = np.all(self.boards[boards] != 0, axis=2)
+        lines = full.sum(axis=1)
+        clearing = lines > 0
+        if not clearing.any():
+            return
+
+        boards = boards[clearing]
+        full = full[clearing]
+        lines = lines[clearing]
+        order = np.argsort(~full, axis=1, kind="stable")
+        compacted = np.take_along_axis(self.boards[boards], order[:, :, None], axis=1)
+        compacted[np.arange(self.height)[None, :] < lines[:, None]] = 0
+        self.boards[boards] = compacted
+
+        # 与GameState.update_score / update_level一致
+        level = self.level[boards]
+        self.score[boards] += self._score_table[lines, level]
+        self.lines_cleared[boards] += lines
+        new_level = GameConfig.get_level(self.lines_cleared[boards])
+        changed = new_level != level
+        if changed.any():
+            self._ensure_level_tables(int(new_level.max()))
+            self.level[boards[changed]] = new_level[changed]
+            self.drop_delay[boards[changed]] = self._drop_delay_table[new_level[changed]]
+
+    def _ensure_level_tables(self, max_level: int):
+        """按需构建由GameConfig计算的计分表和下落延迟表"""
+        if max_level < len(self._drop_delay_table):
+            return
+
+        size = max(max_level + 1, 2 * len(self._drop_delay_table))
+        # 一个方块最多占4行，因此一次最多消除4行
+        self._score_table = np.array([[GameConfig.get_score(lines, level) for level in range(size)]
+                                      for lines in range(5)], dtype=np.int64)
+        self._drop_delay_table = np.array([GameConfig.get_drop_delay(level) for level in range(size)],
+                                          dtype=np.int64)
+
+    def _spawn(self, boards: np.ndarray):
+        """批量生成新方块，规则与GameEngine.spawn_new_piece一致"""
+        self.current_type[boards] = self.next_type[boards]
+        self.next_type[boards] = self._draw_pieces(boards.size)
+        self.pieces_spawned[boards] += 1
+
+        geometry = self._geometry_base[self.current_type[boards]]
+        self.geometry[boards] = geometry
+        self.x[boards] = self.width // 2 - self._widths[geometry] // 2
+        self.y[boards] = 0
+        valid = self._is_valid(boards, geometry, self.x[boards], self.y[boards])
+        self.game_over[boards[~valid]] = True
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+位棋盘游戏板 - 每行使用整数位掩码存储，颜色存储在并行数组中
+"""
+
+from typing import List, Tuple
+from core.board import Board
+from core.piece_geometry import PieceGeometry
+
+
+class BitBoard(Board):
+    """位棋盘游戏板 - 与Board接口兼容，碰撞检测和行消除使用位运算"""
+
+    def __init__(self, width: int, height: int):
+        super().__init__(width, height)
+        # 完整行的位掩码；第col列对应第col位
+        self.full_row_mask = (1 << width) - 1
+        self.rows = [0] * height
+
+    def is_valid_geometry(self, geometry: PieceGeometry, x: int, y: int) -> bool:
+        """检查指定几何数据的方块放在(x, y)是否有效
+
+        先按占用格子的范围判断越界，再用非空行的位掩码与棋盘行做与运算检查碰撞，不读取网格。
+        """
+        if x + geometry.left < 0 or x + geometry.right >= self.width or y + geometry.bottom >= self.height:
+            return False
+
+        rows = self.rows
+        if x >= 0:
+            for offset, mask in geometry.filled_rows:
+                board_y = y + offset
+                if board_y >= 0 and rows[board_y] & (mask << x):
+                    return False
+        else:
+            # 左侧越界已经排除，右移不会丢失占用的格子
+            for offset, mask in geometry.filled_rows:
+                board_y = y + offset
+                if board_y >= 0 and rows[board_y] & (mask >> -x):
+                    return False
+        return True
+
+    def place_geometry(self, geometry: PieceGeometry, color: Tuple[int, int, int], x: int, y: int) -> bool:
+        """放置指定几何数据和颜色的方块
+
+        位掩码和每行计数按行更新；列高度按方块每列的高度更新，不逐个格子比较。
+        """
+        if not self.is_valid_geometry(geometry, x, y):
+            return False
+
+        rows = self.rows
+        row_counts = self._row_counts
+        for offset, mask in geometry.filled_rows:
+            board_y = y + offset
+            if board_y >= 0:
+                rows[board_y] |= mask << x if x >= 0 else mask >> -x
+                row_counts[board_y] += mask.bit_count()
+
+        grid = self.grid
+        row_hashes = self._row_hashes
+        column_keys = self._zobrist.column_keys
+        cell_keys = self._zobrist.cell_keys
+        hash_value = self._hash
+        for col, row in geometry.cells:
+            board_y = y + row
+            if board_y >= 0:
+                board_x = x + col
+                grid[board_y][board_x] = color
+                row_hashes[board_y] ^= column_keys[board_x]
+                hash_value ^= cell_keys[board_y][board_x]
+        self._hash = hash_value
+
+        self._raise_columns(geometry, x, y)
+        self._touch_rows(y, y + geometry.height - 1)
+        self._version += 1
+        return True
+
+    def _raise_columns(self, geometry: PieceGeometry, x: int, y: int):
+        """按方块每列的高度更新列高度；方块部分在顶部以上时逐个格子更新"""
+        if y < 0:
+            for col, row in geometry.cells:
+                if y + row >= 0:
+                    self._raise_column(x + col, self.height - y - row)
+            return
+
+        heights = self._column_heights
+        base = self.height - y - geometry.height
+        raised = 0
+        for col, piece_height in enumerate(geometry.column_heights):
+            if piece_height:
+                height = base + piece_height
+                old = heights[x + col]
+                if height > old:
+                    heights[x + col] = height
+                    raised += height - old
+                    if height > self._max_height:
+                        self._max_height = height
+        self._aggregate_height += raised
+        self._filled_cells += len(geometry.cells)
+
+    def refresh(self):
+        """按网格重新计算位掩码和每行计数"""
+        self.rows[:] = [sum(1 << col for col, cell in enumerate(row) if cell is not None)
+                        for row in self.grid]
+        super().refresh()
+
+    def copy(self) -> "BitBoard":
+        """复制游戏板和位掩码"""
+        clone = super().copy()
+        clone.rows = self.rows[:]
+        return clone
+
+    def _take_full_rows(self) -> List[int]:
+        """取出待检查的行中的完整行，由位掩码判断"""
+        rows = self.rows
+        return [row for row in self._take_touched_rows() if rows[row] == self.full_row_mask]
+
+    def _remove_geometry(self, geometry: PieceGeometry, x: int, y: int):
+        """清空方块占用的格子和对应的位"""
+        for offset, mask in enumerate(geometry.row_masks):
+            board_y = y + offset
+            if board_y >= 0 and mask:
+                self.rows[board_y] &= ~(mask << x if x >= 0 else mask >> -x)
+        super()._remove_geometry(geometry, x, y)
+
+    def _row_values(self) -> Tuple[List[int], ...]:
+        """位掩码与每行计数、行内容键一起随消行下移"""
+        return super()._row_values() + (self.rows,)
@@ -2,10 +2,36 @@
 # -*- coding: utf-8 -*-
 """
 游戏板类 - 负责方块放置和行消除
+
+网格按行存储格子颜色，每行计数、列高度等统计值由place_piece和clear_lines增量维护。
+外部代码可以直接修改grid：clear_lines按每行格子数发现修改并重新统计；
+在此之前需要读取列高度、哈希、version等统计值时先调用refresh()。
 """
 
-from typing import List, Optional, Tuple
+from typing import List, NamedTuple, Optional, Tuple
 from core.piece import Piece
+from core.piece_geometry import PieceGeometry
+from core.zobrist import get_zobrist_keys, rotate_key
+from utils.constants import PIECE_COLORS
+
+
+class BoardMove(NamedTuple):
+    """apply_move的撤销记录"""
+    geometry: PieceGeometry
+    x: int
+    y: int
+    # 消除的行号（从上到下）、这些行消除前的格子和_row_values中的值
+    full_rows: List[int]
+    cleared: List[list]
+    cleared_values: Tuple[List[int], ...]
+    # 放置前的列高度和统计值
+    column_heights: List[int]
+    aggregate_height: int
+    max_height: int
+    filled_cells: int
+    touched_top: int
+    touched_bottom: int
+    zobrist_hash: int
 
 
 class Board:
@@ -15,67 +41,396 @@ class Board:
         self.width = width
         self.height = height
         self.grid = self._create_empty_grid()
+        self._empty_row = [None] * width
+        # 每行已占用的格子数，由place_piece和clear_lines维护（通过row_counts读取）
+        self._row_counts = [0] * height
+        # 每列高度（最高格子到底部的行数）、高度之和、最高列高度和已占用格子总数，
+        # 由place_piece和clear_lines增量维护；空洞数 = 高度之和 - 已占用格子数
+        self._column_heights = [0] * width
+        self._aggregate_height = 0
+        self._max_height = 0
+        self._filled_cells = 0
+        # 上次消行后放置方块涉及的行范围[top, bottom]，clear_lines只检查这些行
+        self._touched_top = height
+        self._touched_bottom = -1
+        # 网格内容版本号，place_piece和clear_lines修改网格时递增，供渲染缓存判断是否需要重建（通过version读取）
+        self._version = 0
+        # Zobrist哈希：每行的行内容键（该行已占用列的列键异或）和整个游戏板的哈希，
+        # 只由格子是否占用决定，由place_piece和clear_lines增量维护
+        self._zobrist = get_zobrist_keys(width, height)
+        self._row_hashes = [0] * height
+        self._hash = 0
+        # apply_move的撤销记录
+        self._journal: List[BoardMove] = []
     
     def is_valid_position(self, piece: Piece, x: int, y: int) -> bool:
         """检查位置是否有效"""
-        for row in range(len(piece.shape)):
-            for col in range(len(piece.shape[0])):
-                if piece.shape[row][col]:
-                    board_x = x + col
-                    board_y = y + row
-                    
-                    # 检查边界
-                    if (board_x < 0 or board_x >= self.width or 
-                        board_y >= self.height):
-                        return False
-                    
-                    # 检查与其他方块的碰撞
-                    if board_y >= 0 and self.grid[board_y][board_x] is not None:
-                        return False
+        return self.is_valid_geometry(piece.geometry, x, y)
+    
+    def is_valid_geometry(self, geometry: PieceGeometry, x: int, y: int) -> bool:
+        """检查指定几何数据的方块放在(x, y)是否有效"""
+        for col, row in geometry.cells:
+            board_x = x + col
+            board_y = y + row
+            
+            # 检查边界
+            if (board_x < 0 or board_x >= self.width or 
+                board_y >= self.height):
+                return False
+            
+            # 检查与其他方块的碰撞
+            if board_y >= 0 and self.grid[board_y][board_x] is not None:
+                return False
         
         return True
     
     def place_piece(self, piece: Piece, x: int, y: int) -> bool:
         """放置方块到指定位置"""
-        if not self.is_valid_position(piece, x, y):
+        return self.place_geometry(piece.geometry, piece.color, x, y)
+    
+    def place_geometry(self, geometry: PieceGeometry, color: Tuple[int, int, int], x: int, y: int) -> bool:
+        """放置指定几何数据和颜色的方块，搜索时不需要创建Piece"""
+        if not self.is_valid_geometry(geometry, x, y):
             return False
         
-        for row in range(len(piece.shape)):
-            for col in range(len(piece.shape[0])):
-                if piece.shape[row][col]:
-                    board_x = x + col
-                    board_y = y + row
-                    if board_y >= 0:
-                        self.grid[board_y][board_x] = piece.color
+        grid = self.grid
+        row_counts = self._row_counts
+        row_hashes = self._row_hashes
+        column_keys = self._zobrist.column_keys
+        cell_keys = self._zobrist.cell_keys
+        hash_value = self._hash
+        for col, row in geometry.cells:
+            board_y = y + row
+            if board_y >= 0:
+                board_x = x + col
+                grid[board_y][board_x] = color
+                row_counts[board_y] += 1
+                row_hashes[board_y] ^= column_keys[board_x]
+                hash_value ^= cell_keys[board_y][board_x]
+                self._raise_column(board_x, self.height - board_y)
         
+        self._hash = hash_value
+        self._touch_rows(y, y + geometry.height - 1)
+        self._version += 1
         return True
     
     def clear_lines(self) -> int:
-        """清除完整行，返回消除的行数"""
-        lines_cleared = 0
-        row = self.height - 1
+        """清除完整行，返回消除的行数
+        
+        只检查上次消行后放置方块涉及的行，完整行由每行计数判断；
+        先逐行数一遍网格的格子数（list.count，开销很小），与每行计数不同说明网格被直接修改过，重新统计后检查所有行。
+        """
+        if [self.width - cells.count(None) for cells in self.grid] != self._row_counts:
+            self.refresh()
+        full_rows = self._take_full_rows()
+        if full_rows:
+            self._remove_rows(full_rows)
+        return len(full_rows)
+    
+    def apply_move(self, geometry: PieceGeometry, x: int, y: int,
+                   color: Optional[Tuple[int, int, int]] = None) -> Optional[int]:
+        """放置方块并消行，记录撤销信息，返回消除的行数；位置无效时返回None
+        
+        与undo_move配对使用：搜索时在同一个游戏板上尝试落点再撤销，不需要复制网格。
+        """
+        saved = (self._column_heights[:], self._aggregate_height, self._max_height,
+                 self._filled_cells, self._touched_top, self._touched_bottom, self._hash)
+        if color is None:
+            color = PIECE_COLORS[geometry.piece_type]
+        if not self.place_geometry(geometry, color, x, y):
+            return None
+        
+        full_rows = self._take_full_rows()
+        cleared = [self.grid[row][:] for row in full_rows]
+        cleared_values = tuple([values[row] for row in full_rows] for values in self._row_values())
+        if full_rows:
+            self._remove_rows(full_rows)
+        self._journal.append(BoardMove(geometry, x, y, full_rows, cleared, cleared_values, *saved))
+        return len(full_rows)
+    
+    def undo_move(self) -> "BoardMove":
+        """撤销最近一次apply_move，返回它的记录"""
+        move = self._journal.pop()
+        full_rows = move.full_rows
+        if full_rows:
+            # 消除的行被移到了顶部，按原来的顺序放回原位
+            recycled = self.grid[:len(full_rows)]
+            for cells, saved in zip(recycled, move.cleared):
+                cells[:] = saved
+            self._restore_rows(self.grid, full_rows, recycled)
+            for values, saved in zip(self._row_values(), move.cleared_values):
+                self._restore_rows(values, full_rows, saved)
+        
+        self._remove_geometry(move.geometry, move.x, move.y)
+        self._column_heights[:] = move.column_heights
+        self._aggregate_height = move.aggregate_height
+        self._max_height = move.max_height
+        self._filled_cells = move.filled_cells
+        self._touched_top = move.touched_top
+        self._touched_bottom = move.touched_bottom
+        self._hash = move.zobrist_hash
+        self._version += 1
+        return move
+    
+    @property
+    def journal_depth(self) -> int:
+        """尚未撤销的apply_move次数"""
+        return len(self._journal)
+    
+    def copy(self) -> "Board":
+        """复制游戏板：网格逐行复制，计数和高度直接复制，不重新扫描；撤销记录不复制"""
+        clone = self.__class__.__new__(self.__class__)
+        clone.__dict__.update(self.__dict__)
+        clone.grid = [row[:] for row in self.grid]
+        clone._row_counts = self._row_counts[:]
+        clone._row_hashes = self._row_hashes[:]
+        clone._column_heights = self._column_heights[:]
+        clone._journal = []
+        return clone
+    
+    def __deepcopy__(self, memo) -> "Board":
+        """颜色是不可变的元组，深复制等同于copy"""
+        return self.copy()
+    
+    def drop_distance(self, piece: Piece, x: int, y: int) -> int:
+        """方块从有效位置(x, y)直接下落能移动的行数
+        
+        方块每列最低格子都在该列最高格子上方时，由列高度和方块底部轮廓直接算出；
+        方块位于悬空块下方时逐行检查。
+        """
+        geometry = piece.geometry
+        heights = self._column_heights
+        distance = self.height
+        for col, bottom in enumerate(geometry.column_bottoms):
+            if bottom < 0:
+                continue
+            gap = self.height - heights[x + col] - 1 - (y + bottom)
+            if gap < 0:
+                return self._scan_drop_distance(geometry, x, y)
+            if gap < distance:
+                distance = gap
+        return distance
+    
+    def refresh(self):
+        """直接修改grid后重新统计每行计数和每列高度，下次clear_lines检查所有行"""
+        self._row_counts[:] = [self.width - row.count(None) for row in self.grid]
+        column_keys = self._zobrist.column_keys
+        self._row_hashes[:] = [self._xor_keys(column_keys[col] for col, cell in enumerate(row) if cell is not None)
+                              for row in self.grid]
+        self._hash = self._scan_hash()
+        self._column_heights[:] = [self._scan_column_height(col, 0) for col in range(self.width)]
+        self._filled_cells = sum(self._row_counts)
+        self._update_height_totals()
+        self._touch_rows(0, self.height - 1)
+        self._version += 1
+    
+    @property
+    def row_counts(self) -> List[int]:
+        """每行已占用的格子数（只读）"""
+        return self._row_counts
+    
+    @property
+    def version(self) -> int:
+        """网格内容版本号，place_piece、clear_lines和refresh时递增"""
+        return self._version
+    
+    @property
+    def zobrist_hash(self) -> int:
+        """游戏板占用情况的Zobrist哈希，占用格子相同的游戏板哈希相同"""
+        return self._hash
+    
+    @property
+    def column_heights(self) -> Tuple[int, ...]:
+        """每列高度，从左到右"""
+        return tuple(self._column_heights)
+    
+    @property
+    def aggregate_height(self) -> int:
+        """所有列高度之和"""
+        return self._aggregate_height
+    
+    @property
+    def max_height(self) -> int:
+        """最高列的高度"""
+        return self._max_height
+    
+    @property
+    def holes(self) -> int:
+        """空洞数：各列最高格子以下的空格子总数"""
+        return self._aggregate_height - self._filled_cells
+    
+    def get_column_height(self, col: int) -> int:
+        """第col列的高度"""
+        return self._column_heights[col]
+    
+    def _scan_drop_distance(self, geometry: PieceGeometry, x: int, y: int) -> int:
+        """逐行检查方块能下落的行数"""
+        distance = 0
+        while self.is_valid_geometry(geometry, x, y + distance + 1):
+            distance += 1
+        return distance
+    
+    def _raise_column(self, col: int, height: int):
+        """在第col列高度为height的位置放置了一个格子"""
+        self._filled_cells += 1
+        old = self._column_heights[col]
+        if height > old:
+            self._column_heights[col] = height
+            self._aggregate_height += height - old
+            if height > self._max_height:
+                self._max_height = height
+    
+    def _scan_column_height(self, col: int, start_row: int) -> int:
+        """从start_row向下查找第col列的最高格子，返回列高度"""
+        grid = self.grid
+        for row in range(start_row, self.height):
+            if grid[row][col] is not None:
+                return self.height - row
+        return 0
+    
+    def _update_height_totals(self):
+        """重新计算高度之和与最高列高度"""
+        self._aggregate_height = sum(self._column_heights)
+        self._max_height = max(self._column_heights, default=0)
+    
+    def _touch_rows(self, top: int, bottom: int):
+        """记录需要在下次clear_lines检查的行范围"""
+        if top < self._touched_top:
+            self._touched_top = max(top, 0)
+        if bottom > self._touched_bottom:
+            self._touched_bottom = min(bottom, self.height - 1)
+    
+    def _take_touched_rows(self) -> range:
+        """取出待检查的行范围并清空记录"""
+        rows = range(self._touched_top, self._touched_bottom + 1)
+        self._touched_top = self.height
+        self._touched_bottom = -1
+        return rows
+    
+    def _take_full_rows(self) -> List[int]:
+        """取出待检查的行中的完整行，从上到下排列"""
+        row_counts = self._row_counts
+        return [row for row in self._take_touched_rows() if row_counts[row] == self.width]
+    
+    def _remove_rows(self, full_rows: List[int]):
+        """删除完整行并更新列高度"""
+        removed = set(full_rows)
+        tops = [self.height - h for h in self._column_heights]
+        self._move_row_hashes(full_rows, removed)
+        self._compact(full_rows)
         
-        while row >= 0:
-            if all(cell is not None for cell in self.grid[row]):
-                # 删除完整行
-                self.grid.pop(row)
-                # 在顶部添加新的空行
-                self.grid.insert(0, [None for _ in range(self.width)])
-                lines_cleared += 1
+        # 每个完整行都在所有列的最高格子以下，列高度各减少消除的行数；
+        # 最高格子被消除的列，下面可能是空洞，需要向下找新的最高格子
+        lines = len(full_rows)
+        heights = self._column_heights
+        for col in range(self.width):
+            if tops[col] in removed:
+                heights[col] = self._scan_column_height(col, self.height - heights[col] + lines)
             else:
-                row -= 1
+                heights[col] -= lines
+        self._filled_cells -= lines * self.width
+        self._update_height_totals()
+        self._version += 1
+    
+    def _remove_geometry(self, geometry: PieceGeometry, x: int, y: int):
+        """清空方块占用的格子（撤销放置），列高度由调用方恢复"""
+        for col, row in geometry.cells:
+            board_y = y + row
+            if board_y >= 0:
+                self.grid[board_y][x + col] = None
+                self._row_counts[board_y] -= 1
+                self._row_hashes[board_y] ^= self._zobrist.column_keys[x + col]
+    
+    def _move_row_hashes(self, full_rows: List[int], removed: set):
+        """消行前更新哈希
         
-        return lines_cleared
+        循环移位对异或是线性的：下移s行的一段行，贡献之和整体循环左移s位即可。
+        最高完整行以上的一段由总哈希去掉以下各行的贡献得到，只需逐行计算最高完整行及以下的行。
+        """
+        bits = self._zobrist.bits
+        row_hashes = self._row_hashes
+        below = 0
+        moved = 0
+        segment = 0
+        shift = 0
+        for row in range(self.height - 1, full_rows[0] - 1, -1):
+            key = row_hashes[row]
+            if not key:
+                continue
+            part = rotate_key(key, row, bits)
+            below ^= part
+            if row in removed:
+                # segment是这个完整行与下一个完整行之间的行，下移行数为下方完整行数
+                moved ^= rotate_key(segment, shift, bits)
+                segment = 0
+                shift += 1
+            else:
+                segment ^= part
+        moved ^= rotate_key(segment, shift, bits)
+        self._hash = moved ^ rotate_key(self._hash ^ below, shift, bits)
+    
+    def _scan_hash(self) -> int:
+        """由各行的行内容键重新计算整个游戏板的哈希"""
+        bits = self._zobrist.bits
+        return self._xor_keys(rotate_key(key, row, bits) for row, key in enumerate(self._row_hashes) if key)
+    
+    @staticmethod
+    def _xor_keys(keys) -> int:
+        """所有键的异或"""
+        value = 0
+        for key in keys:
+            value ^= key
+        return value
+    
+    @staticmethod
+    def _restore_rows(values: list, full_rows: List[int], saved: list):
+        """_compact的逆操作：values前len(full_rows)项是移到顶部的行，把saved放回full_rows的位置"""
+        lowest = full_rows[-1]
+        kept = iter(values[len(full_rows):lowest + 1])
+        restored = dict(zip(full_rows, saved))
+        values[:lowest + 1] = [restored[row] if row in restored else next(kept) for row in range(lowest + 1)]
+    
+    def _compact(self, full_rows: List[int]):
+        """删除完整行：最低完整行以上的行一次性下移，删除的行清空后放回顶部
+        
+        每行只移动一次，与消除的行数无关；grid和行列表对象都保持不变。
+        """
+        grid = self.grid
+        lowest = full_rows[-1]
+        removed = set(full_rows)
+        kept = [row for row in range(lowest) if row not in removed]
+        
+        recycled = [grid[row] for row in full_rows]
+        for cells in recycled:
+            cells[:] = self._empty_row
+        grid[:lowest + 1] = recycled + [grid[row] for row in kept]
+        
+        cleared = [0] * len(full_rows)
+        for values in self._row_values():
+            values[:lowest + 1] = cleared + [values[row] for row in kept]
+    
+    def _row_values(self) -> Tuple[List[int], ...]:
+        """与grid逐行对应、消行时需要一起下移的整数数组，空行为0"""
+        return (self._row_counts, self._row_hashes)
     
     def is_game_over(self) -> bool:
-        """检查游戏是否结束"""
-        # 检查顶部行是否有方块
-        return any(cell is not None for cell in self.grid[0])
+        """检查游戏是否结束：顶部行有方块，即最高列达到游戏板高度"""
+        return self._max_height >= self.height
     
     def _create_empty_grid(self) -> List[List[Optional[Tuple[int, int, int]]]]:
         """创建空网格"""
-        return [[None for _ in range(self.width)] for _ in range(self.height)]
+        return [[None] * self.width for _ in range(self.height)]
     
     def get_grid(self) -> List[List[Optional[Tuple[int, int, int]]]]:
         """获取网格数据"""
         return self.grid
+
+
+def create_board(config) -> Board:
+    """根据配置中的BOARD_BACKEND创建游戏板"""
+    if config.BOARD_BACKEND == "grid":
+        return Board(config.BOARD_WIDTH, config.BOARD_HEIGHT)
+    if config.BOARD_BACKEND == "bitboard":
+        from core.bit_board import BitBoard
+        return BitBoard(config.BOARD_WIDTH, config.BOARD_HEIGHT)
+    raise ValueError(f"未知的游戏板后端: {config.BOARD_BACKEND}")
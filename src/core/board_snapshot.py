@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+游戏板快照 - 把游戏板和游戏状态写入共享内存或mmap缓冲区，其他进程无需反序列化即可读取
+
+缓冲区格式（小端序）：
+    偏移0:  序号(8字节)，写入期间为奇数（顺序锁）
+    偏移8:  b"TSNP" | 版本(2字节) | 宽度(2字节) | 高度(2字节)
+    偏移24: 游戏状态，见STATE_STRUCT
+    偏移64: 游戏板，每格1字节，0为空，1~7为PIECE_SHAPES顺序的方块类型加1，未知颜色为255
+
+只允许一个写入者。读取者先读序号，复制数据后再读一次序号，序号为奇数或前后不一致说明读到了写入中的数据，需要重读。
+"""
+
+import struct
+import time
+from multiprocessing import shared_memory
+from typing import List, NamedTuple, Optional, Tuple
+from core.board import Board
+from core.game_state import GameState
+from utils.constants import GRAY, PIECE_COLORS, PIECE_SHAPES
+
+
+SNAPSHOT_MAGIC = b"TSNP"
+SNAPSHOT_VERSION = 1
+
+PIECE_TYPES = tuple(PIECE_SHAPES.keys())
+GAME_MODES = ("classic", "level")
+EMPTY_CELL = 0
+UNKNOWN_CELL = 255
+
+SEQ_STRUCT = struct.Struct("<Q")
+LAYOUT_STRUCT = struct.Struct("<4sHHH")
+# 写入次数、游戏板版本、分数、等级、行数、五个状态标记、星级、当前方块、旋转、x、y、下一个方块、模式、关卡编号
+STATE_STRUCT = struct.Struct("<IIqiiBBBBBbbhhbBH")
+LAYOUT_OFFSET = 8
+STATE_OFFSET = 24
+CELLS_OFFSET = 64
+
+
+class SnapshotState(NamedTuple):
+    """快照中的游戏状态，方块类型和模式已解码，没有方块时为None"""
+    writes: int
+    board_version: int
+    score: int
+    level: int
+    lines_cleared: int
+    game_over: bool
+    paused: bool
+    level_complete: bool
+    level_failed: bool
+    level_stars: int
+    piece: Optional[str]
+    rotation: int
+    x: int
+    y: int
+    next_piece: Optional[str]
+    game_mode: str
+    level_id: int
+
+
+def get_snapshot_size(width: int, height: int) -> int:
+    """宽width、高height的游戏板快照需要的字节数"""
+    return CELLS_OFFSET + width * height
+
+
+def decode_grid(cells, width: int, height: int) -> List[List[Optional[tuple]]]:
+    """把快照中的格子还原成Board.grid格式（未知颜色还原为灰色）"""
+    colors = [None] + [PIECE_COLORS[piece_type] for piece_type in PIECE_TYPES]
+    return [[colors[cell] if cell < len(colors) else GRAY for cell in cells[row * width:(row + 1) * width]]
+            for row in range(height)]
+
+
+class BoardSnapshot:
+    """游戏板快照，buffer可以是SharedMemory.buf、mmap或bytearray
+
+    写入者用create或直接传入缓冲区创建，读取者用attach或传入同一块缓冲区（此时从头部读取尺寸）。
+    需要零复制读取时，在begin_read和validate之间直接访问cells视图，validate失败则重读。
+    """
+
+    def __init__(self, buffer, width: Optional[int] = None, height: Optional[int] = None):
+        self.buffer = memoryview(buffer).cast("B")
+        if width is None or height is None:
+            magic, version, width, height = LAYOUT_STRUCT.unpack_from(self.buffer, LAYOUT_OFFSET)
+            if magic != SNAPSHOT_MAGIC or version != SNAPSHOT_VERSION:
+                raise ValueError("不是有效的游戏板快照")
+        else:
+            if len(self.buffer) < get_snapshot_size(width, height):
+                raise ValueError(f"缓冲区太小，至少需要 {get_snapshot_size(width, height)} 字节")
+            SEQ_STRUCT.pack_into(self.buffer, 0, 0)
+            LAYOUT_STRUCT.pack_into(self.buffer, LAYOUT_OFFSET, SNAPSHOT_MAGIC, SNAPSHOT_VERSION, width, height)
+        self.width = width
+        self.height = height
+        self.cells = self.buffer[CELLS_OFFSET:CELLS_OFFSET + width * height]
+        self.shm: Optional[shared_memory.SharedMemory] = None
+
+        # 写入者的状态
+        self._seq = SEQ_STRUCT.unpack_from(self.buffer, 0)[0]
+        self._writes = 0
+        self._board: Optional[Board] = None
+        self._board_version = -1
+        self._row = bytearray(width)
+        self._zeros = memoryview(bytes(width * height))
+        self._cell_ids = {None: EMPTY_CELL}
+        self._cell_ids.update((PIECE_COLORS[piece_type], index + 1)
+                              for index, piece_type in enumerate(PIECE_TYPES))
+        self._piece_ids = {piece_type: index for index, piece_type in enumerate(PIECE_TYPES)}
+
+    @classmethod
+    def create(cls, width: int, height: int, name: Optional[str] = None) -> "BoardSnapshot":
+        """创建共享内存快照（写入者）"""
+        shm = shared_memory.SharedMemory(name=name, create=True, size=get_snapshot_size(width, height))
+        snapshot = cls(shm.buf, width, height)
+        snapshot.shm = shm
+        return snapshot
+
+    @classmethod
+    def attach(cls, name: str) -> "BoardSnapshot":
+        """打开已有的共享内存快照（读取者）"""
+        shm = shared_memory.SharedMemory(name=name)
+        snapshot = cls(shm.buf)
+        snapshot.shm = shm
+        return snapshot
+
+    @property
+    def name(self) -> Optional[str]:
+        """共享内存名称，其他进程用它调用attach"""
+        return self.shm.name if self.shm is not None else None
+
+    def write(self, board: Board, game_state: GameState):
+        """写入游戏板和游戏状态，游戏板内容未变化时只写状态"""
+        buffer = self.buffer
+        seq = self._seq + 1
+        SEQ_STRUCT.pack_into(buffer, 0, seq)
+
+        if board is not self._board or board.version != self._board_version:
+            self._write_cells(board)
+            self._board = board
+            self._board_version = board.version
+
+        self._writes = (self._writes + 1) & 0xFFFFFFFF
+        piece = game_state.current_piece
+        next_piece = game_state.next_piece
+        x, y = game_state.get_piece_position()
+        STATE_STRUCT.pack_into(
+            buffer, STATE_OFFSET, self._writes, board.version & 0xFFFFFFFF, game_state.score,
+            game_state.level, game_state.lines_cleared, game_state.game_over, game_state.paused,
+            game_state.level_complete, game_state.level_failed, game_state.level_stars,
+            self._piece_ids[piece.type] if piece is not None else -1,
+            piece.rotation if piece is not None else 0, x, y,
+            self._piece_ids[next_piece.type] if next_piece is not None else -1,
+            GAME_MODES.index(game_state.game_mode), game_state.current_level_id)
+
+        self._seq = seq + 1
+        SEQ_STRUCT.pack_into(buffer, 0, self._seq)
+
+    def _write_cells(self, board: Board):
+        """写入游戏板，最高列以上的行整体清零"""
+        width = self.width
+        top = board.height - board.max_height
+        cells = self.cells
+        cells[:top * width] = self._zeros[:top * width]
+
+        row_buffer = self._row
+        cell_ids = self._cell_ids
+        for row in range(top, board.height):
+            for col, cell in enumerate(board.grid[row]):
+                row_buffer[col] = cell_ids.get(cell, UNKNOWN_CELL)
+            cells[row * width:(row + 1) * width] = row_buffer
+
+    def begin_read(self) -> int:
+        """等待写入结束，返回当前序号"""
+        while True:
+            seq = SEQ_STRUCT.unpack_from(self.buffer, 0)[0]
+            if not seq & 1:
+                return seq
+            time.sleep(0)
+
+    def validate(self, seq: int) -> bool:
+        """begin_read之后读取的数据是否完整（期间没有写入）"""
+        return SEQ_STRUCT.unpack_from(self.buffer, 0)[0] == seq
+
+    def read_state(self) -> SnapshotState:
+        """读取一致的游戏状态"""
+        while True:
+            seq = self.begin_read()
+            values = STATE_STRUCT.unpack_from(self.buffer, STATE_OFFSET)
+            if self.validate(seq):
+                return self._decode_state(values)
+
+    def read(self, into: Optional[bytearray] = None) -> Tuple[SnapshotState, bytearray]:
+        """读取一致的游戏状态和格子，格子复制到into（复用同一个bytearray时不分配内存）"""
+        if into is None:
+            into = bytearray(self.width * self.height)
+        while True:
+            seq = self.begin_read()
+            values = STATE_STRUCT.unpack_from(self.buffer, STATE_OFFSET)
+            into[:] = self.cells
+            if self.validate(seq):
+                return self._decode_state(values), into
+
+    def _decode_state(self, values: tuple) -> SnapshotState:
+        """把STATE_STRUCT的原始值解码为SnapshotState"""
+        (writes, board_version, score, level, lines, game_over, paused, complete, failed, stars,
+         piece, rotation, x, y, next_piece, game_mode, level_id) = values
+        return SnapshotState(writes, board_version, score, level, lines, bool(game_over), bool(paused),
+                             bool(complete), bool(failed), stars,
+                             PIECE_TYPES[piece] if piece >= 0 else None, rotation, x, y,
+                             PIECE_TYPES[next_piece] if next_piece >= 0 else None,
+                             GAME_MODES[game_mode], level_id)
+
+    def close(self):
+        """释放对缓冲区的引用，共享内存快照同时关闭共享内存"""
+        self.cells.release()
+        self._zeros.release()
+        self.buffer.release()
+        if self.shm is not None:
+            self.shm.close()
+
+    def unlink(self):
+        """删除共享内存（由创建者在所有进程用完后调用）"""
+        if self.shm is not None:
+            self.shm.unlink()
@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+时钟类 - 为游戏引擎和关卡管理器提供可注入的时间源（单位：秒）
+"""
+
+import time
+
+
+class WallClock:
+    """墙上时钟 - 使用系统时间，正常游戏时使用"""
+
+    def now(self) -> float:
+        """获取当前时间（秒）"""
+        return time.time()
+
+
+class TickClock:
+    """模拟时钟 - 时间只随仿真tick推进，用于无界面快速仿真"""
+
+    def __init__(self, tick_ms: float, start: float = 0.0):
+        self.tick_ms = tick_ms
+        self.start = start
+        self.ticks = 0
+
+    def now(self) -> float:
+        """获取当前模拟时间（秒）"""
+        return self.start + self.ticks * self.tick_ms / 1000.0
+
+    def advance(self, ticks: int = 1):
+        """推进指定数量的tick"""
+        self.ticks += ticks
+
+    def reset(self):
+        """将模拟时间归零"""
+        self.ticks = 0
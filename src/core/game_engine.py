@@ -4,13 +4,15 @@
 游戏引擎 - 负责游戏主循环和逻辑协调
 """
 
-import time
 import random
-from typing import Optional, List
-from core.board import Board
+from typing import Optional, List, Tuple
+from core.board import Board, create_board
 from core.game_state import GameState
 from core.piece import Piece
 from core.collision import CollisionDetector
+from core.placement import Placement, PlacementFinder
+from core.clock import WallClock
+from core.randomizer import create_randomizer
 from config.game_config import GameConfig
 from utils.constants import PIECE_SHAPES
 
@@ -18,20 +20,33 @@ from utils.constants import PIECE_SHAPES
 class GameEngine:
     """游戏引擎 - 负责游戏主循环和逻辑协调"""
     
-    def __init__(self, config: GameConfig):
+    def __init__(self, config: GameConfig, clock=None, level_manager=None,
+                 seed: Optional[int] = None):
         self.config = config
-        self.board = Board(config.BOARD_WIDTH, config.BOARD_HEIGHT)
+        # 方块序列：每个引擎独立的带种子随机数，未指定种子时随机生成并记录
+        self.seed = seed if seed is not None else random.getrandbits(32)
+        self.randomizer = create_randomizer(config.PIECE_RANDOMIZER,
+                                            list(PIECE_SHAPES.keys()), self.seed)
+        # 时间源：默认使用系统时间，无界面仿真时注入TickClock
+        self.clock = clock if clock is not None else WallClock()
+        self.board = create_board(config)
         self.game_state = GameState()
         self.collision_detector = CollisionDetector()
-        self.last_drop_time = time.time()
+        self.placement_finder = PlacementFinder()
+        self.last_drop_time = self.clock.now()
+        # 重力速度倍数，下落间隔为drop_delay除以该倍数；正常游戏始终为1.0
+        self.speed_multiplier = 1.0
+        # 回放录制器（core.replay.ReplayRecorder），为None时不录制
+        self.recorder = None
         
         # 关卡管理器
-        self.level_manager = None
-        try:
-            from level.level_manager import LevelManager
-            self.level_manager = LevelManager()
-        except ImportError:
-            pass
+        self.level_manager = level_manager
+        if self.level_manager is None:
+            try:
+                from level.level_manager import LevelManager
+                self.level_manager = LevelManager(clock=self.clock)
+            except ImportError:
+                pass
     
     def spawn_new_piece(self):
         """生成新方块"""
@@ -41,11 +56,13 @@ class GameEngine:
         else:
             available_pieces = list(PIECE_SHAPES.keys())
         
+        self.randomizer.set_piece_types(available_pieces)
+        
         if self.game_state.next_piece is None:
-            self.game_state.next_piece = Piece(random.choice(available_pieces))
+            self.game_state.next_piece = Piece(self.randomizer.next())
         
         self.game_state.current_piece = self.game_state.next_piece
-        self.game_state.next_piece = Piece(random.choice(available_pieces))
+        self.game_state.next_piece = Piece(self.randomizer.next())
         
         # 设置初始位置
         x = self.config.BOARD_WIDTH // 2 - self.game_state.current_piece.get_width() // 2
@@ -107,6 +124,24 @@ class GameEngine:
         
         return self.handle_piece_movement(0, 1)
     
+    def hard_drop(self) -> bool:
+        """硬降：方块直接落到底并立即放置"""
+        if self.game_state.paused or self.game_state.game_over or not self.game_state.current_piece:
+            return False
+        
+        self.game_state.set_piece_position(*self.get_ghost_position())
+        self.place_current_piece()
+        return True
+    
+    def get_ghost_position(self) -> Optional[Tuple[int, int]]:
+        """当前方块直接下落后的位置（阴影预览），没有当前方块时返回None"""
+        piece = self.game_state.current_piece
+        if not piece:
+            return None
+        
+        x, y = self.game_state.get_piece_position()
+        return x, y + self.board.drop_distance(piece, x, y)
+    
     def place_current_piece(self):
         """放置当前方块"""
         if not self.game_state.current_piece:
@@ -158,24 +193,48 @@ class GameEngine:
         if (self.level_manager and 
             self.game_state.game_mode == "level" and
             self.level_manager.is_time_up()):
+            if self.recorder is not None and not self.game_state.level_failed:
+                self.recorder.record("time_up")
             self.game_state.level_failed = True
             return
         
-        current_time = time.time()
+        current_time = self.clock.now()
         
         # 自动下落
-        if current_time - self.last_drop_time > self.game_state.drop_delay / 1000.0:
-            if not self.drop_piece():
-                # 无法下落，放置方块
-                self.place_current_piece()
-            
+        if current_time - self.last_drop_time > self.game_state.drop_delay / 1000.0 / self.speed_multiplier:
+            self.apply_gravity()
             self.last_drop_time = current_time
     
-    def reset_game(self):
-        """重置游戏"""
-        self.board = Board(self.config.BOARD_WIDTH, self.config.BOARD_HEIGHT)
+    def apply_gravity(self):
+        """执行一次自动下落，无法下落时放置方块"""
+        if self.recorder is not None:
+            self.recorder.record("gravity")
+        
+        if not self.drop_piece():
+            # 无法下落，放置方块
+            self.place_current_piece()
+    
+    def get_placements(self) -> List[Placement]:
+        """获取当前方块从当前位置出发可到达的所有最终落点"""
+        if not self.game_state.current_piece:
+            return []
+        
+        current_x, current_y = self.game_state.get_piece_position()
+        return self.placement_finder.find_placements(
+            self.board, self.game_state.current_piece, current_x, current_y)
+    
+    def peek_pieces(self, count: int) -> List[str]:
+        """查看next_piece之后的count个方块类型"""
+        return self.randomizer.peek(count)
+    
+    def reset_game(self, game_mode: str = "classic", seed: Optional[int] = None):
+        """重置游戏，未指定种子时使用新的随机种子"""
+        self.seed = seed if seed is not None else random.getrandbits(32)
+        self.randomizer.reset(self.seed)
+        self.board = create_board(self.config)
         self.game_state.reset()
-        self.last_drop_time = time.time()
+        self.game_state.game_mode = game_mode
+        self.last_drop_time = self.clock.now()
         self.spawn_new_piece()
     
     def get_board(self) -> Board:
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+固定时间步长 - 逻辑以固定频率推进，与渲染帧率解耦
+"""
+
+from typing import Dict, Optional
+
+
+class FixedTimestep:
+    """固定时间步长 - 累加每帧实际经过的时间，按固定间隔产生逻辑tick
+
+    每帧调用advance(经过的秒数)得到本帧应执行的逻辑tick数，剩余不足一个tick的时间
+    留在累加器中，alpha为其占一个tick的比例，用于在上一个和当前逻辑状态之间插值渲染。
+
+    渲染跟不上时一帧会执行多个tick追赶（catch_up_ticks）；单帧时间超过max_frame_ms
+    或需要的tick数超过max_ticks_per_frame时，多出的时间被丢弃（skipped_ticks），
+    避免越追越慢。超过目标帧间隔的帧按错过的显示帧数计入dropped_frames。
+    """
+
+    def __init__(self, tick_ms: float, frame_ms: Optional[float] = None,
+                 max_frame_ms: float = 250.0, max_ticks_per_frame: int = 5):
+        self.tick_ms = tick_ms
+        self.tick_seconds = tick_ms / 1000.0
+        self.frame_seconds = (frame_ms if frame_ms is not None else tick_ms) / 1000.0
+        self.max_frame_seconds = max_frame_ms / 1000.0
+        self.max_ticks_per_frame = max_ticks_per_frame
+        self.accumulator = 0.0
+        self.reset_stats()
+
+    def reset_stats(self):
+        """清空统计计数"""
+        self.frames = 0
+        self.ticks = 0
+        self.catch_up_ticks = 0
+        self.skipped_ticks = 0
+        self.dropped_frames = 0
+
+    def advance(self, elapsed: float) -> int:
+        """记录一帧经过的时间（秒），返回本帧需要执行的逻辑tick数"""
+        self.frames += 1
+        missed = int(elapsed / self.frame_seconds + 0.5) - 1
+        if missed > 0:
+            self.dropped_frames += missed
+
+        if elapsed > self.max_frame_seconds:
+            self.skipped_ticks += int((elapsed - self.max_frame_seconds) / self.tick_seconds)
+            elapsed = self.max_frame_seconds
+
+        self.accumulator += elapsed
+        due = int(self.accumulator / self.tick_seconds)
+        self.accumulator -= due * self.tick_seconds
+        ticks = min(due, self.max_ticks_per_frame)
+        self.skipped_ticks += due - ticks
+
+        self.ticks += ticks
+        if ticks > 1:
+            self.catch_up_ticks += ticks - 1
+        return ticks
+
+    @property
+    def alpha(self) -> float:
+        """累加器中剩余时间占一个tick的比例（0~1），用于插值渲染"""
+        return self.accumulator / self.tick_seconds
+
+    def get_stats(self) -> Dict[str, int]:
+        """获取统计：帧数、逻辑tick数、追赶tick数、丢弃tick数和掉帧数"""
+        return {
+            "frames": self.frames,
+            "ticks": self.ticks,
+            "catch_up_ticks": self.catch_up_ticks,
+            "skipped_ticks": self.skipped_ticks,
+            "dropped_frames": self.dropped_frames,
+        }
@@ -56,6 +56,16 @@ class GameState:
         """获取方块位置"""
         return self.piece_position
     
+    def copy(self) -> "GameState":
+        """复制游戏状态，方块会被旋转修改，一起复制"""
+        clone = GameState.__new__(GameState)
+        clone.__dict__.update(self.__dict__)
+        if self.current_piece is not None:
+            clone.current_piece = self.current_piece.copy()
+        if self.next_piece is not None:
+            clone.next_piece = self.next_piece.copy()
+        return clone
+    
     def reset(self):
         """重置游戏状态"""
         self.score = 0
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+无界面游戏 - 使用模拟时钟驱动GameEngine，可以远快于实时地运行，不依赖pygame
+"""
+
+from typing import Callable, Optional
+from config.game_config import GameConfig
+from core.clock import TickClock
+from core.game_engine import GameEngine
+from core.game_state import GameState
+
+
+class HeadlessGame:
+    """无界面游戏 - 每次step推进一个tick，重力和关卡计时完全由tick驱动"""
+
+    # 与InputHandler产生的事件类型一致
+    ACTIONS = ("none", "move_left", "move_right", "move_down", "rotate", "hard_drop")
+
+    def __init__(self, config: Optional[GameConfig] = None, tick_ms: Optional[float] = None):
+        self.config = config if config is not None else GameConfig()
+        self.tick_ms = tick_ms if tick_ms is not None else 1000.0 / self.config.LOGIC_TICK_RATE
+        self.clock = TickClock(self.tick_ms)
+
+        level_manager = None
+        try:
+            from level.level_manager import LevelManager
+            level_manager = LevelManager(clock=self.clock, persist_progress=False)
+        except ImportError:
+            pass
+
+        self.engine = GameEngine(self.config, clock=self.clock, level_manager=level_manager)
+        self._action_handlers = {
+            "none": lambda: None,
+            "move_left": lambda: self.engine.handle_piece_movement(-1, 0),
+            "move_right": lambda: self.engine.handle_piece_movement(1, 0),
+            "move_down": lambda: self.engine.handle_piece_movement(0, 1),
+            "rotate": self.engine.handle_piece_rotation,
+            "hard_drop": self.engine.hard_drop,
+        }
+
+    def reset(self, game_mode: str = "classic", level_id: Optional[int] = None,
+              seed: Optional[int] = None, level_speed: bool = False) -> GameState:
+        """重置游戏和模拟时钟，关卡模式下加载指定关卡（不检查解锁状态）
+
+        level_speed为True时重力按关卡配置的speed_multiplier加快；游戏本身不使用该配置，默认关闭。
+        """
+        self.clock.reset()
+        self.engine.speed_multiplier = 1.0
+
+        if game_mode == "level":
+            level_manager = self.engine.level_manager
+            if not level_manager or not level_manager.load_level(level_id, check_unlock=False):
+                raise ValueError(f"无法加载关卡 {level_id}")
+
+        self.engine.reset_game(game_mode, seed)
+        if game_mode == "level":
+            self.engine.game_state.current_level_id = level_id
+            if level_speed:
+                self.engine.speed_multiplier = self.engine.level_manager.get_speed_multiplier()
+
+        return self.engine.game_state
+
+    def step(self, action: str = "none") -> GameState:
+        """执行一个动作并推进一个tick"""
+        handler = self._action_handlers.get(action)
+        if handler is None:
+            raise ValueError(f"未知的动作: {action}")
+
+        handler()
+        self.clock.advance()
+        self.engine.update(self.tick_ms / 1000.0)
+        return self.engine.game_state
+
+    def is_done(self) -> bool:
+        """检查本局是否结束（游戏结束、关卡完成或关卡失败）"""
+        state = self.engine.game_state
+        return state.game_over or state.level_complete or state.level_failed
+
+    def run(self, policy: Optional[Callable[[GameState], str]] = None,
+            max_ticks: int = 1000000) -> int:
+        """运行到本局结束或达到最大tick数，返回实际运行的tick数"""
+        state = self.engine.game_state
+        ticks = 0
+        while ticks < max_ticks and not self.is_done():
+            self.step(policy(state) if policy else "none")
+            ticks += 1
+        return ticks
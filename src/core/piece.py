@@ -6,6 +6,7 @@
 
 from typing import List, Tuple
 from utils.constants import PIECE_SHAPES, PIECE_COLORS
+from core.piece_geometry import PieceGeometry, PIECE_GEOMETRY, ROTATION_COUNTS
 
 
 class Piece:
@@ -16,38 +17,45 @@ class Piece:
         self.rotation = 0
         self.shape = self._get_shape()
         self.color = self._get_color()
+        self.geometry = PIECE_GEOMETRY[piece_type][0]
     
     def rotate(self) -> bool:
         """旋转方块"""
-        if self.type == 'O':  # O型方块不需要旋转
-            return True
-        
-        if self.type == 'I':
-            # I型方块只有两种状态
-            self.rotation = (self.rotation + 1) % 2
-            self.shape = PIECE_SHAPES['I'][self.rotation]
-        else:
-            # 其他方块有四种旋转状态
-            self.rotation = (self.rotation + 1) % len(PIECE_SHAPES[self.type])
-            self.shape = PIECE_SHAPES[self.type][self.rotation]
-        
+        # O型方块只有一种状态，I、S、Z型两种，其他方块四种
+        self.set_rotation((self.rotation + 1) % ROTATION_COUNTS[self.type])
         return True
     
+    def set_rotation(self, rotation: int):
+        """直接设置旋转状态"""
+        self.rotation = rotation
+        self.shape = PIECE_SHAPES[self.type][rotation]
+        self.geometry = PIECE_GEOMETRY[self.type][rotation]
+    
+    def copy(self) -> "Piece":
+        """复制方块，形状和几何数据是只读的，直接共享"""
+        clone = Piece.__new__(Piece)
+        clone.__dict__.update(self.__dict__)
+        return clone
+    
     def get_shape(self) -> List[List[int]]:
         """获取当前形状"""
         return self.shape
     
+    def get_geometry(self) -> PieceGeometry:
+        """获取当前旋转状态的几何数据"""
+        return self.geometry
+    
     def get_dimensions(self) -> Tuple[int, int]:
         """获取方块尺寸"""
-        return len(self.shape[0]), len(self.shape)
+        return self.geometry.width, self.geometry.height
     
     def get_width(self) -> int:
         """获取方块宽度"""
-        return len(self.shape[0])
+        return self.geometry.width
     
     def get_height(self) -> int:
         """获取方块高度"""
-        return len(self.shape)
+        return self.geometry.height
     
     def _get_shape(self) -> List[List[int]]:
         """获取形状数据"""
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+方块几何表 - 导入时由PIECE_SHAPES一次性预计算的只读数据
+"""
+
+from types import MappingProxyType
+from typing import List, NamedTuple, Tuple
+from utils.constants import PIECE_SHAPES
+
+
+class PieceGeometry(NamedTuple):
+    """单个方块在某一旋转状态下的几何数据"""
+    piece_type: str
+    rotation: int
+    width: int
+    height: int
+    # 占用格子的(列, 行)偏移
+    cells: Tuple[Tuple[int, int], ...]
+    # 每行的位掩码，第col列对应第col位
+    row_masks: Tuple[int, ...]
+    # 每列从包围盒底部算起的高度
+    column_heights: Tuple[int, ...]
+    # 每列最低占用格子的行偏移（底部轮廓）
+    column_bottoms: Tuple[int, ...]
+    # 占用格子的最左列、最右列和最低行偏移，用于一次判断是否越界
+    left: int
+    right: int
+    bottom: int
+    # 非空行的(行偏移, 位掩码)，碰撞检测时跳过空行
+    filled_rows: Tuple[Tuple[int, int], ...]
+
+
+# 墙踢算法的偏移位置（按尝试顺序）
+WALL_KICK_OFFSETS: Tuple[Tuple[int, int], ...] = (
+    (0, -1),   # 向上
+    (1, -1),   # 右上
+    (-1, -1),  # 左上
+    (1, 0),    # 右
+    (-1, 0),   # 左
+    (1, 1),    # 右下
+    (-1, 1),   # 左下
+    (0, 1),    # 下
+)
+
+
+def _build_geometry(piece_type: str, rotation: int, shape: List[List[int]]) -> PieceGeometry:
+    """根据形状矩阵计算几何数据"""
+    height = len(shape)
+    width = len(shape[0])
+    cells = tuple((col, row)
+                  for row in range(height)
+                  for col in range(width)
+                  if shape[row][col])
+    row_masks = tuple(sum(1 << col for col in range(width) if shape[row][col])
+                      for row in range(height))
+
+    column_heights = []
+    column_bottoms = []
+    for col in range(width):
+        rows = [row for row in range(height) if shape[row][col]]
+        column_heights.append(height - min(rows) if rows else 0)
+        column_bottoms.append(max(rows) if rows else -1)
+
+    filled_rows = tuple((row, mask) for row, mask in enumerate(row_masks) if mask)
+    return PieceGeometry(piece_type, rotation, width, height, cells, row_masks,
+                         tuple(column_heights), tuple(column_bottoms),
+                         min(col for col, _ in cells), max(col for col, _ in cells),
+                         max(row for _, row in cells), filled_rows)
+
+
+PIECE_GEOMETRY = MappingProxyType({
+    piece_type: tuple(_build_geometry(piece_type, rotation, shape)
+                      for rotation, shape in enumerate(shapes))
+    for piece_type, shapes in PIECE_SHAPES.items()
+})
+
+ROTATION_COUNTS = MappingProxyType({
+    piece_type: len(geometries) for piece_type, geometries in PIECE_GEOMETRY.items()
+})
+
+
+def get_geometry(piece_type: str, rotation: int) -> PieceGeometry:
+    """获取指定方块和旋转状态的几何数据"""
+    return PIECE_GEOMETRY[piece_type][rotation]
+
+
+def get_next_geometry(geometry: PieceGeometry) -> PieceGeometry:
+    """获取顺时针旋转一次后的几何数据"""
+    geometries = PIECE_GEOMETRY[geometry.piece_type]
+    return geometries[(geometry.rotation + 1) % len(geometries)]
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+落点搜索 - 在(x, y, 旋转)状态空间上做广度优先搜索，找出方块所有可到达的最终落点
+"""
+
+from collections import deque
+from typing import Dict, List, NamedTuple, Optional, Tuple
+from core.board import Board
+from core.piece import Piece
+from core.piece_geometry import PieceGeometry, PIECE_GEOMETRY, WALL_KICK_OFFSETS
+
+
+class Placement(NamedTuple):
+    """一个最终落点及到达它的操作序列"""
+    x: int
+    y: int
+    rotation: int
+    geometry: PieceGeometry
+    # 从出生位置出发的操作序列，动作名称与InputHandler的事件类型一致
+    path: Tuple[str, ...]
+
+    def get_cells(self) -> List[Tuple[int, int]]:
+        """获取落点占用的棋盘格子(x, y)"""
+        return [(self.x + col, self.y + row) for col, row in self.geometry.cells]
+
+
+State = Tuple[int, int, int]
+
+
+class PlacementFinder:
+    """落点搜索 - 不修改棋盘和方块，旋转规则与CollisionDetector.can_rotate一致"""
+
+    # 旋转时先尝试原位置，再依次尝试墙踢偏移
+    ROTATION_OFFSETS = ((0, 0),) + WALL_KICK_OFFSETS
+
+    # 方块完全位于棋盘上方时可以任意移动，继续向上墙踢不会产生新的落点
+    MIN_Y = -max(geometry.height for geometries in PIECE_GEOMETRY.values()
+                 for geometry in geometries)
+
+    def find_placements(self, board: Board, piece: Piece, x: int, y: int) -> List[Placement]:
+        """返回从(x, y)出发可到达的所有去重后的最终落点，按操作步数从少到多排列"""
+        geometries = PIECE_GEOMETRY[piece.type]
+        start = (x, y, piece.rotation)
+        if not board.is_valid_geometry(geometries[piece.rotation], x, y):
+            return []
+
+        min_y = min(y, self.MIN_Y)
+        parents: Dict[State, Optional[Tuple[State, str]]] = {start: None}
+        frontier = deque([start])
+        placements = []
+        seen_cells = set()
+
+        while frontier:
+            state = frontier.popleft()
+            state_x, state_y, rotation = state
+            geometry = geometries[rotation]
+
+            for action, next_state in self.get_moves(board, geometries, state_x, state_y, rotation):
+                if next_state[1] >= min_y and next_state not in parents:
+                    parents[next_state] = (state, action)
+                    frontier.append(next_state)
+
+            # 无法继续下落即为最终落点；不同旋转状态可能占用相同的格子，只保留步数最少的
+            if not board.is_valid_geometry(geometry, state_x, state_y + 1):
+                cells = frozenset((state_x + col, state_y + row) for col, row in geometry.cells)
+                if cells not in seen_cells:
+                    seen_cells.add(cells)
+                    placements.append(Placement(state_x, state_y, rotation, geometry,
+                                                self._get_path(parents, state)))
+
+        return placements
+
+    def get_moves(self, board: Board, geometries: Tuple[PieceGeometry, ...],
+                  x: int, y: int, rotation: int) -> List[Tuple[str, State]]:
+        """获取一个状态的所有合法后继状态"""
+        moves = []
+        # 下落放在最后：步数相同时优先先旋转、横移，再下落
+        if len(geometries) > 1:
+            next_rotation = (rotation + 1) % len(geometries)
+            next_geometry = geometries[next_rotation]
+            for offset_x, offset_y in self.ROTATION_OFFSETS:
+                if board.is_valid_geometry(next_geometry, x + offset_x, y + offset_y):
+                    moves.append(("rotate", (x + offset_x, y + offset_y, next_rotation)))
+                    break
+
+        geometry = geometries[rotation]
+        if board.is_valid_geometry(geometry, x - 1, y):
+            moves.append(("move_left", (x - 1, y, rotation)))
+        if board.is_valid_geometry(geometry, x + 1, y):
+            moves.append(("move_right", (x + 1, y, rotation)))
+        if board.is_valid_geometry(geometry, x, y + 1):
+            moves.append(("move_down", (x, y + 1, rotation)))
+
+        return moves
+
+    @staticmethod
+    def _get_path(parents: Dict[State, Optional[Tuple[State, str]]], state: State) -> Tuple[str, ...]:
+        """沿父指针还原操作序列"""
+        path = []
+        while parents[state] is not None:
+            state, action = parents[state]
+            path.append(action)
+        return tuple(reversed(path))
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+方块序列生成器 - 每个引擎独立的带种子随机数，支持多种随机策略
+"""
+
+import random
+from abc import ABC, abstractmethod
+from collections import deque
+from itertools import islice
+from typing import List, Optional, Sequence
+
+
+class PieceRandomizer(ABC):
+    """方块序列生成器基类 - 维护预生成队列，支持查看后续方块"""
+
+    def __init__(self, piece_types: Sequence[str], seed: Optional[int] = None):
+        self.piece_types = tuple(piece_types)
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.queue = deque()
+
+    def reset(self, seed: Optional[int] = None):
+        """使用新的种子重新开始序列"""
+        self.seed = seed
+        self.rng.seed(seed)
+        self.queue.clear()
+        self._on_reset()
+
+    def set_piece_types(self, piece_types: Sequence[str]):
+        """设置可用的方块类型，类型变化时丢弃已生成的队列"""
+        piece_types = tuple(piece_types)
+        if piece_types != self.piece_types:
+            self.piece_types = piece_types
+            self.queue.clear()
+            self._on_reset()
+
+    def next(self) -> str:
+        """取出下一个方块类型"""
+        if not self.queue:
+            self.queue.extend(self._generate())
+        return self.queue.popleft()
+
+    def peek(self, count: int = 1) -> List[str]:
+        """查看后续count个方块类型，不会从队列中取出"""
+        while len(self.queue) < count:
+            self.queue.extend(self._generate())
+        return list(islice(self.queue, count))
+
+    @abstractmethod
+    def _generate(self) -> List[str]:
+        """生成一批方块类型，由子类实现"""
+
+    def _on_reset(self):
+        """序列重新开始时清理子类状态"""
+        pass
+
+
+class UniformRandomizer(PieceRandomizer):
+    """均匀随机 - 每个方块独立等概率选择"""
+
+    def _generate(self) -> List[str]:
+        return [self.rng.choice(self.piece_types)]
+
+
+class BagRandomizer(PieceRandomizer):
+    """7-bag随机 - 每袋包含每种可用方块各一个，打乱后依次发出"""
+
+    def _generate(self) -> List[str]:
+        bag = list(self.piece_types)
+        self.rng.shuffle(bag)
+        return bag
+
+
+class HistoryRandomizer(PieceRandomizer):
+    """历史随机 - 若结果出现在最近的历史中则重抽，最多重抽rolls次"""
+
+    def __init__(self, piece_types: Sequence[str], seed: Optional[int] = None,
+                 history_size: int = 4, rolls: int = 4):
+        self.history_size = history_size
+        self.rolls = rolls
+        self.history = deque(maxlen=history_size)
+        super().__init__(piece_types, seed)
+
+    def _generate(self) -> List[str]:
+        for _ in range(self.rolls):
+            piece_type = self.rng.choice(self.piece_types)
+            if piece_type not in self.history:
+                break
+        self.history.append(piece_type)
+        return [piece_type]
+
+    def _on_reset(self):
+        self.history.clear()
+
+
+RANDOMIZERS = {
+    "uniform": UniformRandomizer,
+    "bag": BagRandomizer,
+    "history": HistoryRandomizer,
+}
+
+
+def create_randomizer(name: str, piece_types: Sequence[str],
+                      seed: Optional[int] = None) -> PieceRandomizer:
+    """根据名称创建方块序列生成器"""
+    if name not in RANDOMIZERS:
+        raise ValueError(f"未知的方块随机策略: {name}")
+    return RANDOMIZERS[name](piece_types, seed)
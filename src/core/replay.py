@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+游戏回放 - 紧凑的二进制录制格式、后台写盘的录制器和无界面回放器
+
+文件格式（所有整数均为无符号LEB128变长编码）：
+    头部: b"TRPL" | 版本(1字节) | 种子 | 模式(0经典/1关卡) | 关卡编号 | 随机策略名长度 | 随机策略名
+    记录: tick增量 | 动作编码(1字节) | 动作附带的参数...
+"""
+
+import copy
+import queue
+import threading
+from typing import List, NamedTuple, Optional, Tuple, Union
+from config.game_config import GameConfig
+from core.board import Board
+from core.clock import TickClock
+from core.game_engine import GameEngine
+from core.game_state import GameState
+
+
+REPLAY_MAGIC = b"TRPL"
+REPLAY_VERSION = 1
+
+# 动作编码，前四个和hard_drop与InputHandler产生的事件类型一致
+ACTION_CODES = {
+    "move_left": 0,
+    "move_right": 1,
+    "move_down": 2,
+    "rotate": 3,
+    "toggle_pause": 4,
+    "reset_game": 5,   # 参数：新的随机种子
+    "gravity": 6,      # 自动下落
+    "time_up": 7,      # 关卡超时
+    "end": 8,          # 参数：最终分数、已消除行数
+    "hard_drop": 9,
+}
+ACTION_NAMES = {code: name for name, code in ACTION_CODES.items()}
+ACTION_PAYLOAD_SIZES = {"reset_game": 1, "end": 2}
+
+GAME_MODES = ("classic", "level")
+
+
+class ReplayHeader(NamedTuple):
+    """回放文件头"""
+    seed: int
+    game_mode: str
+    level_id: int
+    randomizer: str
+
+
+class ReplayRecord(NamedTuple):
+    """单条回放记录"""
+    tick: int
+    action: str
+    payload: Tuple[int, ...]
+
+
+class ReplayResult(NamedTuple):
+    """回放结果"""
+    game_state: GameState
+    board: Board
+    ticks: int
+    expected_score: Optional[int]
+    expected_lines: Optional[int]
+
+    @property
+    def matches(self) -> bool:
+        """回放得到的分数和行数是否与录制时一致"""
+        return (self.expected_score == self.game_state.score and
+                self.expected_lines == self.game_state.lines_cleared)
+
+
+def encode_varint(value: int, out: bytearray):
+    """把非负整数以LEB128编码追加到out"""
+    while value > 0x7F:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def decode_varint(data: bytes, pos: int) -> Tuple[int, int]:
+    """从data[pos:]解码一个LEB128整数，返回(值, 新位置)"""
+    value = 0
+    shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, pos
+        shift += 7
+
+
+def encode_header(header: ReplayHeader) -> bytearray:
+    """编码文件头"""
+    out = bytearray(REPLAY_MAGIC)
+    out.append(REPLAY_VERSION)
+    encode_varint(header.seed, out)
+    encode_varint(GAME_MODES.index(header.game_mode), out)
+    encode_varint(header.level_id, out)
+    name = header.randomizer.encode("utf-8")
+    encode_varint(len(name), out)
+    out.extend(name)
+    return out
+
+
+class ReplayRecorder:
+    """回放录制器 - 记录写入内存缓冲，每帧结束时交给后台线程写盘"""
+
+    def __init__(self, path: str, header: ReplayHeader):
+        self.path = path
+        self.header = header
+        self.tick = 0
+        self._last_tick = 0
+        self._buffer = encode_header(header)
+        self._queue = queue.SimpleQueue()
+        self._file = open(path, "wb")
+        self._thread = threading.Thread(target=self._write_loop, daemon=True)
+        self._thread.start()
+
+    def record(self, action: str, *payload: int):
+        """记录当前tick发生的动作"""
+        encode_varint(self.tick - self._last_tick, self._buffer)
+        self._last_tick = self.tick
+        self._buffer.append(ACTION_CODES[action])
+        for value in payload:
+            encode_varint(value, self._buffer)
+
+    def next_frame(self):
+        """结束当前帧：把缓冲交给写盘线程并推进tick"""
+        self.flush()
+        self.tick += 1
+
+    def flush(self):
+        """把缓冲中的记录交给写盘线程，不等待写盘完成"""
+        if self._buffer:
+            self._queue.put(bytes(self._buffer))
+            self._buffer.clear()
+
+    def close(self, game_state: GameState):
+        """写入最终分数和行数，等待写盘线程结束并关闭文件"""
+        self.record("end", game_state.score, game_state.lines_cleared)
+        self.flush()
+        self._queue.put(None)
+        self._thread.join()
+        self._file.close()
+
+    def _write_loop(self):
+        """写盘线程"""
+        while True:
+            chunk = self._queue.get()
+            if chunk is None:
+                break
+            self._file.write(chunk)
+
+
+def read_replay(data: bytes) -> Tuple[ReplayHeader, List[ReplayRecord]]:
+    """解析回放数据"""
+    if data[:len(REPLAY_MAGIC)] != REPLAY_MAGIC:
+        raise ValueError("不是有效的回放文件")
+    pos = len(REPLAY_MAGIC)
+    if data[pos] != REPLAY_VERSION:
+        raise ValueError(f"不支持的回放版本: {data[pos]}")
+    pos += 1
+
+    seed, pos = decode_varint(data, pos)
+    mode, pos = decode_varint(data, pos)
+    level_id, pos = decode_varint(data, pos)
+    name_length, pos = decode_varint(data, pos)
+    randomizer = data[pos:pos + name_length].decode("utf-8")
+    pos += name_length
+    header = ReplayHeader(seed, GAME_MODES[mode], level_id, randomizer)
+
+    records = []
+    tick = 0
+    while pos < len(data):
+        delta, pos = decode_varint(data, pos)
+        tick += delta
+        action = ACTION_NAMES[data[pos]]
+        pos += 1
+        payload = []
+        for _ in range(ACTION_PAYLOAD_SIZES.get(action, 0)):
+            value, pos = decode_varint(data, pos)
+            payload.append(value)
+        records.append(ReplayRecord(tick, action, tuple(payload)))
+
+    return header, records
+
+
+def load_replay(path: str) -> Tuple[ReplayHeader, List[ReplayRecord]]:
+    """从文件读取回放"""
+    with open(path, "rb") as f:
+        return read_replay(f.read())
+
+
+def replay(source: Union[str, bytes], config: Optional[GameConfig] = None) -> ReplayResult:
+    """无界面重放一局游戏，不等待实际时间，直接按记录顺序执行"""
+    header, records = read_replay(source) if isinstance(source, bytes) else load_replay(source)
+
+    config = copy.copy(config) if config is not None else GameConfig()
+    config.PIECE_RANDOMIZER = header.randomizer
+    clock = TickClock(1000.0 / config.LOGIC_TICK_RATE)
+
+    level_manager = None
+    try:
+        from level.level_manager import LevelManager
+        level_manager = LevelManager(clock=clock, persist_progress=False)
+    except ImportError:
+        pass
+
+    # 与TetrisGame启动顺序一致：先以经典模式生成方块，再切换模式并加载关卡
+    engine = GameEngine(config, clock=clock, level_manager=level_manager, seed=header.seed)
+    engine.spawn_new_piece()
+    state = engine.game_state
+    state.game_mode = header.game_mode
+    if header.game_mode == "level":
+        if not level_manager or not level_manager.load_level(header.level_id, check_unlock=False):
+            raise ValueError(f"无法加载关卡 {header.level_id}")
+        state.current_level_id = header.level_id
+
+    handlers = {
+        "move_left": lambda: engine.handle_piece_movement(-1, 0),
+        "move_right": lambda: engine.handle_piece_movement(1, 0),
+        "move_down": lambda: engine.handle_piece_movement(0, 1),
+        "rotate": engine.handle_piece_rotation,
+        "hard_drop": engine.hard_drop,
+        "gravity": engine.apply_gravity,
+    }
+
+    expected_score = expected_lines = None
+    ticks = 0
+    for record in records:
+        clock.ticks = ticks = record.tick
+        if record.action in handlers:
+            handlers[record.action]()
+        elif record.action == "toggle_pause":
+            state.paused = not state.paused
+        elif record.action == "reset_game":
+            engine.reset_game(seed=record.payload[0])
+            state = engine.game_state
+        elif record.action == "time_up":
+            state.level_failed = True
+        elif record.action == "end":
+            expected_score, expected_lines = record.payload
+
+    return ReplayResult(state, engine.board, ticks, expected_score, expected_lines)
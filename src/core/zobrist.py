@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Zobrist哈希 - 游戏板占用情况的哈希键，只由格子是否占用决定，颜色不参与
+
+每列有一个随机的列键，第row行第col列格子的键是列键循环左移row位。
+一行的键等于该行列键的异或（行内容键）循环左移行号位，消行时行内容键随行一起下移，
+移动后的行只需重新移位，不需要重新扫描格子。键的位数不少于游戏板高度，不同行的移位不会重复。
+"""
+
+import random
+from functools import lru_cache
+from typing import NamedTuple, Sequence, Tuple
+
+
+ZOBRIST_SEED = 20240601
+MIN_HASH_BITS = 64
+
+
+class ZobristKeys(NamedTuple):
+    """一种游戏板尺寸的哈希键表"""
+    bits: int
+    # 每列的列键
+    column_keys: Tuple[int, ...]
+    # cell_keys[row][col]：格子的键
+    cell_keys: Tuple[Tuple[int, ...], ...]
+
+
+def rotate_key(key: int, shift: int, bits: int) -> int:
+    """把bits位的键循环左移shift位"""
+    shift %= bits
+    return ((key << shift) | (key >> (bits - shift))) & ((1 << bits) - 1)
+
+
+@lru_cache(maxsize=None)
+def get_zobrist_keys(width: int, height: int) -> ZobristKeys:
+    """宽width、高height的游戏板的键表，固定种子生成，不同进程中相同"""
+    bits = max(MIN_HASH_BITS, height)
+    rng = random.Random(f"{ZOBRIST_SEED}:{bits}")
+    column_keys = tuple(rng.getrandbits(bits) for _ in range(width))
+    cell_keys = tuple(tuple(rotate_key(key, row, bits) for key in column_keys) for row in range(height))
+    return ZobristKeys(bits, column_keys, cell_keys)
+
+
+def hash_rows(rows: Sequence[int], width: int) -> int:
+    """按行位掩码计算哈希，与同样占用情况的Board.zobrist_hash相同"""
+    keys = get_zobrist_keys(width, len(rows))
+    value = 0
+    for row, mask in enumerate(rows):
+        cell_keys = keys.cell_keys[row]
+        while mask:
+            lowest = mask & -mask
+            value ^= cell_keys[lowest.bit_length() - 1]
+            mask ^= lowest
+    return value
+
+
+@lru_cache(maxsize=None)
+def get_sequence_key(pieces: Tuple[str, ...]) -> int:
+    """方块序列（例如剩余的预览方块）的键，与游戏板哈希异或后区分不同的搜索任务"""
+    rng = random.Random(f"{ZOBRIST_SEED}:sequence:{','.join(pieces)}")
+    return rng.getrandbits(MIN_HASH_BITS) if pieces else 0
@@ -5,17 +5,20 @@
 负责关卡加载、进度跟踪和特殊规则处理
 """
 
-import pygame
-import time
 import json
 import os
 from typing import Dict, List, Optional, Tuple
 from config.level_config import LevelConfig
+from core.clock import WallClock
 
 class LevelManager:
     """关卡管理器"""
     
-    def __init__(self):
+    def __init__(self, clock=None, persist_progress: bool = True):
+        # 时间源：默认使用系统时间，无界面仿真时注入TickClock
+        self.clock = clock if clock is not None else WallClock()
+        # 仿真时不读写进度文件
+        self.persist_progress = persist_progress
         self.current_level_id = 1
         self.current_level_config = None
         self.completed_levels = []
@@ -26,20 +29,20 @@ class LevelManager:
         # 特殊规则状态
         self.special_rules = {}
         self.rotation_count = 0
-        self.start_time = 0
+        self.start_time: Optional[float] = None
         self.time_limit = None
         
         # 加载进度
         self.load_progress()
     
-    def load_level(self, level_id: int) -> bool:
+    def load_level(self, level_id: int, check_unlock: bool = True) -> bool:
         """加载指定关卡"""
         config = LevelConfig.get_level_config(level_id)
         if not config:
             return False
         
         # 检查解锁条件
-        if not self.is_level_unlocked(level_id):
+        if check_unlock and not self.is_level_unlocked(level_id):
             return False
         
         self.current_level_id = level_id
@@ -48,7 +51,7 @@ class LevelManager:
         # 重置特殊规则状态
         self.special_rules = config.get("special_rules", {})
         self.rotation_count = 0
-        self.start_time = time.time()
+        self.start_time = self.clock.now()
         self.time_limit = config.get("time_limit")
         
         return True
@@ -86,8 +89,8 @@ class LevelManager:
         target_lines = self.get_target_lines()
         
         # 检查是否有时间限制
-        if self.time_limit and self.start_time:
-            elapsed_time = time.time() - self.start_time
+        if self.time_limit and self.start_time is not None:
+            elapsed_time = self.clock.now() - self.start_time
             if elapsed_time > self.time_limit:
                 return False  # 超时失败
         
@@ -156,10 +159,10 @@ class LevelManager:
     
     def get_time_remaining(self) -> Optional[int]:
         """获取剩余时间（秒）"""
-        if not self.time_limit or not self.start_time:
+        if not self.time_limit or self.start_time is None:
             return None
         
-        elapsed = time.time() - self.start_time
+        elapsed = self.clock.now() - self.start_time
         remaining = self.time_limit - elapsed
         return max(0, int(remaining))
     
@@ -214,6 +217,9 @@ class LevelManager:
     
     def save_progress(self):
         """保存进度到文件"""
+        if not self.persist_progress:
+            return
+        
         progress_data = {
             "completed_levels": self.completed_levels,
             "level_scores": self.level_scores,
@@ -229,6 +235,9 @@ class LevelManager:
     
     def load_progress(self):
         """从文件加载进度"""
+        if not self.persist_progress:
+            return
+        
         try:
             if os.path.exists("level_progress.json"):
                 with open("level_progress.json", "r", encoding="utf-8") as f:
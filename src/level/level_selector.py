@@ -10,6 +10,7 @@ import sys
 from typing import Optional, Dict, List
 from level.level_manager import LevelManager
 from config.level_config import LevelConfig
+from utils.text_cache import get_text_cache
 
 try:
     from font_utils import FontManager
@@ -26,6 +27,8 @@ class LevelSelector:
     def __init__(self, screen: pygame.Surface):
         self.screen = screen
         self.level_manager = LevelManager()
+        # 共享的文字渲染缓存，界面文字只在内容变化时重新渲染
+        self.text_cache = get_text_cache()
         
         # 界面配置
         self.grid_size = 5  # 每行显示的关卡数
@@ -72,7 +75,7 @@ class LevelSelector:
         self.screen.fill(self.BACKGROUND_COLOR)
         
         # 绘制标题
-        title_text = self.title_font.render("Select Level", True, self.TITLE_COLOR)
+        title_text = self.text_cache.render(self.title_font, "Select Level", self.TITLE_COLOR)
         title_rect = title_text.get_rect(center=(400, 50))
         self.screen.blit(title_text, title_rect)
         
@@ -117,7 +120,7 @@ class LevelSelector:
             pygame.draw.rect(self.screen, (255, 255, 255), button_rect, 2)
             
             # 绘制关卡编号
-            level_text = self.button_font.render(str(level_id), True, (0, 0, 0))
+            level_text = self.text_cache.render(self.button_font, str(level_id), (0, 0, 0))
             text_rect = level_text.get_rect(center=button_rect.center)
             self.screen.blit(level_text, text_rect)
             
@@ -152,34 +155,34 @@ class LevelSelector:
         pygame.draw.rect(self.screen, (255, 255, 255), info_rect, 2)
         
         # 绘制关卡名称
-        name_text = self.title_font.render(config["name"], True, self.TITLE_COLOR)
+        name_text = self.text_cache.render(self.title_font, config["name"], self.TITLE_COLOR)
         self.screen.blit(name_text, (info_x + 10, info_y + 10))
         
         # 绘制关卡描述
-        desc_text = self.info_font.render(config["description"], True, (200, 200, 200))
+        desc_text = self.text_cache.render(self.info_font, config["description"], (200, 200, 200))
         self.screen.blit(desc_text, (info_x + 10, info_y + 60))
         
         # 绘制目标行数
-        target_text = self.info_font.render(f"Target Lines: {config['target_lines']}", True, (200, 200, 200))
+        target_text = self.text_cache.render(self.info_font, f"Target Lines: {config['target_lines']}", (200, 200, 200))
         self.screen.blit(target_text, (info_x + 10, info_y + 90))
         
         # 绘制速度倍数
-        speed_text = self.info_font.render(f"Speed Multiplier: {config['speed_multiplier']}x", True, (200, 200, 200))
+        speed_text = self.text_cache.render(self.info_font, f"Speed Multiplier: {config['speed_multiplier']}x", (200, 200, 200))
         self.screen.blit(speed_text, (info_x + 10, info_y + 110))
         
         # 绘制时间限制
         if config.get("time_limit"):
-            time_text = self.info_font.render(f"Time Limit: {config['time_limit']}s", True, (200, 200, 200))
+            time_text = self.text_cache.render(self.info_font, f"Time Limit: {config['time_limit']}s", (200, 200, 200))
             self.screen.blit(time_text, (info_x + 10, info_y + 130))
         
         # 绘制特殊规则
         if config.get("special_rules"):
-            rules_text = self.info_font.render("Special Rules:", True, (255, 100, 100))
+            rules_text = self.text_cache.render(self.info_font, "Special Rules:", (255, 100, 100))
             self.screen.blit(rules_text, (info_x + 10, info_y + 150))
             
             y_offset = 170
             for rule, value in config["special_rules"].items():
-                rule_text = self.info_font.render(f"• {rule}: {value}", True, (255, 150, 150))
+                rule_text = self.text_cache.render(self.info_font, f"• {rule}: {value}", (255, 150, 150))
                 self.screen.blit(rule_text, (info_x + 20, info_y + y_offset))
                 y_offset += 20
     
@@ -195,7 +198,7 @@ class LevelSelector:
         
         y = 500
         for instruction in instructions:
-            text = self.info_font.render(instruction, True, (200, 200, 200))
+            text = self.text_cache.render(self.info_font, instruction, (200, 200, 200))
             self.screen.blit(text, (50, y))
             y += 25
     
@@ -213,14 +216,14 @@ class LevelSelector:
         pygame.draw.rect(self.screen, (255, 255, 255), progress_rect, 2)
         
         # 绘制进度信息
-        completed_text = self.info_font.render(f"Completed: {len(progress['completed_levels'])}/{progress['total_levels']}", True, (200, 200, 200))
+        completed_text = self.text_cache.render(self.info_font, f"Completed: {len(progress['completed_levels'])}/{progress['total_levels']}", (200, 200, 200))
         self.screen.blit(completed_text, (info_x + 10, info_y + 10))
         
-        total_stars_text = self.info_font.render(f"Total Stars: {progress['total_stars']}", True, (200, 200, 200))
+        total_stars_text = self.text_cache.render(self.info_font, f"Total Stars: {progress['total_stars']}", (200, 200, 200))
         self.screen.blit(total_stars_text, (info_x + 10, info_y + 30))
         
         completion_rate = len(progress['completed_levels']) / progress['total_levels'] * 100
-        rate_text = self.info_font.render(f"Completion: {completion_rate:.1f}%", True, (200, 200, 200))
+        rate_text = self.text_cache.render(self.info_font, f"Completion: {completion_rate:.1f}%", (200, 200, 200))
         self.screen.blit(rate_text, (info_x + 10, info_y + 50))
     
     def handle_input(self, event) -> Optional[int]:
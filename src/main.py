@@ -6,17 +6,31 @@
 """
 
 import pygame
+import os
 import sys
 import time
+from typing import Optional
 from config.game_config import GameConfig
+from core.clock import TickClock
 from core.game_engine import GameEngine
-from ui.renderer import Renderer
+from core.game_loop import FixedTimestep
+from core.replay import ReplayHeader, ReplayRecorder
+from ai.player import AIPlayer
+from ui.renderer import create_renderer
 from ui.input_handler import InputHandler
+from utils.font_utils import FontManager
+from utils.profiler import FrameProfiler
 
 
 class TetrisGame:
     """俄罗斯方块游戏主类"""
     
+    # 需要录制到回放中的输入事件（重置游戏单独录制，附带新的种子）
+    RECORDED_EVENTS = ("move_left", "move_right", "move_down", "rotate", "hard_drop", "toggle_pause")
+    
+    # AI模式下由AI控制、忽略玩家按键的操作
+    PIECE_CONTROL_EVENTS = ("move_left", "move_right", "move_down", "rotate", "hard_drop")
+    
     def __init__(self):
         pygame.init()
         self.config = GameConfig()
@@ -24,22 +38,45 @@ class TetrisGame:
         pygame.display.set_caption("Tetris Game")
         self.clock = pygame.time.Clock()
         
+        # 固定时间步长：逻辑按LOGIC_TICK_RATE推进，游戏时间由逻辑tick驱动，与渲染帧率无关
+        self.loop = FixedTimestep(1000.0 / self.config.LOGIC_TICK_RATE,
+                                  frame_ms=1000.0 / self.config.TARGET_FPS,
+                                  max_frame_ms=self.config.MAX_FRAME_TIME,
+                                  max_ticks_per_frame=self.config.MAX_CATCH_UP_TICKS)
+        self.tick_clock = TickClock(self.loop.tick_ms)
+        
         # 初始化游戏组件
-        self.game_engine = GameEngine(self.config)
-        self.renderer = Renderer(self.screen, self.config)
+        self.game_engine = GameEngine(self.config, clock=self.tick_clock)
+        self.renderer = create_renderer(self.screen, self.config)
         self.input_handler = InputHandler(self.config)
+        # 帧时间分析器，未启用时不记录
+        self.profiler = FrameProfiler(self.config.PROFILER_CAPACITY, self.config.PROFILER_ENABLED)
         
         self.running = True
         self.return_to_menu = False
+        self.recorder = None
+        # AI玩家，为None时由玩家操作
+        self.ai_player = None
+        self.last_ai_action_time = 0.0
+        # 上一个逻辑tick开始时的方块状态(方块, 旋转, x, y)，用于插值渲染；之后的玩家操作会平移该状态
+        self.previous_piece_state = None
         
         # 初始化游戏
         self.game_engine.spawn_new_piece()
     
     def handle_input(self):
         """处理用户输入"""
+        before = self.get_piece_state()
         events = self.input_handler.handle_events()
         
         for event in events:
+            if self.ai_player is not None and event.event_type in self.PIECE_CONTROL_EVENTS:
+                continue
+            
+            # 录制影响游戏结果的操作
+            if self.recorder is not None and event.event_type in self.RECORDED_EVENTS:
+                self.recorder.record(event.event_type)
+            
             if event.event_type == "quit":
                 self.running = False
             
@@ -55,45 +92,174 @@ class TetrisGame:
             elif event.event_type == "rotate":
                 self.game_engine.handle_piece_rotation()
             
+            elif event.event_type == "hard_drop":
+                self.game_engine.hard_drop()
+            
             elif event.event_type == "toggle_pause":
                 self.game_engine.get_game_state().paused = not self.game_engine.get_game_state().paused
             
             elif event.event_type == "reset_game":
                 self.game_engine.reset_game()
+                if self.recorder is not None:
+                    self.recorder.record("reset_game", self.game_engine.seed)
             
             elif event.event_type == "return_to_menu":
                 self.return_to_menu = True
                 self.running = False
+            
+            elif event.event_type == "toggle_profiler":
+                self.profiler.toggle_overlay(keep_recording=self.config.PROFILER_ENABLED)
+                # 脏矩形渲染器需要全屏重绘才能擦除隐藏的叠加显示
+                if not self.profiler.overlay_visible and hasattr(self.renderer, "invalidate"):
+                    self.renderer.invalidate()
+        
+        self.shift_previous_state(before)
+    
+    def shift_previous_state(self, before):
+        """玩家操作立即生效、不参与插值：把上一个tick的方块状态平移操作造成的位移
+
+        换方块或旋转后get_render_position本来就不插值，直接使用操作后的状态。
+        """
+        after = self.get_piece_state()
+        previous = self.previous_piece_state
+        if previous is None or after == before:
+            return
+        if before is None or after is None or after[:2] != before[:2]:
+            self.previous_piece_state = after
+            return
+        self.previous_piece_state = previous[:2] + (previous[2] + after[2] - before[2],
+                                                    previous[3] + after[3] - before[3])
     
     def update(self):
-        """更新游戏状态"""
-        delta_time = self.clock.get_time() / 1000.0  # 转换为秒
-        self.game_engine.update(delta_time)
+        """执行一个逻辑tick"""
+        self.previous_piece_state = self.get_piece_state()
+        self.update_ai()
+        self.game_engine.update(self.loop.tick_seconds)
+        if self.recorder is not None:
+            self.recorder.next_frame()
+        self.tick_clock.advance()
+    
+    def get_piece_state(self):
+        """获取当前方块的状态(方块, 旋转, x, y)"""
+        game_state = self.game_engine.get_game_state()
+        piece = game_state.current_piece
+        if piece is None:
+            return None
+        return (piece, piece.rotation) + game_state.get_piece_position()
     
-    def render(self):
-        """渲染游戏画面"""
-        self.screen.fill((0, 0, 0))  # 黑色背景
+    def get_render_position(self, alpha: float):
+        """在上一个和当前逻辑tick之间插值计算当前方块的绘制位置，同一方块且未旋转时才插值"""
+        current = self.get_piece_state()
+        previous = self.previous_piece_state
+        if current is None:
+            return None
+        if previous is None or previous[:2] != current[:2]:
+            return current[2], current[3]
         
-        # 渲染游戏板
-        self.renderer.render_board(self.game_engine.get_board())
+        x = previous[2] + (current[2] - previous[2]) * alpha
+        y = previous[3] + (current[3] - previous[3]) * alpha
+        return x, y
+    
+    def enable_ai(self, lookahead: Optional[int] = None):
+        """开启AI模式，由AI代替玩家操作方块"""
+        if lookahead is None:
+            lookahead = self.config.AI_LOOKAHEAD
+        self.ai_player = AIPlayer(self.config.BOARD_WIDTH, lookahead)
+    
+    def update_ai(self):
+        """按间隔执行AI的下一个操作，游戏结束后自动重新开始"""
+        if self.ai_player is None:
+            return
         
-        # 渲染当前方块
-        game_state = self.game_engine.get_game_state()
-        if game_state.current_piece:
-            self.renderer.render_piece(game_state.current_piece, game_state.get_piece_position())
+        current_time = self.game_engine.clock.now()
+        if current_time - self.last_ai_action_time < self.config.AI_ACTION_DELAY / 1000.0:
+            return
+        self.last_ai_action_time = current_time
+        
+        if self.game_engine.get_game_state().game_over:
+            self.game_engine.reset_game()
+            if self.recorder is not None:
+                self.recorder.record("reset_game", self.game_engine.seed)
+            return
         
-        # 渲染用户界面
-        self.renderer.render_ui(game_state)
+        action = self.ai_player.get_action(self.game_engine)
+        if action == "none":
+            return
         
-        pygame.display.flip()
+        if self.recorder is not None:
+            self.recorder.record(action)
+        if action == "rotate":
+            self.game_engine.handle_piece_rotation()
+        else:
+            dx, dy = {"move_left": (-1, 0), "move_right": (1, 0), "move_down": (0, 1)}[action]
+            self.game_engine.handle_piece_movement(dx, dy)
+    
+    def render(self, alpha: float = 1.0):
+        """渲染游戏画面，alpha为距上一个逻辑tick经过的时间占一个tick的比例"""
+        piece_position = None
+        if self.config.RENDER_INTERPOLATION:
+            piece_position = self.get_render_position(alpha)
+        dirty_rects = self.renderer.render_frame(self.game_engine.get_board(),
+                                                 self.game_engine.get_game_state(),
+                                                 piece_position)
+        overlay_rect = self.profiler.render_overlay(self.screen, self.renderer.small_font)
+        if overlay_rect is not None and dirty_rects is not None:
+            dirty_rects.append(overlay_rect)
+        self.profiler.mark("render")
+        
+        # 脏矩形模式只把重绘过的区域提交到屏幕
+        if dirty_rects is None:
+            pygame.display.flip()
+        else:
+            pygame.display.update(dirty_rects)
+        self.profiler.mark("flip")
+    
+    def report_loop_stats(self):
+        """有掉帧或丢弃逻辑tick时输出游戏循环统计"""
+        stats = self.loop.get_stats()
+        if stats["dropped_frames"] or stats["skipped_ticks"]:
+            print(f"游戏循环统计: {stats['frames']}帧, {stats['ticks']}个逻辑tick, "
+                  f"掉帧{stats['dropped_frames']}, 追赶tick {stats['catch_up_ticks']}, "
+                  f"丢弃tick {stats['skipped_ticks']}")
+    
+    def start_recording(self, path: str):
+        """开始录制回放到指定文件"""
+        game_state = self.game_engine.get_game_state()
+        header = ReplayHeader(self.game_engine.seed, game_state.game_mode,
+                              game_state.current_level_id, self.config.PIECE_RANDOMIZER)
+        self.recorder = ReplayRecorder(path, header)
+        self.game_engine.recorder = self.recorder
+    
+    def stop_recording(self):
+        """结束录制，写入最终分数和行数"""
+        if self.recorder is None:
+            return
+        
+        self.recorder.close(self.game_engine.get_game_state())
+        self.game_engine.recorder = None
+        self.recorder = None
     
     def run(self):
         """主游戏循环"""
+        if self.config.REPLAY_DIR and self.recorder is None:
+            os.makedirs(self.config.REPLAY_DIR, exist_ok=True)
+            filename = time.strftime("replay_%Y%m%d_%H%M%S.trpl")
+            self.start_recording(os.path.join(self.config.REPLAY_DIR, filename))
+        
+        last_time = time.perf_counter()
         while self.running:
             try:
+                current_time = time.perf_counter()
+                ticks = self.loop.advance(current_time - last_time)
+                last_time = current_time
+                
+                self.profiler.begin_frame()
                 self.handle_input()
-                self.update()
-                self.render()
+                self.profiler.mark("input")
+                for _ in range(ticks):
+                    self.update()
+                self.profiler.mark("update")
+                self.render(self.loop.alpha)
                 self.clock.tick(self.config.TARGET_FPS)
             except Exception as e:
                 print(f"游戏循环出错: {e}")
@@ -101,6 +267,11 @@ class TetrisGame:
                 traceback.print_exc()
                 break
         
+        self.stop_recording()
+        self.report_loop_stats()
+        if self.config.PROFILER_DUMP_PATH and self.profiler.count:
+            self.profiler.dump(self.config.PROFILER_DUMP_PATH)
+        
         # 返回是否应该回到主菜单
         return self.return_to_menu
 
@@ -108,6 +279,8 @@ class TetrisGame:
 def main():
     """主函数"""
     pygame.init()
+    # 在后台查找字体，菜单先用默认字体显示
+    FontManager.start_discovery()
     screen = pygame.display.set_mode((GameConfig.SCREEN_WIDTH, GameConfig.SCREEN_HEIGHT))
     pygame.display.set_caption("俄罗斯方块")
     
@@ -129,6 +302,14 @@ def main():
                 should_return_to_menu = game.run()
                 if not should_return_to_menu:
                     break  # 如果游戏没有要求返回菜单，则退出程序
+            elif choice == "ai":
+                # AI模式：经典规则，由AI自动操作
+                game = TetrisGame()
+                game.game_engine.get_game_state().game_mode = "classic"
+                game.enable_ai()
+                should_return_to_menu = game.run()
+                if not should_return_to_menu:
+                    break
             elif choice == "level":
                 # 关卡模式
                 selector = LevelSelector(screen)
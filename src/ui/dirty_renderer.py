@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+脏矩形渲染器 - 只重绘与上一帧相比发生变化的区域，配合pygame.display.update(rects)使用
+"""
+
+import pygame
+from typing import Dict, List, Optional, Tuple
+from core.board import Board
+from core.game_state import GameState
+from config.game_config import GameConfig
+from ui.renderer import Renderer, get_ghost_color
+from utils.constants import BLACK, GRAY
+
+
+Color = Optional[Tuple[int, int, int]]
+
+
+class DirtyRectRenderer(Renderer):
+    """脏矩形渲染器 - 记录上一帧的格子颜色、界面文字和预览方块，只重绘变化的部分
+
+    画面与Renderer逐像素一致。界面元素（文字和预览方块）之间假定互不重叠；
+    元素下方的格子被重绘时，先恢复元素区域的背景再重新绘制该元素。
+    """
+
+    def __init__(self, screen: pygame.Surface, config: GameConfig):
+        super().__init__(screen, config)
+        self.board_rect = pygame.Rect(config.BOARD_X - 2, config.BOARD_Y - 2,
+                                      config.BOARD_WIDTH * config.CELL_SIZE + 4,
+                                      config.BOARD_HEIGHT * config.CELL_SIZE + 4)
+        self.invalidate()
+
+    def invalidate(self):
+        """丢弃上一帧的记录，下一帧全屏重绘（例如屏幕被其他界面覆盖之后）"""
+        # 每个格子显示的颜色（已包含阴影预览和当前方块），None表示尚未绘制过
+        self._cells: Optional[List[List[Color]]] = None
+        # 当前方块位于棋盘上方的格子
+        self._overflow: Dict[Tuple[int, int], Color] = {}
+        # 界面元素：名称 -> (内容, 绘制对象, 区域)
+        self._items: Dict[str, tuple] = {}
+
+    def render_frame(self, board: Board, game_state: GameState,
+                     piece_position: Optional[Tuple[float, float]] = None) -> Optional[List[pygame.Rect]]:
+        """渲染一帧，返回本帧重绘过的区域
+
+        按格子比较变化，不支持插值：忽略piece_position，方块总是画在当前位置
+        """
+        cells, overflow = self._get_cells(board, game_state)
+        items = self._get_items(game_state)
+
+        if self._cells is None:
+            self.screen.fill(BLACK)
+            self.render_board(board)
+            self.render_ghost(board, game_state)
+            if game_state.current_piece:
+                self.render_piece(game_state.current_piece, game_state.get_piece_position())
+            self._cells = cells
+            self._overflow = overflow
+            for name, key, payload, rect in items:
+                self._draw_item(name, payload, rect)
+            self._items = {name: (key, payload, rect) for name, key, payload, rect in items}
+            return [self.screen.get_rect()]
+
+        dirty = self._update_cells(cells)
+        dirty.extend(self._update_overflow(overflow))
+        dirty.extend(self._update_items(items, dirty))
+        return dirty
+
+    def _get_cells(self, board: Board, game_state: GameState):
+        """计算本帧每个格子应显示的颜色（已包含阴影预览和当前方块）"""
+        cells = [list(row) for row in board.grid]
+        overflow = {}
+
+        piece = game_state.current_piece
+        ghost_cells = self.get_ghost_cells(board, game_state)
+        if ghost_cells:
+            ghost_color = get_ghost_color(piece.color)
+            for col, row in ghost_cells:
+                cells[row][col] = ghost_color
+
+        if piece:
+            x, y = game_state.get_piece_position()
+            for col, row in piece.geometry.cells:
+                board_y = y + row
+                if board_y >= 0:
+                    cells[board_y][x + col] = piece.color
+                else:
+                    overflow[(x + col, board_y)] = piece.color
+
+        return cells, overflow
+
+    def _get_items(self, game_state: GameState) -> list:
+        """计算本帧的界面元素，未变化的文字沿用上一帧的区域"""
+        items = []
+        for name, text, color, position in self.get_ui_texts(game_state):
+            key = (text, color, position)
+            previous = self._items.get(name)
+            if previous is not None and previous[0] == key:
+                rect = previous[2]
+            else:
+                size = self.text_cache.measure(self.font, text, color, self.digit_atlas)
+                rect = pygame.Rect(position, size)
+            items.append((name, key, key, rect))
+
+            if name == "next":
+                piece = game_state.next_piece
+                geometry = piece.geometry
+                rect = pygame.Rect(self.PREVIEW_X, self.PREVIEW_Y,
+                                   geometry.width * self.PREVIEW_CELL_SIZE,
+                                   geometry.height * self.PREVIEW_CELL_SIZE)
+                items.append(("next_piece", (piece.type, piece.rotation, piece.color), piece, rect))
+
+        return items
+
+    def _update_cells(self, cells: List[List[Color]]) -> List[pygame.Rect]:
+        """重绘颜色变化的格子，每行合并为一个区域"""
+        dirty = []
+        for row, (new_row, old_row) in enumerate(zip(cells, self._cells)):
+            if new_row == old_row:
+                continue
+
+            row_rect = None
+            for col, color in enumerate(new_row):
+                if color != old_row[col]:
+                    rect = self._draw_cell(col, row, color)
+                    row_rect = rect if row_rect is None else row_rect.union(rect)
+            dirty.append(row_rect)
+
+        self._cells = cells
+        return dirty
+
+    def _update_overflow(self, overflow: Dict[Tuple[int, int], Color]) -> List[pygame.Rect]:
+        """更新棋盘上方的方块格子"""
+        dirty = []
+        old_overflow = self._overflow
+        self._overflow = overflow
+
+        for position, color in old_overflow.items():
+            if overflow.get(position) != color:
+                rect = self._get_cell_rect(*position)
+                self._restore(rect)
+                dirty.append(rect)
+
+        for (col, row), color in overflow.items():
+            if old_overflow.get((col, row)) != color:
+                dirty.append(self._draw_cell(col, row, color))
+
+        return dirty
+
+    def _update_items(self, items: list, dirty: List[pygame.Rect]) -> List[pygame.Rect]:
+        """重绘变化或被格子覆盖的界面元素"""
+        updated = []
+        current_names = {item[0] for item in items}
+        for name, (key, payload, rect) in self._items.items():
+            if name not in current_names:
+                self._restore(rect)
+                updated.append(rect)
+
+        new_items = {}
+        for name, key, payload, rect in items:
+            previous = self._items.get(name)
+            changed = previous is None or previous[0] != key
+            if changed and previous is not None:
+                self._restore(previous[2])
+                updated.append(previous[2])
+
+            if changed or rect.collidelist(dirty) != -1 or rect.collidelist(updated) != -1:
+                self._restore(rect)
+                self._draw_item(name, payload, rect)
+                updated.append(rect)
+            new_items[name] = (key, payload, rect)
+
+        self._items = new_items
+        return updated
+
+    def _draw_item(self, name: str, payload, rect: pygame.Rect):
+        """绘制一个界面元素"""
+        if name == "next_piece":
+            self.render_next_piece(payload)
+        else:
+            text, color, position = payload
+            self.render_text(text, color, position)
+
+    def _get_cell_rect(self, col: int, row: int) -> pygame.Rect:
+        """格子在屏幕上的区域"""
+        cell_size = self.config.CELL_SIZE
+        return pygame.Rect(self.config.BOARD_X + col * cell_size,
+                           self.config.BOARD_Y + row * cell_size, cell_size, cell_size)
+
+    def _draw_cell(self, col: int, row: int, color: Color) -> pygame.Rect:
+        """绘制一个格子，空格子画成与Renderer.render_board相同的灰底黑框"""
+        return self.cell_atlas.blit_cell(self.screen, color or GRAY, self._get_cell_rect(col, row).topleft)
+
+    def _restore(self, rect: pygame.Rect):
+        """恢复区域内除界面元素以外的背景：黑底、棋盘边框、格子和棋盘上方的方块"""
+        self.screen.set_clip(rect)
+        self.screen.fill(BLACK, rect)
+
+        if rect.colliderect(self.board_rect):
+            pygame.draw.rect(self.screen, GRAY, self.board_rect)
+            cell_size = self.config.CELL_SIZE
+            first_col = max(0, (rect.left - self.config.BOARD_X) // cell_size)
+            last_col = min(self.config.BOARD_WIDTH - 1, (rect.right - 1 - self.config.BOARD_X) // cell_size)
+            first_row = max(0, (rect.top - self.config.BOARD_Y) // cell_size)
+            last_row = min(self.config.BOARD_HEIGHT - 1, (rect.bottom - 1 - self.config.BOARD_Y) // cell_size)
+            self.cell_atlas.blit_cells(self.screen, [
+                (self._cells[row][col] or GRAY, self._get_cell_rect(col, row).topleft)
+                for row in range(first_row, last_row + 1)
+                for col in range(first_col, last_col + 1)
+            ])
+
+        for (col, row), color in self._overflow.items():
+            if self._get_cell_rect(col, row).colliderect(rect):
+                self._draw_cell(col, row, color)
+
+        self.screen.set_clip(None)
@@ -60,12 +60,16 @@ class InputHandler:
                     self.down_key_last_move_time = current_time
                 elif event.key == pygame.K_UP or event.key == pygame.K_SPACE:
                     events.append(GameEvent("rotate"))
+                elif event.key == pygame.K_RETURN:
+                    events.append(GameEvent("hard_drop"))
                 elif event.key == pygame.K_p:
                     events.append(GameEvent("toggle_pause"))
                 elif event.key == pygame.K_r:
                     events.append(GameEvent("reset_game"))
                 elif event.key == pygame.K_ESCAPE:
                     events.append(GameEvent("return_to_menu"))
+                elif event.key == pygame.K_F3:
+                    events.append(GameEvent("toggle_profiler"))
             
             elif event.type == pygame.KEYUP:
                 self.keys_pressed.discard(event.key)
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+分层渲染器 - 空棋盘预渲染一次，已放置方块层缓存为表面，只在网格变化时重建
+"""
+
+import pygame
+from core.board import Board
+from config.game_config import GameConfig
+from ui.renderer import Renderer
+from utils.constants import GRAY
+
+
+class LayeredRenderer(Renderer):
+    """分层渲染器 - 每帧只需清屏、贴一次棋盘层，再绘制当前方块和界面文字
+
+    棋盘层是否过期由Board.version判断；直接修改board.grid后需要调用board.refresh()。
+    """
+
+    def __init__(self, screen: pygame.Surface, config: GameConfig):
+        super().__init__(screen, config)
+        # 棋盘层覆盖灰色边框在内的整个游戏板区域
+        self.board_rect = pygame.Rect(config.BOARD_X - 2, config.BOARD_Y - 2,
+                                      config.BOARD_WIDTH * config.CELL_SIZE + 4,
+                                      config.BOARD_HEIGHT * config.CELL_SIZE + 4)
+        self.empty_board = self._create_empty_board()
+        self.board_layer = self.empty_board.copy()
+        self.layer_rebuilds = 0
+        self._board = None
+        self._board_version = None
+
+    def render_board(self, board: Board):
+        """渲染游戏板：网格变化时重建棋盘层，然后贴到屏幕上"""
+        if board is not self._board or board.version != self._board_version:
+            self._rebuild_board_layer(board)
+        self.screen.blit(self.board_layer, self.board_rect)
+
+    def _create_empty_board(self) -> pygame.Surface:
+        """预渲染空棋盘：灰色背景和每个格子的黑色边框"""
+        surface = pygame.Surface(self.board_rect.size, 0, self.screen)
+        surface.fill(GRAY)
+        cell_size = self.config.CELL_SIZE
+        self.cell_atlas.blit_cells(surface, [
+            (GRAY, (2 + col * cell_size, 2 + row * cell_size))
+            for row in range(self.config.BOARD_HEIGHT)
+            for col in range(self.config.BOARD_WIDTH)
+        ])
+        return surface
+
+    def _rebuild_board_layer(self, board: Board):
+        """在空棋盘上重新绘制所有已放置的方块"""
+        self.board_layer.blit(self.empty_board, (0, 0))
+        cell_size = self.config.CELL_SIZE
+        self.cell_atlas.blit_cells(self.board_layer, [
+            (color, (2 + col * cell_size, 2 + row * cell_size))
+            for row, cells in enumerate(board.grid)
+            for col, color in enumerate(cells)
+            if color
+        ])
+
+        self._board = board
+        self._board_version = board.version
+        self.layer_rebuilds += 1
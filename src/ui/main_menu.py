@@ -7,8 +7,9 @@
 
 import pygame
 import sys
-from typing import Optional
+from typing import List, Optional, Tuple
 from level.level_selector import LevelSelector
+from utils.text_cache import get_text_cache
 
 try:
     from font_utils import FontManager
@@ -22,8 +23,30 @@ except ImportError:
 class MainMenu:
     """主菜单"""
     
+    # 说明文字
+    INSTRUCTIONS = (
+        "Game Instructions:",
+        "• Classic Mode (1): Endless game, challenge high score",
+        "• Level Mode (2): 20 carefully designed levels",
+        "• AI Mode (3): Watch the AI play classic mode",
+        "• Arrow Keys: Move pieces",
+        "• Space: Rotate pieces",
+        "• Enter: Hard drop",
+        "• P: Pause game",
+        "• R: Restart game",
+        "• ESC: Back to menu",
+        "• F3: Toggle profiler overlay",
+    )
+    # 说明文字从按钮下方开始逐行排列，排到屏幕底部后换到右侧的新一列
+    INSTRUCTIONS_TOP = 490
+    INSTRUCTIONS_LEFT = 40
+    INSTRUCTIONS_COLUMN_GAP = 30
+    INSTRUCTIONS_COLOR = (200, 200, 200)
+    
     def __init__(self, screen: pygame.Surface):
         self.screen = screen
+        # 共享的文字渲染缓存，菜单文字每帧不变，只渲染一次
+        self.text_cache = get_text_cache()
         
         # 颜色定义
         self.BACKGROUND_COLOR = (30, 30, 30)
@@ -52,9 +75,10 @@ class MainMenu:
         
         # 按钮配置
         self.buttons = [
-            {"text": "Classic Mode", "action": "classic", "y": 250},
-            {"text": "Level Mode", "action": "level", "y": 320},
-            {"text": "Quit Game", "action": "quit", "y": 390}
+            {"text": "Classic Mode", "action": "classic", "y": 230},
+            {"text": "Level Mode", "action": "level", "y": 295},
+            {"text": "AI Mode", "action": "ai", "y": 360},
+            {"text": "Quit Game", "action": "quit", "y": 425}
         ]
         
         self.hover_button = None
@@ -65,7 +89,7 @@ class MainMenu:
         self.screen.fill(self.BACKGROUND_COLOR)
         
         # 绘制标题
-        title_text = self.title_font.render("TETRIS", True, self.TITLE_COLOR)
+        title_text = self.text_cache.render(self.title_font, "TETRIS", self.TITLE_COLOR)
         title_rect = title_text.get_rect(center=(400, 100))
         self.screen.blit(title_text, title_rect)
         
@@ -77,27 +101,30 @@ class MainMenu:
             pygame.draw.rect(self.screen, (255, 255, 255), button_rect, 2)
             
             # 绘制按钮文字
-            text = self.button_font.render(button["text"], True, self.BUTTON_TEXT_COLOR)
+            text = self.text_cache.render(self.button_font, button["text"], self.BUTTON_TEXT_COLOR)
             text_rect = text.get_rect(center=button_rect.center)
             self.screen.blit(text, text_rect)
         
         # 绘制说明
-        instructions = [
-            "Game Instructions:",
-            "• Classic Mode: Endless game, challenge high score",
-            "• Level Mode: 20 carefully designed levels",
-            "• Arrow Keys: Move pieces",
-            "• Space: Rotate pieces",
-            "• P: Pause game",
-            "• R: Restart game",
-            "• ESC: Back to menu"
-        ]
+        for text, position in self._layout_instructions():
+            self.screen.blit(text, position)
+    
+    def _layout_instructions(self) -> List[Tuple[pygame.Surface, Tuple[int, int]]]:
+        """说明文字的表面和位置：每列的行数由字体行高和屏幕剩余高度决定，下一列排在上一列最宽的文字右侧"""
+        texts = [self.text_cache.render(self.info_font, instruction, self.INSTRUCTIONS_COLOR)
+                 for instruction in self.INSTRUCTIONS]
+        line_height = self.info_font.get_linesize()
+        space = self.screen.get_height() - self.INSTRUCTIONS_TOP - self.info_font.get_height()
+        rows = max(1, space // line_height + 1)
         
-        y = 500
-        for instruction in instructions:
-            text = self.info_font.render(instruction, True, (200, 200, 200))
-            self.screen.blit(text, (50, y))
-            y += 25
+        layout = []
+        x = self.INSTRUCTIONS_LEFT
+        for start in range(0, len(texts), rows):
+            column = texts[start:start + rows]
+            for index, text in enumerate(column):
+                layout.append((text, (x, self.INSTRUCTIONS_TOP + index * line_height)))
+            x += max(text.get_width() for text in column) + self.INSTRUCTIONS_COLUMN_GAP
+        return layout
     
     def handle_input(self, event) -> Optional[str]:
         """处理输入，返回选择的动作"""
@@ -118,6 +145,8 @@ class MainMenu:
                 return "classic"
             elif event.key == pygame.K_2:
                 return "level"
+            elif event.key == pygame.K_3:
+                return "ai"
         
         return None
     
@@ -5,26 +5,46 @@
 """
 
 import pygame
-from typing import Tuple
+from typing import List, Optional, Tuple
 from core.board import Board
 from core.piece import Piece
 from core.game_state import GameState
 from config.game_config import GameConfig
+from utils.text_cache import get_text_cache
+from ui.sprite_atlas import get_cell_atlas
 from utils.constants import BLACK, WHITE, GRAY, RED, GREEN, BLUE, YELLOW
 
 
+def get_ghost_color(color: Tuple[int, int, int]) -> Tuple[int, int, int]:
+    """阴影预览的颜色：方块颜色与空格子的灰色混合"""
+    return tuple((channel * 2 + gray * 3) // 5 for channel, gray in zip(color, GRAY))
+
+
 class Renderer:
     """渲染引擎 - 负责游戏画面渲染"""
     
+    # 下一个方块预览的位置和格子大小
+    PREVIEW_X = 50
+    PREVIEW_Y = 400
+    PREVIEW_CELL_SIZE = 20
+    
     def __init__(self, screen: pygame.Surface, config: GameConfig):
         self.screen = screen
         self.config = config
         self.font_manager = None
+        # 文字渲染缓存，数字字形模式下计数器由预渲染的数字拼接
+        self.text_cache = get_text_cache()
+        self.digit_atlas = config.HUD_DIGIT_ATLAS
+        # 预渲染的格子图集，格子通过Surface.blits批量绘制
+        self.cell_atlas = get_cell_atlas(config.CELL_SIZE)
+        self.preview_atlas = get_cell_atlas(self.PREVIEW_CELL_SIZE)
         
         # 尝试使用支持中文的字体
         try:
             from utils.font_utils import FontManager
             self.font_manager = FontManager()
+            # 字体对象会一直使用，先等待后台查找完成，不保存查找期间的默认字体
+            FontManager.wait_for_discovery()
             self.font = self.font_manager.get_font(36)
             self.small_font = self.font_manager.get_font(24)
         except ImportError:
@@ -56,103 +76,141 @@ class Renderer:
                          self.config.BOARD_WIDTH * self.config.CELL_SIZE + 4, 
                          self.config.BOARD_HEIGHT * self.config.CELL_SIZE + 4))
         
-        # 绘制网格
-        for row in range(board.height):
-            for col in range(board.width):
-                x = self.config.BOARD_X + col * self.config.CELL_SIZE
-                y = self.config.BOARD_Y + row * self.config.CELL_SIZE
-                
-                if board.grid[row][col]:
-                    # 绘制已放置的方块
-                    pygame.draw.rect(self.screen, board.grid[row][col],
-                                   (x, y, self.config.CELL_SIZE, self.config.CELL_SIZE))
-                    pygame.draw.rect(self.screen, BLACK,
-                                   (x, y, self.config.CELL_SIZE, self.config.CELL_SIZE), 1)
-                else:
-                    # 绘制空格子
-                    pygame.draw.rect(self.screen, BLACK,
-                                   (x, y, self.config.CELL_SIZE, self.config.CELL_SIZE), 1)
+        # 绘制网格，空格子使用灰底黑框的格子
+        cell_size = self.config.CELL_SIZE
+        board_x = self.config.BOARD_X
+        board_y = self.config.BOARD_Y
+        self.cell_atlas.blit_cells(self.screen, [
+            (color or GRAY, (board_x + col * cell_size, board_y + row * cell_size))
+            for row, cells in enumerate(board.grid)
+            for col, color in enumerate(cells)
+        ])
     
-    def render_piece(self, piece: Piece, position: Tuple[int, int]):
-        """渲染方块"""
+    def render_piece(self, piece: Piece, position: Tuple[float, float]):
+        """渲染方块，位置可以是小数格（插值渲染）"""
         if not piece:
             return
         
         x, y = position
-        for row in range(len(piece.shape)):
-            for col in range(len(piece.shape[0])):
-                if piece.shape[row][col]:
-                    screen_x = self.config.BOARD_X + (x + col) * self.config.CELL_SIZE
-                    screen_y = self.config.BOARD_Y + (y + row) * self.config.CELL_SIZE
-                    pygame.draw.rect(self.screen, piece.color,
-                                   (screen_x, screen_y, self.config.CELL_SIZE, self.config.CELL_SIZE))
-                    pygame.draw.rect(self.screen, BLACK,
-                                   (screen_x, screen_y, self.config.CELL_SIZE, self.config.CELL_SIZE), 1)
+        cell_size = self.config.CELL_SIZE
+        screen_x = self.config.BOARD_X + round(x * cell_size)
+        screen_y = self.config.BOARD_Y + round(y * cell_size)
+        self.cell_atlas.blit_cells(self.screen, [
+            (piece.color, (screen_x + col * cell_size, screen_y + row * cell_size))
+            for col, row in piece.geometry.cells
+        ])
     
-    def render_ui(self, game_state: GameState):
-        """渲染用户界面"""
-        # 绘制分数
-        score_text = self.font.render(f"Score: {game_state.score}", True, WHITE)
-        self.screen.blit(score_text, (50, 50))
+    def get_ghost_cells(self, board: Board, game_state: GameState) -> List[Tuple[int, int]]:
+        """阴影预览占用的格子(列, 行)，只包含棋盘内的格子；未开启、没有当前方块或方块已着地时为空"""
+        piece = game_state.current_piece
+        if not piece or not self.config.SHOW_GHOST_PIECE:
+            return []
         
-        # 绘制等级
-        level_text = self.font.render(f"Level: {game_state.level}", True, WHITE)
-        self.screen.blit(level_text, (50, 100))
+        x, y = game_state.get_piece_position()
+        distance = board.drop_distance(piece, x, y)
+        if distance == 0:
+            return []
+        return [(x + col, y + distance + row) for col, row in piece.geometry.cells
+                if y + distance + row >= 0]
+    
+    def render_ghost(self, board: Board, game_state: GameState):
+        """在当前方块的落地位置绘制阴影预览"""
+        cells = self.get_ghost_cells(board, game_state)
+        if not cells:
+            return
         
-        # 绘制已消除行数
-        lines_text = self.font.render(f"Lines: {game_state.lines_cleared}", True, WHITE)
-        self.screen.blit(lines_text, (50, 150))
+        color = get_ghost_color(game_state.current_piece.color)
+        cell_size = self.config.CELL_SIZE
+        self.cell_atlas.blit_cells(self.screen, [
+            (color, (self.config.BOARD_X + col * cell_size, self.config.BOARD_Y + row * cell_size))
+            for col, row in cells
+        ])
+    
+    def render_frame(self, board: Board, game_state: GameState,
+                     piece_position: Optional[Tuple[float, float]] = None) -> Optional[List[pygame.Rect]]:
+        """渲染一帧，返回需要更新的区域；返回None表示整个屏幕都需要更新
+
+        piece_position为插值后的方块位置（可以是小数格），为None时使用方块的当前位置
+        """
+        self.screen.fill(BLACK)
+        self.render_board(board)
+        self.render_ghost(board, game_state)
+        if game_state.current_piece:
+            if piece_position is None:
+                piece_position = game_state.get_piece_position()
+            self.render_piece(game_state.current_piece, piece_position)
+        self.render_ui(game_state)
+        return None
+    
+    def render_ui(self, game_state: GameState):
+        """渲染用户界面"""
+        for name, text, color, position in self.get_ui_texts(game_state):
+            self.render_text(text, color, position)
+            if name == "next":
+                # 预览方块画在"Next:"文字下方
+                self.render_next_piece(game_state.next_piece)
+    
+    def render_text(self, text: str, color: Tuple[int, int, int], position: Tuple[int, int]) -> pygame.Rect:
+        """通过文字缓存绘制界面文字，返回绘制的区域"""
+        if self.digit_atlas:
+            return self.text_cache.blit_digits(self.screen, self.font, text, color, position)
+        return self.text_cache.blit(self.screen, self.font, text, color, position)
+    
+    def get_ui_texts(self, game_state: GameState) -> List[Tuple[str, str, Tuple[int, int, int], Tuple[int, int]]]:
+        """获取界面上的所有文字，每项为(名称, 文字, 颜色, 位置)，按绘制顺序排列"""
+        texts = [
+            ("score", f"Score: {game_state.score}", WHITE, (50, 50)),
+            ("level", f"Level: {game_state.level}", WHITE, (50, 100)),
+            ("lines", f"Lines: {game_state.lines_cleared}", WHITE, (50, 150)),
+        ]
         
-        # 绘制关卡信息（如果处于关卡模式）
+        # 关卡信息（如果处于关卡模式）
         if hasattr(game_state, 'game_mode') and game_state.game_mode == "level":
-            # 绘制关卡编号
-            level_id_text = self.font.render(f"Level: {game_state.current_level_id}", True, WHITE)
-            self.screen.blit(level_id_text, (50, 200))
+            texts.append(("level_id", f"Level: {game_state.current_level_id}", WHITE, (50, 200)))
             
-            # 绘制目标行数
             if hasattr(game_state, 'level_manager') and game_state.level_manager:
                 target_lines = game_state.level_manager.get_target_lines()
-                target_text = self.font.render(f"Target: {target_lines} lines", True, WHITE)
-                self.screen.blit(target_text, (50, 250))
+                texts.append(("target", f"Target: {target_lines} lines", WHITE, (50, 250)))
                 
-                # 绘制剩余时间
                 time_remaining = game_state.level_manager.get_time_remaining()
                 if time_remaining is not None:
-                    time_text = self.font.render(f"Time: {time_remaining}s", True, WHITE)
-                    self.screen.blit(time_text, (50, 300))
+                    texts.append(("time", f"Time: {time_remaining}s", WHITE, (50, 300)))
         
-        # 绘制下一个方块预览
+        # 下一个方块预览
         if game_state.next_piece:
-            next_text = self.font.render("Next:", True, WHITE)
-            self.screen.blit(next_text, (50, 350))
-            
-            # 绘制预览方块
-            preview_x = 50
-            preview_y = 400
-            for row in range(len(game_state.next_piece.shape)):
-                for col in range(len(game_state.next_piece.shape[0])):
-                    if game_state.next_piece.shape[row][col]:
-                        x = preview_x + col * 20
-                        y = preview_y + row * 20
-                        pygame.draw.rect(self.screen, game_state.next_piece.color,
-                                       (x, y, 20, 20))
-                        pygame.draw.rect(self.screen, BLACK, (x, y, 20, 20), 1)
+            texts.append(("next", "Next:", WHITE, (50, 350)))
         
-        # 绘制游戏状态
+        # 游戏状态
         if game_state.game_over:
-            game_over_text = self.font.render("GAME OVER!", True, RED)
-            self.screen.blit(game_over_text, (300, 300))
+            texts.append(("status", "GAME OVER!", RED, (300, 300)))
         elif game_state.paused:
-            pause_text = self.font.render("PAUSED", True, YELLOW)
-            self.screen.blit(pause_text, (300, 300))
+            texts.append(("status", "PAUSED", YELLOW, (300, 300)))
         elif hasattr(game_state, 'level_complete') and game_state.level_complete:
-            complete_text = self.font.render("LEVEL COMPLETE!", True, GREEN)
-            self.screen.blit(complete_text, (300, 300))
-            
-            # 绘制星级
+            texts.append(("status", "LEVEL COMPLETE!", GREEN, (300, 300)))
             if hasattr(game_state, 'level_stars'):
-                stars_text = self.font.render(f"Stars: {game_state.level_stars}/3", True, YELLOW)
-                self.screen.blit(stars_text, (300, 350))
+                texts.append(("stars", f"Stars: {game_state.level_stars}/3", YELLOW, (300, 350)))
         elif hasattr(game_state, 'level_failed') and game_state.level_failed:
-            failed_text = self.font.render("LEVEL FAILED!", True, RED)
-            self.screen.blit(failed_text, (300, 300))
+            texts.append(("status", "LEVEL FAILED!", RED, (300, 300)))
+        
+        return texts
+    
+    def render_next_piece(self, piece: Piece):
+        """渲染下一个方块预览"""
+        size = self.PREVIEW_CELL_SIZE
+        self.preview_atlas.blit_cells(self.screen, [
+            (piece.color, (self.PREVIEW_X + col * size, self.PREVIEW_Y + row * size))
+            for col, row in piece.geometry.cells
+        ])
+
+
+def create_renderer(screen: pygame.Surface, config: GameConfig) -> Renderer:
+    """根据配置创建渲染器"""
+    if config.RENDER_MODE == "full":
+        return Renderer(screen, config)
+    if config.RENDER_MODE == "layered":
+        from ui.layered_renderer import LayeredRenderer
+        return LayeredRenderer(screen, config)
+    if config.RENDER_MODE == "dirty":
+        from ui.dirty_renderer import DirtyRectRenderer
+        return DirtyRectRenderer(screen, config)
+    raise ValueError(f"未知的渲染模式: {config.RENDER_MODE}")
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+格子图集 - 每种颜色的格子（色块加黑色边框）预渲染一次，绘制时用Surface.blits批量贴图
+"""
+
+import pygame
+from typing import Dict, Iterable, Optional, Tuple
+from utils.constants import BLACK, GRAY, PIECE_COLORS
+
+
+Color = Tuple[int, int, int]
+
+
+class CellAtlas:
+    """格子图集 - 同一格子大小的所有颜色排成一行放在一张表面上
+
+    灰色格子就是空格子（灰底黑框），与Renderer.render_board的空格子画法一致。
+    未预生成的颜色在第一次使用时加入图集。
+    """
+
+    def __init__(self, cell_size: int, colors: Optional[Iterable[Color]] = None):
+        self.cell_size = cell_size
+        self.surface = pygame.Surface((0, cell_size))
+        self._areas: Dict[Color, pygame.Rect] = {}
+        if colors is None:
+            colors = list(PIECE_COLORS.values()) + [GRAY]
+        self._add_colors(colors)
+
+    def get_area(self, color: Color) -> pygame.Rect:
+        """获取颜色对应的格子在图集表面上的区域"""
+        area = self._areas.get(color)
+        if area is None:
+            self._add_colors([color])
+            area = self._areas[color]
+        return area
+
+    def blit_cell(self, target: pygame.Surface, color: Color, position: Tuple[int, int]) -> pygame.Rect:
+        """绘制一个格子，返回绘制的区域"""
+        return target.blit(self.surface, position, self.get_area(color))
+
+    def blit_cells(self, target: pygame.Surface, cells: Iterable[Tuple[Color, Tuple[int, int]]]):
+        """批量绘制格子，cells为(颜色, 位置)的序列"""
+        # 先取得所有区域：新颜色加入图集时会替换表面，贴图统一使用最新的表面
+        cells = [(self.get_area(color), position) for color, position in cells]
+        surface = self.surface
+        target.blits([(surface, position, area) for area, position in cells], doreturn=False)
+
+    def _add_colors(self, colors: Iterable[Color]):
+        """把新的颜色加入图集，图集表面向右扩展"""
+        colors = [color for color in dict.fromkeys(colors) if color not in self._areas]
+        if not colors:
+            return
+
+        size = self.cell_size
+        old_width = self.surface.get_width()
+        surface = pygame.Surface((old_width + len(colors) * size, size))
+        surface.blit(self.surface, (0, 0))
+        for index, color in enumerate(colors):
+            rect = pygame.Rect(old_width + index * size, 0, size, size)
+            pygame.draw.rect(surface, color, rect)
+            pygame.draw.rect(surface, BLACK, rect, 1)
+            self._areas[color] = rect
+        self.surface = surface
+
+
+_shared_atlases: Dict[int, CellAtlas] = {}
+
+
+def get_cell_atlas(cell_size: int) -> CellAtlas:
+    """获取进程内共享的格子图集，每种格子大小只生成一次"""
+    atlas = _shared_atlases.get(cell_size)
+    if atlas is None:
+        atlas = _shared_atlases[cell_size] = CellAtlas(cell_size)
+    return atlas
@@ -6,8 +6,10 @@
 """
 
 import pygame
+import json
 import os
 import sys
+import threading
 
 class FontManager:
     """字体管理器"""
@@ -31,80 +33,209 @@ class FontManager:
         "/usr/share/fonts/truetype/liberation/LiberationSans-Regular.ttf",
     ]
     
+    # 按顺序尝试的系统字体名称
+    CHINESE_FONT_NAMES = [
+        "PingFang SC", "PingFang TC", "PingFang HK",
+        "STHeiti", "STHeiti Light", "STHeiti Medium",
+        "Arial Unicode MS", "Arial", "Helvetica",
+        "Microsoft YaHei", "SimSun", "SimHei",
+        "DejaVu Sans", "Liberation Sans"
+    ]
+    
+    # 粗体字体文件
+    BOLD_FONTS = [
+        "/System/Library/Fonts/STHeiti Medium.ttc",
+        "/System/Library/Fonts/Helvetica.ttc",
+        "C:/Windows/Fonts/simhei.ttf",
+    ]
+    
+    # 字体索引文件：保存字体查找结果，下次启动直接使用；设置为None时不读写
+    INDEX_PATH = os.path.join(os.path.expanduser("~"), ".tetris_font_index.json")
+    INDEX_VERSION = 1
+    
+    # 进程内缓存：字体来源 {"regular": (类型, 值), "bold": (类型, 值)或None}，以及按(字号, 粗体)复用的字体对象
+    _sources = None
+    # 后台查找到的候选来源，由调用get_font的线程逐个尝试
+    _candidates = None
+    _fonts = {}
+    _lock = threading.Lock()
+    _discovery_thread = None
+    _quit_registered = False
+    
     @classmethod
     def get_chinese_font(cls, size: int) -> pygame.font.Font:
         """获取支持中文的字体"""
-        # 确保pygame已初始化
-        try:
-            pygame.init()
-        except:
-            pass
+        return cls.get_font(size)
+    
+    @classmethod
+    def get_font(cls, size: int, bold: bool = False) -> pygame.font.Font:
+        """获取字体，支持粗体选项；相同(字号, 粗体)返回同一个字体对象"""
+        key = (size, bold)
+        font = cls._fonts.get(key)
+        if font is not None:
+            return font
         
-        # 首先尝试系统默认字体
-        try:
+        pygame.font.init()
+        
+        # 后台查找尚未完成时先用默认字体，不阻塞第一帧
+        if cls._sources is None and cls._discovery_thread is not None:
             return pygame.font.Font(None, size)
-        except:
-            pass
         
-        # 尝试使用pygame的系统字体
-        try:
-            # 尝试常见的中文字体名称
-            chinese_font_names = [
-                "PingFang SC", "PingFang TC", "PingFang HK",
-                "STHeiti", "STHeiti Light", "STHeiti Medium",
-                "Arial Unicode MS", "Arial", "Helvetica",
-                "Microsoft YaHei", "SimSun", "SimHei",
-                "DejaVu Sans", "Liberation Sans"
-            ]
-            
-            for font_name in chinese_font_names:
-                try:
-                    return pygame.font.SysFont(font_name, size)
-                except:
-                    continue
-        except:
-            pass
+        # pygame.quit()之后字体对象失效，需要丢弃缓存
+        if not cls._quit_registered:
+            pygame.register_quit(cls._forget_fonts)
+            cls._quit_registered = True
         
-        # 尝试加载字体文件
-        for font_path in cls.CHINESE_FONTS:
-            if os.path.exists(font_path):
+        sources = cls._get_sources()
+        source = sources["bold"] if bold and sources["bold"] else sources["regular"]
+        font = cls._fonts[key] = cls._load_font(source, size)
+        return font
+    
+    @classmethod
+    def start_discovery(cls):
+        """在后台线程中读取索引或查找候选字体，查找完成前get_font返回默认字体"""
+        with cls._lock:
+            if cls._sources is not None or cls._candidates is not None or cls._discovery_thread is not None:
+                return
+            cls._discovery_thread = threading.Thread(target=cls._discover, daemon=True)
+            cls._discovery_thread.start()
+    
+    @classmethod
+    def wait_for_discovery(cls):
+        """等待后台查找完成"""
+        thread = cls._discovery_thread
+        if thread is not None:
+            thread.join()
+    
+    @classmethod
+    def clear_cache(cls):
+        """清空进程内的字体缓存（不删除索引文件）"""
+        cls.wait_for_discovery()
+        with cls._lock:
+            cls._sources = None
+            cls._candidates = None
+            cls._fonts = {}
+            cls._discovery_thread = None
+    
+    @classmethod
+    def _forget_fonts(cls):
+        """pygame.quit()时丢弃字体对象，字体来源仍然有效"""
+        cls._fonts = {}
+    
+    @classmethod
+    def _discover(cls):
+        """后台线程：读取索引，没有有效索引时查找候选字体
+
+        只访问文件系统，不创建字体对象：pygame的字体不是线程安全的，
+        字体对象都由调用get_font的线程创建。
+        """
+        try:
+            sources = cls._load_index()
+            candidates = cls._find_candidates() if sources is None else None
+            with cls._lock:
+                cls._sources = sources
+                cls._candidates = candidates
+        finally:
+            cls._discovery_thread = None
+    
+    @classmethod
+    def _get_sources(cls) -> dict:
+        """获取字体来源：依次使用进程内缓存、索引文件，最后逐个尝试候选字体并写入索引"""
+        with cls._lock:
+            if cls._sources is None:
+                if cls._candidates is None:
+                    cls._sources = cls._load_index()
+                if cls._sources is None:
+                    cls._sources = cls._choose_sources(cls._candidates or cls._find_candidates())
+                    cls._save_index(cls._sources)
+                cls._candidates = None
+            return cls._sources
+    
+    @classmethod
+    def _find_candidates(cls) -> dict:
+        """按原有顺序列出常规字体和粗体字体的候选来源，只检查字体文件是否存在"""
+        regular = [("default", None)]
+        regular += [("sysfont", name) for name in cls.CHINESE_FONT_NAMES]
+        regular += [("file", path) for path in cls.CHINESE_FONTS if os.path.exists(path)]
+        bold = [("file", path) for path in cls.BOLD_FONTS if os.path.exists(path)]
+        return {"regular": regular, "bold": bold}
+    
+    @classmethod
+    def _choose_sources(cls, candidates: dict) -> dict:
+        """返回第一个能加载的常规字体和粗体字体，都不能加载时常规字体回退到SysFont的默认字体"""
+        sources = {"regular": None, "bold": None}
+        for name in sources:
+            for source in candidates[name]:
                 try:
-                    return pygame.font.Font(font_path, size)
+                    cls._create_font(source, 12)
                 except Exception as e:
-                    print(f"无法加载字体 {font_path}: {e}")
+                    print(f"无法加载字体 {source[1]}: {e}")
                     continue
+                sources[name] = source
+                break
         
         # 最后的回退方案
+        if sources["regular"] is None:
+            sources["regular"] = ("sysfont", None)
+        return sources
+    
+    @staticmethod
+    def _create_font(source, size: int) -> pygame.font.Font:
+        """按字体来源创建字体对象"""
+        kind, value = source
+        if kind == "sysfont":
+            return pygame.font.SysFont(value, size)
+        if kind == "file":
+            return pygame.font.Font(value, size)
+        return pygame.font.Font(None, size)
+    
+    @classmethod
+    def _load_font(cls, source, size: int) -> pygame.font.Font:
+        """按字体来源创建字体对象，失败时使用默认字体"""
         try:
-            return pygame.font.SysFont(None, size)
-        except:
+            return cls._create_font(source, size)
+        except Exception:
             return pygame.font.Font(None, size)
     
     @classmethod
-    def get_font(cls, size: int, bold: bool = False) -> pygame.font.Font:
-        """获取字体，支持粗体选项"""
-        font = cls.get_chinese_font(size)
+    def _load_index(cls):
+        """读取字体索引，索引不存在、版本或平台不符、字体文件已不存在时返回None"""
+        if not cls.INDEX_PATH or not os.path.exists(cls.INDEX_PATH):
+            return None
         
-        # 如果需要粗体，尝试设置粗体
-        if bold:
-            try:
-                # 尝试使用粗体字体
-                bold_fonts = [
-                    "/System/Library/Fonts/STHeiti Medium.ttc",
-                    "/System/Library/Fonts/Helvetica.ttc",
-                    "C:/Windows/Fonts/simhei.ttf",
-                ]
-                
-                for font_path in bold_fonts:
-                    if os.path.exists(font_path):
-                        try:
-                            return pygame.font.Font(font_path, size)
-                        except:
-                            continue
-            except:
-                pass
+        try:
+            with open(cls.INDEX_PATH, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get("version") != cls.INDEX_VERSION or data.get("platform") != sys.platform:
+                return None
+            
+            sources = {}
+            for name in ("regular", "bold"):
+                source = tuple(data[name]) if data[name] else None
+                if source and source[0] == "file" and not os.path.exists(source[1]):
+                    return None
+                sources[name] = source
+            return sources if sources["regular"] else None
+        except (OSError, ValueError, KeyError, TypeError, IndexError):
+            return None
+    
+    @classmethod
+    def _save_index(cls, sources: dict):
+        """写入字体索引，写入失败时忽略（下次启动重新查找）"""
+        if not cls.INDEX_PATH:
+            return
         
-        return font
+        data = {
+            "version": cls.INDEX_VERSION,
+            "platform": sys.platform,
+            "regular": list(sources["regular"]),
+            "bold": list(sources["bold"]) if sources["bold"] else None,
+        }
+        try:
+            with open(cls.INDEX_PATH, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False, indent=2)
+        except OSError:
+            pass
     
     @classmethod
     def test_font_rendering(cls):
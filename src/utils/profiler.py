@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+帧时间分析器 - 记录游戏循环每帧各阶段的耗时，提供屏幕叠加显示和CSV/JSON导出
+"""
+
+import csv
+import json
+import time
+import pygame
+from typing import Dict, List, Optional, Tuple
+from utils.text_cache import TextCache
+from utils.constants import BLACK, GRAY, YELLOW
+
+
+class FrameProfiler:
+    """帧时间分析器 - 每帧各阶段耗时保存在固定容量的环形缓冲中
+
+    用法：每帧开始时调用begin_frame()，每个阶段结束时调用mark(阶段名)，
+    记录从上一次标记到现在的耗时。帧时间为相邻两次begin_frame的间隔，
+    包含等待帧率限制的空闲时间。未启用时begin_frame和mark直接返回。
+    """
+
+    SECTIONS = ("input", "update", "render", "flip")
+    OVERLAY_CACHE_ENTRIES = 8
+
+    def __init__(self, capacity: int = 600, enabled: bool = False):
+        self.capacity = capacity
+        self.enabled = enabled
+        self.overlay_visible = False
+        # 上一次叠加显示的区域，显示期间区域只增大不缩小，避免残留旧的文字
+        self._overlay_rect = None
+        # 叠加显示的文字每帧变化，使用单独的小缓存，不挤掉界面文字在共享缓存中的项
+        self._text_cache = TextCache(self.OVERLAY_CACHE_ENTRIES)
+        self._section_index = {name: index for index, name in enumerate(self.SECTIONS)}
+        self.clear()
+
+    def clear(self):
+        """清空已记录的帧"""
+        # 每帧一条记录：(帧时间, 各阶段耗时...)，单位为秒
+        self._frames: List[Optional[Tuple[float, ...]]] = [None] * self.capacity
+        self._index = 0
+        self.count = 0
+        self.total_frames = 0
+        self._frame_start = None
+        self._last_mark = 0.0
+        self._current = [0.0] * len(self.SECTIONS)
+
+    def set_enabled(self, enabled: bool):
+        """启用或停用记录，停用时丢弃未完成的帧"""
+        self.enabled = enabled
+        self._frame_start = None
+
+    def toggle_overlay(self, keep_recording: bool = False):
+        """切换叠加显示：显示时开始记录，隐藏时除非keep_recording否则停止记录"""
+        self.overlay_visible = not self.overlay_visible
+        self._overlay_rect = None
+        if self.overlay_visible:
+            if not self.enabled:
+                self.set_enabled(True)
+        elif not keep_recording:
+            self.set_enabled(False)
+
+    def begin_frame(self):
+        """开始新的一帧，保存上一帧的记录"""
+        if not self.enabled:
+            return
+
+        now = time.perf_counter()
+        if self._frame_start is not None:
+            self._frames[self._index] = (now - self._frame_start,) + tuple(self._current)
+            self._index = (self._index + 1) % self.capacity
+            self.count = min(self.count + 1, self.capacity)
+            self.total_frames += 1
+        self._frame_start = now
+        self._last_mark = now
+        self._current = [0.0] * len(self.SECTIONS)
+
+    def mark(self, section: str):
+        """记录从上一次标记到现在的耗时，计入指定阶段"""
+        if not self.enabled or self._frame_start is None:
+            return
+
+        now = time.perf_counter()
+        self._current[self._section_index[section]] += now - self._last_mark
+        self._last_mark = now
+
+    def get_frames(self) -> List[Tuple[float, ...]]:
+        """按时间顺序获取缓冲中的帧记录"""
+        if self.count < self.capacity:
+            return self._frames[:self.count]
+        return self._frames[self._index:] + self._frames[:self._index]
+
+    def get_stats(self) -> Dict[str, object]:
+        """统计缓冲中的帧：FPS、帧时间p50/p99（毫秒）、各阶段平均耗时（毫秒）和最慢的阶段"""
+        frames = self.get_frames()
+        if not frames:
+            return {"frames": 0, "fps": 0.0, "p50_ms": 0.0, "p99_ms": 0.0,
+                    "sections_ms": {name: 0.0 for name in self.SECTIONS}, "slowest": None}
+
+        frame_times = sorted(frame[0] for frame in frames)
+        total_time = sum(frame_times)
+        sections_ms = {
+            name: sum(frame[index + 1] for frame in frames) * 1000.0 / len(frames)
+            for index, name in enumerate(self.SECTIONS)
+        }
+        return {
+            "frames": len(frames),
+            "fps": len(frames) / total_time if total_time > 0 else 0.0,
+            "p50_ms": self._percentile(frame_times, 50) * 1000.0,
+            "p99_ms": self._percentile(frame_times, 99) * 1000.0,
+            "sections_ms": sections_ms,
+            "slowest": max(sections_ms, key=sections_ms.get),
+        }
+
+    def get_overlay_lines(self) -> List[str]:
+        """叠加显示的文字"""
+        stats = self.get_stats()
+        lines = [
+            f"FPS: {stats['fps']:.1f}",
+            f"p50: {stats['p50_ms']:.1f}ms  p99: {stats['p99_ms']:.1f}ms",
+        ]
+        if stats["slowest"] is not None:
+            slowest = stats["slowest"]
+            lines.append(f"Slowest: {slowest} {stats['sections_ms'][slowest]:.2f}ms")
+        return lines
+
+    def render_overlay(self, screen: pygame.Surface, font: pygame.font.Font,
+                       position: Optional[Tuple[int, int]] = None) -> Optional[pygame.Rect]:
+        """在屏幕上绘制叠加显示（默认在右上角），返回绘制的区域；未显示时返回None"""
+        if not self.overlay_visible:
+            return None
+
+        surfaces = [self._text_cache.render(font, line, YELLOW) for line in self.get_overlay_lines()]
+        width = max(surface.get_width() for surface in surfaces) + 12
+        height = sum(surface.get_height() for surface in surfaces) + 12
+        if position is None:
+            position = (screen.get_width() - width - 10, 10)
+
+        rect = pygame.Rect(position, (width, height))
+        if self._overlay_rect is not None:
+            rect.union_ip(self._overlay_rect)
+        self._overlay_rect = rect
+        screen.fill(BLACK, rect)
+        pygame.draw.rect(screen, GRAY, rect, 1)
+        y = rect.y + 6
+        for surface in surfaces:
+            screen.blit(surface, (rect.x + 6, y))
+            y += surface.get_height()
+        return rect
+
+    def dump(self, path: str):
+        """按文件扩展名导出为CSV（.csv）或JSON（其他）"""
+        if path.lower().endswith(".csv"):
+            self.dump_csv(path)
+        else:
+            self.dump_json(path)
+
+    def dump_csv(self, path: str):
+        """导出每帧记录为CSV，单位为毫秒"""
+        with open(path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(("frame", "frame_ms") + tuple(f"{name}_ms" for name in self.SECTIONS))
+            for index, frame in enumerate(self.get_frames()):
+                writer.writerow([index] + [round(value * 1000.0, 4) for value in frame])
+
+    def dump_json(self, path: str):
+        """导出统计和每帧记录为JSON，单位为毫秒"""
+        data = {
+            "sections": list(self.SECTIONS),
+            "stats": self.get_stats(),
+            "frames": [[round(value * 1000.0, 4) for value in frame] for frame in self.get_frames()],
+        }
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2)
+
+    @staticmethod
+    def _percentile(sorted_values: List[float], percent: float) -> float:
+        """最近秩法计算百分位数"""
+        rank = max(1, -(-len(sorted_values) * percent // 100))
+        return sorted_values[int(rank) - 1]
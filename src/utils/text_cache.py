@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+文字渲染缓存 - 缓存font.render的结果，避免每帧重复光栅化相同的文字
+"""
+
+import pygame
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+
+Color = Tuple[int, int, int]
+
+DIGITS = "0123456789"
+
+
+class TextCache:
+    """文字渲染缓存 - 按(字体, 字号, 文字, 颜色)缓存渲染结果，超过容量时淘汰最久未使用的项
+
+    键中的字体对象已经确定了字号，同一字号的字体应复用同一个字体对象，否则无法命中缓存。
+
+    数字字形模式（blit_digits）把文字拆成数字和非数字片段：非数字片段整体缓存，
+    数字由每种(字体, 颜色)预渲染一次的0~9字形拼接，分数等计数器变化时不需要光栅化新文字。
+    """
+
+    def __init__(self, max_entries: int = 512):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._surfaces: "OrderedDict[tuple, pygame.Surface]" = OrderedDict()
+        self._digit_glyphs: Dict[tuple, Tuple[pygame.Surface, ...]] = {}
+
+    def render(self, font: pygame.font.Font, text: str, color: Color) -> pygame.Surface:
+        """获取渲染好的文字表面（抗锯齿），返回的表面是共享的，不要修改"""
+        key = (font, font.get_height(), text, color)
+        surface = self._surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            self._surfaces.move_to_end(key)
+            return surface
+
+        self.misses += 1
+        surface = self._surfaces[key] = font.render(text, True, color)
+        if len(self._surfaces) > self.max_entries:
+            self._surfaces.popitem(last=False)
+        return surface
+
+    def blit(self, target: pygame.Surface, font: pygame.font.Font, text: str,
+             color: Color, position: Tuple[int, int]) -> pygame.Rect:
+        """把文字绘制到目标表面，返回绘制的区域"""
+        return target.blit(self.render(font, text, color), position)
+
+    def blit_digits(self, target: pygame.Surface, font: pygame.font.Font, text: str,
+                    color: Color, position: Tuple[int, int]) -> pygame.Rect:
+        """用数字字形拼接绘制文字，返回绘制的区域"""
+        x, y = position
+        rect = pygame.Rect(x, y, 0, font.get_height())
+        for part, is_digits in self._split_digits(text):
+            if is_digits:
+                glyphs = self.get_digit_glyphs(font, color)
+                for char in part:
+                    glyph = glyphs[ord(char) - 48]
+                    rect.union_ip(target.blit(glyph, (x, y)))
+                    x += glyph.get_width()
+            else:
+                surface = self.render(font, part, color)
+                rect.union_ip(target.blit(surface, (x, y)))
+                x += surface.get_width()
+        return rect
+
+    def measure(self, font: pygame.font.Font, text: str, color: Color,
+                digits: bool = False) -> Tuple[int, int]:
+        """获取文字绘制后的尺寸，digits为True时按blit_digits的拼接方式计算"""
+        if not digits:
+            return self.render(font, text, color).get_size()
+
+        width = 0
+        height = font.get_height()
+        for part, is_digits in self._split_digits(text):
+            if is_digits:
+                glyphs = self.get_digit_glyphs(font, color)
+                surfaces = [glyphs[ord(char) - 48] for char in part]
+            else:
+                surfaces = [self.render(font, part, color)]
+            for surface in surfaces:
+                width += surface.get_width()
+                height = max(height, surface.get_height())
+        return width, height
+
+    def get_digit_glyphs(self, font: pygame.font.Font, color: Color) -> Tuple[pygame.Surface, ...]:
+        """获取0~9的字形表面，每种(字体, 颜色)只渲染一次"""
+        key = (font, color)
+        glyphs = self._digit_glyphs.get(key)
+        if glyphs is None:
+            glyphs = self._digit_glyphs[key] = tuple(font.render(char, True, color) for char in DIGITS)
+        return glyphs
+
+    def clear(self):
+        """清空缓存和计数"""
+        self._surfaces.clear()
+        self._digit_glyphs.clear()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _split_digits(text: str):
+        """把文字拆分为(片段, 是否为数字)的序列"""
+        start = 0
+        for index in range(1, len(text) + 1):
+            if index == len(text) or (text[index] in DIGITS) != (text[start] in DIGITS):
+                yield text[start:index], text[start] in DIGITS
+                start = index
+
+
+_shared_cache: Optional[TextCache] = None
+
+
+def get_text_cache() -> TextCache:
+    """获取进程内共享的文字渲染缓存"""
+    global _shared_cache
+    if _shared_cache is None:
+        _shared_cache = TextCache()
+    return _shared_cache
@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+核心引擎基准测试 - 游戏板碰撞检测、放置、消行，旋转和墙踢，以及无界面整局吞吐量
+
+用法：
+    python test/bench_core.py                 # 运行并与基线比较
+    python test/bench_core.py --save          # 运行并保存为基线
+    python test/bench_core.py --filter board  # 只运行名称包含board的用例
+"""
+
+import random
+import sys
+import os
+
+# 添加src目录到Python路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from typing import List, Tuple
+from benchmark import BenchmarkCase, main
+from core.board import Board
+from core.bit_board import BitBoard
+from core.collision import CollisionDetector
+from core.headless import HeadlessGame
+from core.piece import Piece
+from core.piece_geometry import ROTATION_COUNTS
+from utils.constants import PIECE_SHAPES
+
+PIECE_TYPES = list(PIECE_SHAPES.keys())
+BACKENDS = {"grid": Board, "bitboard": BitBoard}
+
+# 堆叠形状：名称 -> 目标最高列高度
+STACK_PROFILES = {"low": 4, "mid": 10, "high": 16}
+
+# 每批操作使用的游戏板数量（需要全新游戏板的用例）
+BOARDS_PER_BATCH = 50
+
+
+def drop_y(board: Board, piece: Piece, x: int) -> int:
+    """方块从顶部落下后的y坐标，无法放入时返回None"""
+    if not board.is_valid_position(piece, x, 0):
+        return None
+    y = 0
+    while board.is_valid_position(piece, x, y + 1):
+        y += 1
+    return y
+
+
+def generate_stack(height: int, seed: int = 0, width: int = 10, rows: int = 20) -> List[Tuple[str, int, int, int]]:
+    """随机落下方块直到最高列达到height，返回放置序列(类型, 旋转, x, y)
+
+    方块的旋转和列随机选择，会产生空洞和参差不齐的表面，接近真实对局的堆叠。
+    """
+    rng = random.Random(seed)
+    board = Board(width, rows)
+    placements = []
+    while max_column_height(board) < height:
+        piece = Piece(rng.choice(PIECE_TYPES))
+        piece.set_rotation(rng.randrange(ROTATION_COUNTS[piece.type]))
+        x = rng.randrange(-1, width)
+        y = drop_y(board, piece, x)
+        if y is None:
+            continue
+        board.place_piece(piece, x, y)
+        board.clear_lines()
+        placements.append((piece.type, piece.rotation, x, y))
+    return placements
+
+
+def build_board(backend: str, placements: List[Tuple[str, int, int, int]]) -> Board:
+    """按放置序列重建游戏板"""
+    board = BACKENDS[backend](10, 20)
+    for piece_type, rotation, x, y in placements:
+        piece = Piece(piece_type)
+        piece.set_rotation(rotation)
+        board.place_piece(piece, x, y)
+        board.clear_lines()
+    return board
+
+
+def clone_board(template: Board) -> Board:
+    """复制游戏板（网格、每行计数、列高度和位掩码），比按放置序列重建快得多"""
+    return template.copy()
+
+
+def max_column_height(board: Board) -> int:
+    """最高列的高度"""
+    return board.max_height
+
+
+def all_pieces() -> List[Piece]:
+    """每种方块的每个旋转状态各一个"""
+    pieces = []
+    for piece_type in PIECE_TYPES:
+        for rotation in range(ROTATION_COUNTS[piece_type]):
+            piece = Piece(piece_type)
+            piece.set_rotation(rotation)
+            pieces.append(piece)
+    return pieces
+
+
+def resting_moves(board: Board) -> List[Tuple[Piece, int, int]]:
+    """当前游戏板上所有从顶部落下可到达的放置位置"""
+    moves = []
+    for piece in all_pieces():
+        for x in range(-2, board.width):
+            y = drop_y(board, piece, x)
+            if y is not None:
+                moves.append((piece, x, y))
+    return moves
+
+
+def valid_position_case(backend: str, profile: str) -> BenchmarkCase:
+    """is_valid_position：所有方块、旋转和位置的组合"""
+    board = build_board(backend, generate_stack(STACK_PROFILES[profile]))
+    probes = [(piece, x, y) for piece in all_pieces()
+              for x in range(-2, board.width) for y in range(-2, board.height)]
+    is_valid_position = board.is_valid_position
+
+    def run(_):
+        for piece, x, y in probes:
+            is_valid_position(piece, x, y)
+
+    return BenchmarkCase(f"board.is_valid_position[{backend}/{profile}]", run, ops=len(probes))
+
+
+def place_piece_case(backend: str, profile: str) -> BenchmarkCase:
+    """place_piece：每个全新游戏板上放置一个落到底的方块"""
+    placements = generate_stack(STACK_PROFILES[profile])
+    template = build_board(backend, placements)
+    moves = resting_moves(template)
+    rng = random.Random(1)
+
+    def setup():
+        return [(clone_board(template), rng.choice(moves)) for _ in range(BOARDS_PER_BATCH)]
+
+    def run(batch):
+        for board, (piece, x, y) in batch:
+            board.place_piece(piece, x, y)
+
+    return BenchmarkCase(f"board.place_piece[{backend}/{profile}]", run, setup, ops=BOARDS_PER_BATCH)
+
+
+def clear_lines_case(backend: str, profile: str, lines: int) -> BenchmarkCase:
+    """clear_lines：游戏板底部有lines个完整行"""
+    template = build_board(backend, generate_stack(STACK_PROFILES[profile]))
+    # 直接补满底部几行的格子
+    for row in range(template.height - lines, template.height):
+        template.grid[row] = [cell or (255, 0, 0) for cell in template.grid[row]]
+    template.refresh()
+
+    def setup():
+        return [clone_board(template) for _ in range(BOARDS_PER_BATCH)]
+
+    def run(batch):
+        for board in batch:
+            board.clear_lines()
+
+    return BenchmarkCase(f"board.clear_lines[{backend}/{profile}/{lines}]", run, setup, ops=BOARDS_PER_BATCH)
+
+
+def drop_distance_case(backend: str, profile: str) -> BenchmarkCase:
+    """drop_distance：每个方块、旋转和列从顶部直接下落（硬降和阴影预览）"""
+    board = build_board(backend, generate_stack(STACK_PROFILES[profile]))
+    probes = [(piece, x) for piece in all_pieces() for x in range(-2, board.width)
+              if board.is_valid_position(piece, x, 0)]
+    drop_distance = board.drop_distance
+
+    def run(_):
+        for piece, x in probes:
+            drop_distance(piece, x, 0)
+
+    return BenchmarkCase(f"board.drop_distance[{backend}/{profile}]", run, ops=len(probes))
+
+
+def copy_case(backend: str, profile: str) -> BenchmarkCase:
+    """Board.copy：复制游戏板"""
+    board = build_board(backend, generate_stack(STACK_PROFILES[profile]))
+
+    def run(_):
+        for _ in range(BOARDS_PER_BATCH):
+            board.copy()
+
+    return BenchmarkCase(f"board.copy[{backend}/{profile}]", run, ops=BOARDS_PER_BATCH)
+
+
+def apply_undo_case(backend: str, profile: str) -> BenchmarkCase:
+    """apply_move + undo_move：在同一个游戏板上尝试所有落到底的落点（搜索）"""
+    board = build_board(backend, generate_stack(STACK_PROFILES[profile]))
+    moves = [(piece.geometry, x, y) for piece, x, y in resting_moves(board)]
+    apply_move = board.apply_move
+    undo_move = board.undo_move
+
+    def run(_):
+        for geometry, x, y in moves:
+            apply_move(geometry, x, y)
+            undo_move()
+
+    return BenchmarkCase(f"board.apply_undo[{backend}/{profile}]", run, ops=len(moves))
+
+
+def can_rotate_case(backend: str) -> BenchmarkCase:
+    """can_rotate：只有墙踢才能旋转的位置（贴墙或贴着堆叠）"""
+    board = build_board(backend, generate_stack(STACK_PROFILES["mid"]))
+    detector = CollisionDetector()
+    probes = []
+    for piece in all_pieces():
+        for x in range(-2, board.width):
+            for y in range(-2, board.height):
+                if not board.is_valid_position(piece, x, y):
+                    continue
+                rotated = Piece(piece.type)
+                rotated.set_rotation((piece.rotation + 1) % ROTATION_COUNTS[piece.type])
+                if not board.is_valid_position(rotated, x, y):
+                    probes.append((piece, piece.rotation, x, y))
+
+    def run(_):
+        for piece, rotation, x, y in probes:
+            piece.set_rotation(rotation)
+            detector.can_rotate(piece, board, x, y)
+
+    return BenchmarkCase(f"collision.can_rotate_kick[{backend}]", run, ops=len(probes))
+
+
+def rotate_case() -> BenchmarkCase:
+    """Piece.rotate：七种方块轮流旋转"""
+    pieces = [Piece(piece_type) for piece_type in PIECE_TYPES] * 100
+
+    def run(_):
+        for piece in pieces:
+            piece.rotate()
+
+    return BenchmarkCase("piece.rotate", run, ops=len(pieces))
+
+
+def headless_case(backend: str) -> BenchmarkCase:
+    """无界面整局吞吐量：随机操作的对局，按tick计数"""
+    from config.game_config import GameConfig
+
+    config = GameConfig()
+    config.BOARD_BACKEND = backend
+    game = HeadlessGame(config, tick_ms=50)
+    actions = HeadlessGame.ACTIONS
+    seeds = iter(range(1000000))
+
+    def setup():
+        game.reset(seed=next(seeds))
+        return random.Random(game.engine.seed)
+
+    def run(rng):
+        return game.run(lambda state: rng.choice(actions), max_ticks=2000)
+
+    return BenchmarkCase(f"headless.ticks[{backend}]", run, setup)
+
+
+def get_cases() -> List[BenchmarkCase]:
+    """所有核心引擎用例"""
+    cases = []
+    for backend in BACKENDS:
+        for profile in STACK_PROFILES:
+            cases.append(valid_position_case(backend, profile))
+        for profile in STACK_PROFILES:
+            cases.append(place_piece_case(backend, profile))
+        for lines in (1, 4):
+            cases.append(clear_lines_case(backend, "mid", lines))
+        for profile in STACK_PROFILES:
+            cases.append(drop_distance_case(backend, profile))
+        for profile in STACK_PROFILES:
+            cases.append(copy_case(backend, profile))
+            cases.append(apply_undo_case(backend, profile))
+        cases.append(can_rotate_case(backend))
+    cases.append(rotate_case())
+    for backend in BACKENDS:
+        cases.append(headless_case(backend))
+    return cases
+
+
+if __name__ == '__main__':
+    sys.exit(main("core", get_cases()))
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+渲染基准测试 - 使用SDL dummy视频驱动，不需要显示器
+
+用合成的游戏板和游戏状态（空、半满、全满、所有颜色）测量render_board、render_piece、
+render_ui的耗时，以及三种渲染模式下整帧的帧率，并在多种CELL_SIZE和游戏板尺寸下输出对比表。
+
+用法：
+    python test/bench_render.py                  # 运行并与基线比较
+    python test/bench_render.py --save           # 运行并保存为基线
+    python test/bench_render.py --filter cell30  # 只运行名称包含cell30的用例
+"""
+
+import random
+import sys
+import os
+
+# 使用无窗口的视频驱动
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+# 添加src目录到Python路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import pygame
+from typing import Dict, List, Tuple
+from benchmark import BenchmarkCase, BenchmarkResult, main
+from config.game_config import GameConfig
+from core.board import Board
+from core.game_state import GameState
+from core.piece import Piece
+from ui.renderer import Renderer, create_renderer
+from utils.constants import PIECE_COLORS
+from utils.font_utils import FontManager
+
+# 基准测试不读写用户目录下的字体索引文件
+FontManager.INDEX_PATH = None
+
+# 游戏板内容
+FIXTURES = ("empty", "half", "full", "colors")
+
+# 游戏板尺寸(宽, 高)和格子大小
+BOARD_SIZES = ((10, 20), (20, 40))
+CELL_SIZES = (20, 30, 40)
+
+# 默认尺寸下测量所有内容，其他尺寸只测量半满的游戏板
+DEFAULT_GEOMETRY = ((10, 20), 30)
+
+RENDER_MODES = ("full", "layered", "dirty")
+
+# 每批渲染的帧数（或函数调用次数）
+CALLS_PER_BATCH = 20
+
+COLORS = list(PIECE_COLORS.values())
+
+
+def make_config(board_size: Tuple[int, int], cell_size: int, render_mode: str = "full") -> GameConfig:
+    """按游戏板尺寸和格子大小生成配置，屏幕大小足以容纳游戏板和左侧界面文字"""
+    config = GameConfig()
+    config.BOARD_WIDTH, config.BOARD_HEIGHT = board_size
+    config.CELL_SIZE = cell_size
+    config.RENDER_MODE = render_mode
+    config.SCREEN_WIDTH = max(GameConfig.SCREEN_WIDTH, config.BOARD_X + board_size[0] * cell_size + 50)
+    config.SCREEN_HEIGHT = max(GameConfig.SCREEN_HEIGHT, config.BOARD_Y + board_size[1] * cell_size + 50)
+    return config
+
+
+def make_board(fixture: str, width: int, height: int) -> Board:
+    """生成合成游戏板"""
+    board = Board(width, height)
+    rng = random.Random(3)
+    for row in range(height):
+        for col in range(width):
+            if fixture == "full":
+                board.grid[row][col] = COLORS[0]
+            elif fixture == "colors":
+                board.grid[row][col] = COLORS[(row + col) % len(COLORS)]
+            elif fixture == "half" and row >= height // 2 and rng.random() < 0.8:
+                board.grid[row][col] = rng.choice(COLORS)
+    return board
+
+
+def make_game_state(board: Board) -> GameState:
+    """生成合成游戏状态：当前方块在游戏板上方，带分数和预览方块"""
+    state = GameState()
+    state.score = 123450
+    state.level = 7
+    state.lines_cleared = 64
+    state.current_piece = Piece('T')
+    state.next_piece = Piece('L')
+    state.set_piece_position(board.width // 2 - 1, 0)
+    return state
+
+
+def make_screen(config: GameConfig) -> pygame.Surface:
+    """创建与显示表面像素格式一致的屏幕表面"""
+    if pygame.display.get_surface() is None:
+        pygame.display.set_mode((1, 1))
+    return pygame.Surface((config.SCREEN_WIDTH, config.SCREEN_HEIGHT)).convert()
+
+
+def case_name(function: str, board_size: Tuple[int, int], cell_size: int, fixture: str) -> str:
+    """用例名称，例如render.board[10x20/cell30/half]"""
+    return f"render.{function}[{board_size[0]}x{board_size[1]}/cell{cell_size}/{fixture}]"
+
+
+def function_cases(board_size: Tuple[int, int], cell_size: int, fixture: str) -> List[BenchmarkCase]:
+    """render_board、render_piece和render_ui单独计时"""
+    config = make_config(board_size, cell_size)
+    renderer = Renderer(make_screen(config), config)
+    board = make_board(fixture, *board_size)
+    state = make_game_state(board)
+    piece = state.current_piece
+    position = state.get_piece_position()
+
+    def run_board(_):
+        for _ in range(CALLS_PER_BATCH):
+            renderer.render_board(board)
+
+    def run_piece(_):
+        for _ in range(CALLS_PER_BATCH):
+            renderer.render_piece(piece, position)
+
+    def run_ui(_):
+        for _ in range(CALLS_PER_BATCH):
+            renderer.render_ui(state)
+
+    return [
+        BenchmarkCase(case_name("board", board_size, cell_size, fixture), run_board, ops=CALLS_PER_BATCH),
+        BenchmarkCase(case_name("piece", board_size, cell_size, fixture), run_piece, ops=CALLS_PER_BATCH),
+        BenchmarkCase(case_name("ui", board_size, cell_size, fixture), run_ui, ops=CALLS_PER_BATCH),
+    ]
+
+
+def frame_case(board_size: Tuple[int, int], cell_size: int, fixture: str, mode: str) -> BenchmarkCase:
+    """整帧渲染：当前方块每帧左右移动一格，分数每帧变化，模拟实际游戏中的帧间变化"""
+    config = make_config(board_size, cell_size, mode)
+    renderer = create_renderer(make_screen(config), config)
+    board = make_board(fixture, *board_size)
+    state = make_game_state(board)
+    x, y = state.get_piece_position()
+
+    def run(_):
+        for frame in range(CALLS_PER_BATCH):
+            state.set_piece_position(x + frame % 2, y)
+            state.score += 10
+            renderer.render_frame(board, state)
+
+    return BenchmarkCase(case_name(f"frame.{mode}", board_size, cell_size, fixture), run, ops=CALLS_PER_BATCH)
+
+
+def get_cases() -> List[BenchmarkCase]:
+    """所有渲染用例"""
+    pygame.init()
+    cases = []
+    default_size, default_cell = DEFAULT_GEOMETRY
+    for fixture in FIXTURES:
+        cases.extend(function_cases(default_size, default_cell, fixture))
+        for mode in RENDER_MODES:
+            cases.append(frame_case(default_size, default_cell, fixture, mode))
+
+    for board_size in BOARD_SIZES:
+        for cell_size in CELL_SIZES:
+            if (board_size, cell_size) == DEFAULT_GEOMETRY:
+                continue
+            cases.extend(function_cases(board_size, cell_size, "half"))
+            for mode in RENDER_MODES:
+                cases.append(frame_case(board_size, cell_size, "half", mode))
+    return cases
+
+
+def print_table(results: List[BenchmarkResult]):
+    """输出对比表：每行一种尺寸和游戏板内容，各函数为每次调用的微秒数，整帧同时给出帧率"""
+    columns = ["board", "piece", "ui"] + [f"frame.{mode}" for mode in RENDER_MODES]
+    rows: Dict[str, Dict[str, float]] = {}
+    for result in results:
+        function, _, key = result.name[len("render."):].partition("[")
+        rows.setdefault(key.rstrip("]"), {})[function] = result.ops_per_sec
+
+    header = f"{'geometry/fixture':<24}" + "".join(f"{column:>16}" for column in columns)
+    print("\n单位：微秒/次（括号内为帧率）")
+    print(header)
+    print("-" * len(header))
+    for key, values in rows.items():
+        cells = []
+        for column in columns:
+            rate = values.get(column)
+            if rate is None:
+                cells.append(f"{'-':>16}")
+            elif column.startswith("frame."):
+                cells.append(f"{1e6 / rate:>8.1f} ({rate:>5.0f})")
+            else:
+                cells.append(f"{1e6 / rate:>16.1f}")
+        print(f"{key:<24}" + "".join(cells))
+
+
+if __name__ == '__main__':
+    sys.exit(main("render", get_cases(), report=print_table))
@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+性能基准测试框架 - 测量每秒操作数和内存分配，保存JSON基线并标记性能退化
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+
+# 基线文件默认存放目录
+BASELINE_DIR = os.path.join(os.path.dirname(__file__), "benchmark_baselines")
+
+
+class BenchmarkCase(NamedTuple):
+    """基准测试用例
+
+    setup()准备一批操作所需的状态（不计时），func(state)执行这批操作，
+    返回实际执行的操作数；返回None时按ops计。
+    """
+    name: str
+    func: Callable
+    setup: Optional[Callable] = None
+    ops: int = 1
+
+
+class BenchmarkResult(NamedTuple):
+    """基准测试结果"""
+    name: str
+    ops_per_sec: float
+    # 每个操作净增加的内存块数（sys.getallocatedblocks，关闭GC测量）
+    blocks_per_op: float
+    # 一批操作期间额外占用内存的峰值（tracemalloc）
+    peak_kib: float
+    # 计时阶段执行的操作总数
+    ops: int
+
+
+class Comparison(NamedTuple):
+    """与基线的比较结果"""
+    name: str
+    ratio: float      # 当前ops/sec与基线之比
+    status: str       # "ok"、"faster"、"slower"（性能退化）、"alloc"（分配增多）或"new"（基线中没有）
+
+
+def run_case(case: BenchmarkCase, min_time: float = 0.2, repeat: int = 3) -> BenchmarkResult:
+    """运行一个用例：重复执行批次直到累计时间达到min_time，取repeat轮中最快的一轮"""
+    best = None
+    total_ops = 0
+    for _ in range(repeat):
+        elapsed = 0.0
+        ops = 0
+        while elapsed < min_time:
+            state = case.setup() if case.setup is not None else None
+            start = time.perf_counter()
+            done = case.func(state)
+            elapsed += time.perf_counter() - start
+            ops += done if done is not None else case.ops
+        rate = ops / elapsed if elapsed > 0 else float("inf")
+        best = rate if best is None else max(best, rate)
+        total_ops += ops
+
+    blocks_per_op, peak_kib = measure_allocations(case)
+    return BenchmarkResult(case.name, best, blocks_per_op, peak_kib, total_ops)
+
+
+def measure_allocations(case: BenchmarkCase):
+    """测量一批操作的净内存块增量（每个操作）和峰值额外内存（KiB）"""
+    # 预热一次，避免把缓存填充算进去
+    state = case.setup() if case.setup is not None else None
+    case.func(state)
+
+    state = case.setup() if case.setup is not None else None
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        before = sys.getallocatedblocks()
+        done = case.func(state)
+        blocks = sys.getallocatedblocks() - before
+    finally:
+        if gc_enabled:
+            gc.enable()
+    ops = done if done is not None else case.ops
+
+    state = case.setup() if case.setup is not None else None
+    tracemalloc.start()
+    try:
+        current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        case.func(state)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return blocks / max(ops, 1), max(0, peak - current) / 1024.0
+
+
+def run_suite(cases: List[BenchmarkCase], min_time: float = 0.2, repeat: int = 3,
+              name_filter: Optional[str] = None, verbose: bool = True) -> List[BenchmarkResult]:
+    """运行一组用例，name_filter为用例名称中需要包含的字符串"""
+    results = []
+    for case in cases:
+        if name_filter and name_filter not in case.name:
+            continue
+        result = run_case(case, min_time, repeat)
+        results.append(result)
+        if verbose:
+            print(format_result(result))
+    return results
+
+
+def format_result(result: BenchmarkResult) -> str:
+    """格式化一条结果"""
+    return (f"{result.name:<56} {result.ops_per_sec:>14,.0f} ops/s "
+            f"{result.blocks_per_op:>8.2f} blocks/op {result.peak_kib:>9.1f} KiB peak")
+
+
+def save_baseline(path: str, results: List[BenchmarkResult]):
+    """把结果保存为JSON基线，同一文件中已有的其他用例保留"""
+    data = {"results": {}}
+    if os.path.exists(path):
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+
+    data["python"] = platform.python_version()
+    data["machine"] = platform.machine()
+    data["platform"] = sys.platform
+    for result in results:
+        data["results"][result.name] = {
+            "ops_per_sec": result.ops_per_sec,
+            "blocks_per_op": result.blocks_per_op,
+            "peak_kib": result.peak_kib,
+        }
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, sort_keys=True)
+
+
+def load_baseline(path: str) -> Dict[str, dict]:
+    """读取JSON基线，返回用例名称到结果的映射"""
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)["results"]
+
+
+def compare(results: List[BenchmarkResult], baseline: Dict[str, dict],
+            tolerance: float = 0.2) -> List[Comparison]:
+    """与基线比较：ops/sec下降超过tolerance为性能退化，每个操作净增内存块超过基线0.5以上为分配增多"""
+    comparisons = []
+    for result in results:
+        base = baseline.get(result.name)
+        if base is None:
+            comparisons.append(Comparison(result.name, 1.0, "new"))
+            continue
+
+        ratio = result.ops_per_sec / base["ops_per_sec"] if base["ops_per_sec"] else float("inf")
+        if ratio < 1.0 - tolerance:
+            status = "slower"
+        elif result.blocks_per_op > base["blocks_per_op"] + 0.5:
+            status = "alloc"
+        elif ratio > 1.0 + tolerance:
+            status = "faster"
+        else:
+            status = "ok"
+        comparisons.append(Comparison(result.name, ratio, status))
+    return comparisons
+
+
+def is_regression(comparison: Comparison) -> bool:
+    """是否为性能退化"""
+    return comparison.status in ("slower", "alloc")
+
+
+def main(suite: str, cases: List[BenchmarkCase], argv: Optional[List[str]] = None,
+         report: Optional[Callable[[List[BenchmarkResult]], None]] = None) -> int:
+    """基准测试命令行入口，report用于输出额外的汇总（例如对比表），存在性能退化时返回1"""
+    default_baseline = os.path.join(BASELINE_DIR, f"{suite}.json")
+    parser = argparse.ArgumentParser(description=f"{suite}基准测试")
+    parser.add_argument("--filter", help="只运行名称包含该字符串的用例")
+    parser.add_argument("--min-time", type=float, default=0.2, help="每轮最短计时（秒）")
+    parser.add_argument("--repeat", type=int, default=3, help="计时轮数，取最快的一轮")
+    parser.add_argument("--baseline", default=default_baseline, help="基线文件路径")
+    parser.add_argument("--save", action="store_true", help="把结果保存为基线")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="允许的ops/sec下降比例")
+    args = parser.parse_args(argv)
+
+    results = run_suite(cases, args.min_time, args.repeat, args.filter)
+    if report is not None and results:
+        report(results)
+
+    regressions = 0
+    if os.path.exists(args.baseline):
+        print(f"\n与基线比较: {args.baseline}")
+        for comparison in compare(results, load_baseline(args.baseline), args.tolerance):
+            marker = " <-- 性能退化" if is_regression(comparison) else ""
+            print(f"{comparison.name:<56} {comparison.ratio:>6.2f}x {comparison.status}{marker}")
+            regressions += is_regression(comparison)
+
+    if args.save:
+        save_baseline(args.baseline, results)
+        print(f"\n基线已保存: {args.baseline}")
+
+    return 1 if regressions else 0
@@ -17,6 +17,28 @@ from test_piece import TestPiece
 from test_collision import TestCollisionDetector
 from test_game_state import TestGameState
 from test_game_engine import TestGameEngine
+from test_main_menu import TestMainMenu
+from test_transposition import TestTranspositionTable
+from test_board_snapshot import TestBoardSnapshot
+from test_tetris_env import TestTetrisEnv
+from test_tournament import TestTournament
+from test_hard_drop import TestHardDrop
+from test_benchmark import TestBenchmark
+from test_profiler import TestProfiler
+from test_game_loop import TestGameLoop
+from test_sprite_atlas import TestSpriteAtlas
+from test_font_manager import TestFontManager
+from test_text_cache import TestTextCache
+from test_layered_renderer import TestLayeredRenderer
+from test_dirty_renderer import TestDirtyRectRenderer
+from test_ai import TestAIPlayer
+from test_placement import TestPlacementFinder
+from test_replay import TestReplay
+from test_randomizer import TestRandomizer
+from test_batch_engine import TestBatchEngine
+from test_headless import TestHeadlessGame
+from test_piece_geometry import TestPieceGeometry
+from test_bit_board import TestBitBoard
 
 
 def run_all_tests():
@@ -30,7 +52,29 @@ def run_all_tests():
         TestPiece,
         TestCollisionDetector,
         TestGameState,
-        TestGameEngine
+        TestGameEngine,
+        TestBitBoard,
+        TestPieceGeometry,
+        TestHeadlessGame,
+        TestBatchEngine,
+        TestRandomizer,
+        TestReplay,
+        TestPlacementFinder,
+        TestAIPlayer,
+        TestDirtyRectRenderer,
+        TestLayeredRenderer,
+        TestTextCache,
+        TestFontManager,
+        TestSpriteAtlas,
+        TestGameLoop,
+        TestProfiler,
+        TestBenchmark,
+        TestHardDrop,
+        TestTournament,
+        TestTetrisEnv,
+        TestBoardSnapshot,
+        TestTranspositionTable,
+        TestMainMenu
     ]
     
     for test_class in test_classes:
@@ -72,7 +116,29 @@ def run_specific_test(test_name):
         'piece': TestPiece,
         'collision': TestCollisionDetector,
         'game_state': TestGameState,
-        'game_engine': TestGameEngine
+        'game_engine': TestGameEngine,
+        'bit_board': TestBitBoard,
+        'piece_geometry': TestPieceGeometry,
+        'headless': TestHeadlessGame,
+        'batch_engine': TestBatchEngine,
+        'randomizer': TestRandomizer,
+        'replay': TestReplay,
+        'placement': TestPlacementFinder,
+        'ai': TestAIPlayer,
+        'dirty_renderer': TestDirtyRectRenderer,
+        'layered_renderer': TestLayeredRenderer,
+        'text_cache': TestTextCache,
+        'font_manager': TestFontManager,
+        'sprite_atlas': TestSpriteAtlas,
+        'game_loop': TestGameLoop,
+        'profiler': TestProfiler,
+        'benchmark': TestBenchmark,
+        'hard_drop': TestHardDrop,
+        'tournament': TestTournament,
+        'tetris_env': TestTetrisEnv,
+        'board_snapshot': TestBoardSnapshot,
+        'transposition': TestTranspositionTable,
+        'main_menu': TestMainMenu
     }
     
     if test_name in test_map:
@@ -90,7 +156,7 @@ def run_specific_test(test_name):
         return result.wasSuccessful()
     else:
         print(f"未知的测试: {test_name}")
-        print("可用的测试: board, piece, collision, game_state, game_engine")
+        print("可用的测试: board, piece, collision, game_state, game_engine, bit_board, piece_geometry, headless, batch_engine, randomizer, replay, placement, ai, dirty_renderer, layered_renderer, text_cache, font_manager, sprite_atlas, game_loop, profiler, benchmark, hard_drop, tournament, tetris_env, board_snapshot, transposition, main_menu")
         return False
 
 
@@ -99,7 +165,7 @@ if __name__ == '__main__':
     
     parser = argparse.ArgumentParser(description='运行core组件单元测试')
     parser.add_argument('--test', '-t', 
-                       choices=['board', 'piece', 'collision', 'game_state', 'game_engine'],
+                       choices=['board', 'piece', 'collision', 'game_state', 'game_engine', 'bit_board', 'piece_geometry', 'headless', 'batch_engine', 'randomizer', 'replay', 'placement', 'ai', 'dirty_renderer', 'layered_renderer', 'text_cache', 'font_manager', 'sprite_atlas', 'game_loop', 'profiler', 'benchmark', 'hard_drop', 'tournament', 'tetris_env', 'board_snapshot', 'transposition', 'main_menu'],
                        help='运行特定的测试')
     
     args = parser.parse_args()
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+AI玩家和局面评估的单元测试
+"""
+
+import unittest
+import sys
+import os
+
+# 添加src目录到Python路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from ai.evaluator import BoardEvaluator, board_to_rows, place_on_rows
+from ai.player import AIPlayer
+from core.board import Board
+from core.bit_board import BitBoard
+from core.piece import Piece
+from core.piece_geometry import get_geometry
+from core.game_engine import GameEngine
+from core.headless import HeadlessGame
+from config.game_config import GameConfig
+
+
+class TestAIPlayer(unittest.TestCase):
+    """AI玩家和局面评估的单元测试"""
+    # 测试思路说明：
+    # 1. 特征计算：列高度、总高度、空洞数、凹凸度与手工计算一致；Board和BitBoard转换结果相同。
+    # 2. 行掩码上放置方块能正确消行，超出顶部返回None；评估结果按局面缓存。
+    # 3. 无论是否向前看，AI都优先选择能消行的落点；逐帧输出的操作与落点的操作序列一致。
+    # 4. 在无界面游戏中AI按计划逐帧操作，长时间运行能持续消行。
+
+    def setUp(self):
+        """测试前的设置"""
+        self.evaluator = BoardEvaluator(10)
+
+    def test_features(self):
+        """测试棋盘特征"""
+        board = Board(10, 6)
+        board.grid[3][0] = (255, 0, 0)
+        board.grid[5][0] = (255, 0, 0)
+        board.grid[5][1] = (255, 0, 0)
+        board.grid[2][4] = (255, 0, 0)
+
+        rows = board_to_rows(board)
+        features = self.evaluator.get_features(rows)
+        self.assertEqual(features.column_heights, (3, 1, 0, 0, 4, 0, 0, 0, 0, 0))
+        self.assertEqual(features.aggregate_height, 8)
+        # 第0列第4行、第4列第3~5行
+        self.assertEqual(features.holes, 4)
+        self.assertEqual(features.bumpiness, 2 + 1 + 0 + 4 + 4)
+
+        bit_board = BitBoard(10, 6)
+        bit_board.place_piece(Piece('O'), 0, 4)
+        self.assertEqual(board_to_rows(bit_board), (0, 0, 0, 0, 0b11, 0b11))
+
+    def test_place_on_rows(self):
+        """测试在行掩码上放置方块"""
+        rows = (0,) * 18 + (0b1111111110, 0b0111111111)
+        # 竖直的I方块放在第0列第15~18行，消除倒数第二行
+        result = place_on_rows(rows, get_geometry('I', 1), 0, 15, 10)
+        self.assertEqual(result, ((0,) * 16 + (0b1, 0b1, 0b1, 0b0111111111), 1))
+
+        self.assertIsNone(place_on_rows(rows, get_geometry('O', 0), 0, -1, 10))
+
+    def test_evaluation_cache(self):
+        """测试评估缓存"""
+        rows = (0,) * 19 + (0b1111,)
+        first = self.evaluator.evaluate(rows, 0)
+        self.assertEqual(self.evaluator.evaluate(rows, 1),
+                         first + self.evaluator.weights.lines_cleared)
+        self.assertEqual(self.evaluator.cache_misses, 1)
+        self.assertEqual(self.evaluator.cache_hits, 1)
+
+        self.evaluator.clear_cache()
+        self.assertEqual(self.evaluator.cache_hits, 0)
+
+    def test_choose_line_clear(self):
+        """测试AI选择能消行的落点"""
+        config = GameConfig()
+        for lookahead in (0, 1):
+            engine = GameEngine(config, seed=1)
+            engine.spawn_new_piece()
+            for col in range(9):
+                engine.board.grid[19][col] = (255, 0, 0)
+            engine.game_state.current_piece = Piece('I')
+            engine.game_state.set_piece_position(3, 0)
+
+            placement = AIPlayer(10, lookahead).choose_placement(engine)
+            self.assertIn((9, 19), placement.get_cells())
+
+    def test_plan_follows_path(self):
+        """测试AI逐帧输出到达落点的操作"""
+        engine = GameEngine(GameConfig(), seed=5)
+        engine.spawn_new_piece()
+        player = AIPlayer(10)
+        placement = player.choose_placement(engine)
+        piece = engine.game_state.current_piece
+
+        actions = []
+        while True:
+            action = player.get_action(engine)
+            if action == "none":
+                break
+            actions.append(action)
+            if action == "rotate":
+                engine.handle_piece_rotation()
+            else:
+                dx, dy = {"move_left": (-1, 0), "move_right": (1, 0), "move_down": (0, 1)}[action]
+                self.assertTrue(engine.handle_piece_movement(dx, dy))
+
+        self.assertEqual(tuple(actions), placement.path)
+        self.assertEqual(engine.game_state.get_piece_position(), (placement.x, placement.y))
+        self.assertEqual(piece.rotation, placement.rotation)
+
+    def test_headless_autoplay(self):
+        """测试AI在无界面游戏中持续消行"""
+        game = HeadlessGame(tick_ms=50)
+        game.reset(seed=3)
+        player = AIPlayer(10, lookahead=1)
+        ticks = game.run(lambda state: player.get_action(game.engine), max_ticks=3000)
+
+        self.assertEqual(ticks, 3000)
+        self.assertFalse(game.engine.game_state.game_over)
+        self.assertGreater(game.engine.game_state.lines_cleared, 20)
+        self.assertGreater(player.evaluator.cache_hits, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
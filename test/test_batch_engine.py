@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+BatchEngine类的单元测试（包括与标量引擎的一致性测试）
+"""
+
+import unittest
+import random
+import sys
+import os
+from collections import deque
+
+# 添加src目录到Python路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+try:
+    import numpy as np
+    from core.batch_engine import BatchEngine
+except ImportError:
+    np = None
+
+from core.headless import HeadlessGame
+from core.piece_geometry import get_geometry
+from core.randomizer import PieceRandomizer
+from utils.constants import PIECE_COLORS
+
+
+class QueueRandomizer(PieceRandomizer):
+    """按给定队列发出方块的生成器，用于复现批量引擎的方块序列"""
+
+    def __init__(self, source: deque):
+        super().__init__(PIECE_COLORS.keys())
+        self.source = source
+
+    def _generate(self):
+        return [self.source.popleft()]
+
+
+@unittest.skipIf(np is None, "需要安装numpy")
+class TestBatchEngine(unittest.TestCase):
+    """BatchEngine类的单元测试"""
+    # 测试思路说明：
+    # 1. 初始化后每个游戏板都有当前方块和下一个方块，位置与GameEngine.spawn_new_piece一致。
+    # 2. 批量消行与Board.clear_lines一致：完整行被删除，上方的行保持顺序下移。
+    # 3. 一致性测试：相同的方块序列和动作序列下，批量引擎和HeadlessGame
+    #    每个tick的网格、方块位置、分数、等级、行数、游戏结束状态完全一致。
+
+    def test_initial_spawn(self):
+        """测试初始方块生成"""
+        engine = BatchEngine(32, seed=1)
+        self.assertEqual(engine.boards.shape, (32, 20, 10))
+        self.assertFalse(engine.game_over.any())
+        self.assertTrue((engine.pieces_spawned == 1).all())
+        for i in range(32):
+            piece_type, rotation, (x, y) = engine.get_piece(i)
+            width = get_geometry(piece_type, 0).width
+            self.assertEqual(rotation, 0)
+            self.assertEqual((x, y), (10 // 2 - width // 2, 0))
+
+    def test_clear_lines(self):
+        """测试批量消行"""
+        engine = BatchEngine(2, seed=1)
+        engine.boards[:, 19, :] = 1
+        engine.boards[:, 18, :9] = 2
+        engine.boards[0, 17, :] = 3
+        engine.boards[:, 16, 0] = 4
+
+        engine._clear_lines(np.arange(2))
+
+        # 游戏板0消除两行，游戏板1消除一行
+        self.assertEqual(engine.lines_cleared.tolist(), [2, 1])
+        self.assertEqual(engine.score.tolist(), [300, 100])
+        self.assertEqual(engine.boards[0, 19].tolist(), [2] * 9 + [0])
+        self.assertEqual(engine.boards[0, 18].tolist(), [4] + [0] * 9)
+        self.assertEqual(engine.boards[1, 19].tolist(), [2] * 9 + [0])
+        self.assertEqual(engine.boards[1, 17].tolist(), [4] + [0] * 9)
+        self.assertEqual(int(engine.boards[:, :16].sum()), 0)
+
+    def test_parity_with_scalar_engine(self):
+        """测试与标量引擎逐tick一致"""
+        num_boards = 8
+        steps = 3000
+        rng = random.Random(42)
+        batch = BatchEngine(num_boards, tick_ms=50, seed=7)
+
+        # 底部预置带缺口的垃圾行，让消行更容易发生
+        garbage = [(row, rng.randrange(10)) for row in range(14, 20)]
+        for row, hole in garbage:
+            batch.boards[:, row, :] = 1
+            batch.boards[:, row, hole] = 0
+
+        # 标量引擎使用批量引擎生成的方块序列
+        queues = [deque([BatchEngine.PIECE_TYPES[batch.current_type[i]],
+                         BatchEngine.PIECE_TYPES[batch.next_type[i]]])
+                  for i in range(num_boards)]
+
+        games = []
+        for i in range(num_boards):
+            game = HeadlessGame(tick_ms=50)
+            game.engine.randomizer = QueueRandomizer(queues[i])
+            game.reset()
+            for row, hole in garbage:
+                grid_row = game.engine.board.grid[row]
+                for col in range(10):
+                    grid_row[col] = PIECE_COLORS['I'] if col != hole else None
+            games.append(game)
+
+        actions = ["none", "move_left", "move_right", "move_down", "rotate"]
+        for _ in range(steps):
+            codes = [rng.choice([0, 0, 1, 2, 3, 3, 4]) for _ in range(num_boards)]
+            spawned = batch.pieces_spawned.copy()
+            batch.step(np.array(codes))
+
+            for i, game in enumerate(games):
+                if batch.pieces_spawned[i] != spawned[i]:
+                    queues[i].append(BatchEngine.PIECE_TYPES[batch.next_type[i]])
+                state = game.step(actions[codes[i]])
+
+                self.assertEqual(batch.get_grid(i), game.engine.board.get_grid())
+                self.assertEqual(batch.get_piece(i),
+                                 (state.current_piece.type, state.current_piece.rotation,
+                                  state.get_piece_position()))
+                self.assertEqual(int(batch.score[i]), state.score)
+                self.assertEqual(int(batch.level[i]), state.level)
+                self.assertEqual(int(batch.lines_cleared[i]), state.lines_cleared)
+                self.assertEqual(int(batch.drop_delay[i]), state.drop_delay)
+                self.assertEqual(bool(batch.game_over[i]), state.game_over)
+
+        # 确认测试覆盖了消行和游戏结束
+        self.assertGreater(int(batch.lines_cleared.sum()), 0)
+        self.assertTrue(batch.game_over.any())
+
+
+if __name__ == '__main__':
+    unittest.main()
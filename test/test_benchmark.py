@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+性能基准测试框架的单元测试
+"""
+
+import unittest
+import tempfile
+import io
+import sys
+import os
+from contextlib import redirect_stdout
+
+# 使用无窗口的视频驱动
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+# 添加src目录到Python路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from benchmark import (BenchmarkCase, BenchmarkResult, compare, is_regression,
+                       load_baseline, run_case, save_baseline)
+from bench_core import BACKENDS, build_board, clone_board, generate_stack, max_column_height
+from bench_render import frame_case, make_board, make_config, print_table
+
+
+class TestBenchmark(unittest.TestCase):
+    """性能基准测试框架的单元测试"""
+    # 测试思路说明：
+    # 1. 用例的操作数按func的返回值或ops计算，setup不计时，净分配的内存块按每个操作统计。
+    # 2. 基线保存后可以读取，同一文件中其他用例的基线保留。
+    # 3. 与基线比较：速度下降超过容差或分配增多标记为性能退化，变快、持平和新增用例不算退化。
+    # 4. 核心用例生成的堆叠达到目标高度，两种游戏板后端重建和复制的结果一致。
+    # 5. 渲染用例的合成游戏板内容正确，屏幕能容纳游戏板，对比表按尺寸和内容分行。
+
+    def test_run_case(self):
+        """测试运行用例"""
+        setups = []
+
+        def setup():
+            setups.append(1)
+            return []
+
+        def run(state):
+            for _ in range(100):
+                state.append(object())
+            return 100
+
+        result = run_case(BenchmarkCase("append", run, setup), min_time=0.01, repeat=2)
+        self.assertEqual(result.name, "append")
+        self.assertGreater(result.ops_per_sec, 0)
+        self.assertEqual(result.ops % 100, 0)
+        # 每个操作保留一个新对象
+        self.assertGreaterEqual(result.blocks_per_op, 0.9)
+        self.assertGreater(len(setups), 2)
+
+        result = run_case(BenchmarkCase("noop", lambda state: None, ops=10), min_time=0.01, repeat=1)
+        self.assertEqual(result.ops % 10, 0)
+        self.assertLess(result.blocks_per_op, 0.5)
+
+    def test_baseline_round_trip(self):
+        """测试基线的保存和读取"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "baselines", "core.json")
+            save_baseline(path, [BenchmarkResult("a", 100.0, 0.0, 1.0, 10)])
+            save_baseline(path, [BenchmarkResult("b", 200.0, 1.0, 2.0, 10)])
+            baseline = load_baseline(path)
+            self.assertEqual(set(baseline), {"a", "b"})
+            self.assertEqual(baseline["b"]["ops_per_sec"], 200.0)
+
+    def test_compare(self):
+        """测试与基线比较"""
+        baseline = {name: {"ops_per_sec": 100.0, "blocks_per_op": 0.0, "peak_kib": 0.0}
+                    for name in ("ok", "slower", "faster", "alloc")}
+        results = [
+            BenchmarkResult("ok", 90.0, 0.0, 0.0, 1),
+            BenchmarkResult("slower", 70.0, 0.0, 0.0, 1),
+            BenchmarkResult("faster", 150.0, 0.0, 0.0, 1),
+            BenchmarkResult("alloc", 100.0, 2.0, 0.0, 1),
+            BenchmarkResult("new", 100.0, 0.0, 0.0, 1),
+        ]
+        comparisons = compare(results, baseline, tolerance=0.2)
+        self.assertEqual([c.status for c in comparisons], ["ok", "slower", "faster", "alloc", "new"])
+        self.assertAlmostEqual(comparisons[1].ratio, 0.7)
+        self.assertEqual([is_regression(c) for c in comparisons], [False, True, False, True, False])
+
+    def test_stack_profiles(self):
+        """测试堆叠生成和游戏板复制"""
+        placements = generate_stack(10)
+        boards = [build_board(backend, placements) for backend in BACKENDS]
+        self.assertGreaterEqual(max_column_height(boards[0]), 10)
+        self.assertEqual(boards[0].grid, boards[1].grid)
+
+        for board in boards:
+            clone = clone_board(board)
+            self.assertEqual(clone.grid, board.grid)
+            self.assertIsNot(clone.grid[-1], board.grid[-1])
+        self.assertEqual(clone_board(boards[1]).rows, boards[1].rows)
+
+    def test_render_fixtures(self):
+        """测试渲染用例的合成数据和对比表"""
+        filled = {fixture: sum(cell is not None for row in make_board(fixture, 10, 20).grid for cell in row)
+                  for fixture in ("empty", "half", "full", "colors")}
+        self.assertEqual(filled["empty"], 0)
+        self.assertEqual(filled["full"], 200)
+        self.assertEqual(filled["colors"], 200)
+        self.assertTrue(0 < filled["half"] <= 100)
+        colors = {cell for row in make_board("colors", 10, 20).grid for cell in row}
+        self.assertEqual(len(colors), 7)
+
+        config = make_config((20, 40), 40)
+        self.assertGreaterEqual(config.SCREEN_HEIGHT, config.BOARD_Y + 40 * 40)
+        self.assertEqual(make_config((10, 20), 30).SCREEN_WIDTH, 800)
+
+        case = frame_case((10, 20), 20, "half", "dirty")
+        self.assertIsNone(case.func(None))
+        output = io.StringIO()
+        with redirect_stdout(output):
+            print_table([BenchmarkResult(case.name, 1000.0, 0.0, 0.0, 20),
+                         BenchmarkResult("render.board[10x20/cell20/half]", 2000.0, 0.0, 0.0, 20)])
+        lines = output.getvalue().splitlines()
+        self.assertTrue(lines[-1].startswith("10x20/cell20/half"))
+        self.assertIn("500.0", lines[-1])
+        self.assertIn("1000.0 ( 1000)", lines[-1])
+
+
+if __name__ == '__main__':
+    unittest.main()
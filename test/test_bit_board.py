@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+BitBoard类的单元测试
+"""
+
+import unittest
+import random
+import sys
+import os
+
+# 添加src目录到Python路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from core.board import Board, create_board
+from core.bit_board import BitBoard
+from core.piece import Piece
+from core.piece_geometry import PIECE_GEOMETRY, _build_geometry
+from config.game_config import GameConfig
+from utils.constants import PIECE_SHAPES
+
+
+class TestBitBoard(unittest.TestCase):
+    """BitBoard类的单元测试"""
+    # 测试思路说明：
+    # 1. BitBoard与Board接口兼容，相同操作序列下两者结果必须完全一致。
+    # 2. 位掩码rows与颜色数组grid必须始终保持同步；完整行由位掩码与full_row_mask比较判断。
+    # 3. 碰撞检测只用占用范围和非空行的位掩码，所有方块、旋转和位置的结果与Board一致（包括四周有空行空列的形状）。
+    # 4. create_board根据GameConfig.BOARD_BACKEND选择后端。
+
+    def setUp(self):
+        """测试前的设置"""
+        self.board = BitBoard(10, 20)
+        self.piece_i = Piece('I')
+        self.piece_o = Piece('O')
+        self.piece_t = Piece('T')
+
+    def assert_rows_match_grid(self, board):
+        """检查位掩码与颜色数组一致"""
+        for row in range(board.height):
+            expected = sum(1 << col for col in range(board.width)
+                           if board.grid[row][col] is not None)
+            self.assertEqual(board.rows[row], expected)
+
+    def test_bit_board_initialization(self):
+        """测试位棋盘初始化"""
+        self.assertIsInstance(self.board, Board)
+        self.assertEqual(self.board.full_row_mask, 0b1111111111)
+        self.assertEqual(self.board.rows, [0] * 20)
+        self.assertEqual(len(self.board.get_grid()), 20)
+
+    def test_is_valid_position_bounds(self):
+        """测试边界检查"""
+        self.assertTrue(self.board.is_valid_position(self.piece_o, 0, 0))
+        self.assertTrue(self.board.is_valid_position(self.piece_o, 8, 18))
+        self.assertFalse(self.board.is_valid_position(self.piece_o, -1, 0))
+        self.assertFalse(self.board.is_valid_position(self.piece_o, 9, 0))
+        self.assertFalse(self.board.is_valid_position(self.piece_o, 4, 19))
+
+        # T型方块第一行左侧为空，左移一格后仍然越界
+        self.assertFalse(self.board.is_valid_position(self.piece_t, -1, 0))
+
+        # 顶部以上的位置是允许的
+        self.assertTrue(self.board.is_valid_position(self.piece_o, 4, -1))
+
+    def test_place_piece_updates_masks_and_colors(self):
+        """测试放置方块同时更新位掩码和颜色"""
+        self.assertTrue(self.board.place_piece(self.piece_t, 3, 18))
+        self.assertEqual(self.board.rows[18], 0b0000010000)
+        self.assertEqual(self.board.rows[19], 0b0000111000)
+        self.assertEqual(self.board.grid[18][4], self.piece_t.color)
+        self.assertIsNone(self.board.grid[18][3])
+
+        # 重叠位置放置失败，状态不变
+        self.assertFalse(self.board.place_piece(self.piece_o, 3, 18))
+        self.assert_rows_match_grid(self.board)
+
+    def test_clear_lines_keeps_grid_reference(self):
+        """测试消行后grid引用不变"""
+        grid = self.board.get_grid()
+        self.board.place_piece(self.piece_t, 0, 16)
+        for i in range(0, 10, 2):
+            self.board.place_piece(self.piece_o, i, 18)
+
+        self.assertEqual(self.board.clear_lines(), 2)
+        self.assertIs(self.board.get_grid(), grid)
+        self.assertEqual(self.board.rows[18], 0b0000000010)
+        self.assertEqual(self.board.rows[19], 0b0000000111)
+        self.assert_rows_match_grid(self.board)
+
+    def test_is_game_over(self):
+        """测试游戏结束检查"""
+        self.assertFalse(self.board.is_game_over())
+        self.board.place_piece(self.piece_o, 0, 0)
+        self.assertTrue(self.board.is_game_over())
+
+    def test_parity_with_grid_board(self):
+        """测试随机操作序列下与Board结果一致"""
+        rng = random.Random(1234)
+        grid_board = Board(10, 20)
+        bit_board = BitBoard(10, 20)
+        piece_types = list(PIECE_SHAPES.keys())
+
+        for _ in range(2000):
+            piece = Piece(rng.choice(piece_types))
+            for _ in range(rng.randrange(4)):
+                piece.rotate()
+            x = rng.randrange(-2, 11)
+            y = rng.randrange(-2, 21)
+
+            self.assertEqual(bit_board.is_valid_position(piece, x, y),
+                             grid_board.is_valid_position(piece, x, y))
+            self.assertEqual(bit_board.place_piece(piece, x, y),
+                             grid_board.place_piece(piece, x, y))
+            self.assertEqual(bit_board.clear_lines(), grid_board.clear_lines())
+            self.assertEqual(bit_board.is_game_over(), grid_board.is_game_over())
+            self.assertEqual(bit_board.get_grid(), grid_board.get_grid())
+            self.assertEqual(bit_board.row_counts, grid_board.row_counts)
+            # 列高度按方块每列的高度更新，方块部分在顶部以上时也要一致
+            self.assertEqual(bit_board.column_heights, grid_board.column_heights)
+            self.assertEqual(bit_board.aggregate_height, grid_board.aggregate_height)
+            self.assertEqual(bit_board.max_height, grid_board.max_height)
+            self.assertEqual(bit_board.holes, grid_board.holes)
+            self.assertEqual(bit_board.zobrist_hash, grid_board.zobrist_hash)
+
+        self.assert_rows_match_grid(bit_board)
+
+    def test_collision_matches_grid_board(self):
+        """测试所有方块、旋转和位置的碰撞检测与Board一致"""
+        rng = random.Random(7)
+        grid_board = Board(10, 20)
+        bit_board = BitBoard(10, 20)
+        for row in range(8, 20):
+            for col in range(10):
+                if rng.random() < 0.5:
+                    grid_board.grid[row][col] = bit_board.grid[row][col] = (255, 0, 0)
+        bit_board.refresh()
+
+        # 包围盒四周有空行空列的形状：占用范围小于包围盒
+        padded = _build_geometry('T', 0, [[0, 0, 0, 0], [0, 0, 1, 0], [0, 1, 1, 1], [0, 0, 0, 0]])
+        self.assertEqual((padded.left, padded.right, padded.bottom), (1, 3, 2))
+        self.assertEqual(padded.filled_rows, ((1, 0b0100), (2, 0b1110)))
+
+        geometries = [geometry for rotations in PIECE_GEOMETRY.values() for geometry in rotations]
+        for geometry in geometries + [padded]:
+            for x in range(-4, 12):
+                for y in range(-5, 22):
+                    self.assertEqual(bit_board.is_valid_geometry(geometry, x, y),
+                                     grid_board.is_valid_geometry(geometry, x, y),
+                                     (geometry.piece_type, geometry.rotation, x, y))
+
+    def test_refresh(self):
+        """测试直接修改grid后重新计算位掩码和每行计数"""
+        for col in range(10):
+            self.board.grid[19][col] = (255, 0, 0)
+        self.board.grid[18][2] = (255, 0, 0)
+        self.board.refresh()
+        self.assert_rows_match_grid(self.board)
+        self.assertEqual(self.board.row_counts[18:], [1, 10])
+
+        self.assertEqual(self.board.clear_lines(), 1)
+        self.assertEqual(self.board.rows[19], 0b100)
+        self.assertEqual(self.board.row_counts[19], 1)
+        self.assert_rows_match_grid(self.board)
+
+    def test_create_board_backend(self):
+        """测试根据配置选择游戏板后端"""
+        config = GameConfig()
+        self.assertNotIsInstance(create_board(config), BitBoard)
+
+        config.BOARD_BACKEND = "bitboard"
+        board = create_board(config)
+        self.assertIsInstance(board, BitBoard)
+        self.assertEqual(board.width, config.BOARD_WIDTH)
+        self.assertEqual(board.height, config.BOARD_HEIGHT)
+
+        config.BOARD_BACKEND = "unknown"
+        with self.assertRaises(ValueError):
+            create_board(config)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -5,14 +5,22 @@ Board类的单元测试
 """
 
 import unittest
+from unittest.mock import patch
+import random
 import sys
 import os
 
 # 添加src目录到Python路径
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
+import copy
+import pickle
 from core.board import Board
+from core.bit_board import BitBoard
 from core.piece import Piece
+from core.piece_geometry import PIECE_GEOMETRY
+from core.zobrist import hash_rows
+from utils.constants import PIECE_SHAPES
 
 
 class TestBoard(unittest.TestCase):
@@ -35,6 +43,13 @@ class TestBoard(unittest.TestCase):
     # 6. 边界情况测试：
     #    - 方块在四角、边缘、底部等极限位置的有效性和放置情况。
     #    - 连续多次消除、极端网格状态下的稳定性。
+    # 7. 每行计数：place_piece和clear_lines维护row_counts，不相邻的完整行一次压缩消除，行列表对象复用；
+    #    通过grid或get_grid()直接修改网格（逐格、整行、切片、列表方法、整个网格）后，clear_lines按每行格子数
+    #    发现修改并重新统计，复制和序列化后的游戏板同样如此；游戏板自己的放置和消行不会触发重新统计。
+    # 8. 列高度和空洞数：随机放置（包括悬空）和消行后，增量维护的值与按网格重新计算的结果一致；
+    #    直接修改网格后，clear_lines或refresh之后列高度、空洞数、游戏结束、哈希和版本号得到更新后的值。
+    # 9. 复制和撤销：copy得到独立的游戏板，apply_move后undo_move恢复放置前的全部状态（包括消行）。
+    # 10. Zobrist哈希：随机放置和消行后，增量维护的哈希与按行掩码重新计算的结果一致，只与格子是否占用有关。
     
     def setUp(self):
         """测试前的设置"""
@@ -184,6 +199,351 @@ class TestBoard(unittest.TestCase):
         self.assertTrue(self.board.place_piece(self.piece_i, 0, 16))  # 左边界
         self.assertTrue(self.board.place_piece(self.piece_i, 6, 16))  # 右边界
 
+    def assert_counts_match_grid(self, board):
+        """检查每行计数与网格一致"""
+        self.assertEqual(board.row_counts,
+                         [sum(cell is not None for cell in row) for row in board.grid])
+
+    def test_row_counts(self):
+        """测试每行计数随放置和消行更新"""
+        self.board.place_piece(self.piece_t, 3, 18)
+        self.assertEqual(self.board.row_counts[18:], [1, 3])
+        self.assertFalse(self.board.place_piece(self.piece_o, 3, 18))
+        self.assertEqual(self.board.row_counts[18:], [1, 3])
+
+        # 方块部分在顶部以上
+        self.board.place_piece(self.piece_o, 0, -1)
+        self.assertEqual(self.board.row_counts[0], 2)
+        self.assert_counts_match_grid(self.board)
+
+    def test_clear_non_adjacent_lines(self):
+        """测试不相邻的完整行一次消除，其余行按顺序下移"""
+        board = Board(4, 8)
+        # 第7、5行完整，第6、4、3行各有一个标记格子，消除后分别下移到第7、6、5行
+        for row in (5, 7):
+            board.grid[row] = [(9, 9, 9)] * 4
+        markers = [(6, 2, (1, 0, 0)), (4, 0, (2, 0, 0)), (3, 3, (3, 0, 0))]
+        for row, col, color in markers:
+            board.grid[row][col] = color
+        board.refresh()
+        row_objects = [id(row) for row in board.grid]
+
+        self.assertEqual(board.clear_lines(), 2)
+        for new_row, (_, col, color) in zip((7, 6, 5), markers):
+            self.assertEqual(board.grid[new_row][col], color)
+        self.assertTrue(all(cell is None for row in board.grid[:5] for cell in row))
+        self.assertEqual(sorted(id(row) for row in board.grid), sorted(row_objects))
+        self.assert_counts_match_grid(board)
+
+    def test_direct_grid_writes(self):
+        """测试直接修改网格后clear_lines重新统计"""
+        for backend in (Board, BitBoard):
+            board = backend(10, 20)
+            # 逐格写入
+            for col in range(10):
+                board.get_grid()[19][col] = (255, 0, 0)
+            self.assertEqual(board.clear_lines(), 1)
+            self.assert_counts_match_grid(board)
+
+            # 整行替换、切片赋值和列表方法
+            board.grid[19] = [(0, 255, 0)] * 10
+            board.grid[18][:] = [(0, 0, 255)] * 10
+            board.grid[17].clear()
+            board.grid[17].extend([(9, 9, 9)] * 9 + [None])
+            self.assertEqual(board.clear_lines(), 2)
+            self.assertEqual(board.grid[19], [(9, 9, 9)] * 9 + [None])
+            self.assert_counts_match_grid(board)
+
+            # 整个网格替换
+            board.grid = [[(1, 1, 1)] * 10 for _ in range(20)]
+            board.grid[0][0] = None
+            self.assertEqual(board.clear_lines(), 19)
+            self.assert_counts_match_grid(board)
+
+            # 游戏板自己的放置和消行不算直接修改，不会重新统计所有行
+            board = backend(10, 20)
+            with patch.object(board, "refresh") as refresh:
+                board.place_piece(self.piece_i, 0, 19)
+                board.place_piece(self.piece_i, 4, 19)
+                board.place_piece(Piece('O'), 8, 18)
+                self.assertEqual(board.clear_lines(), 1)
+                refresh.assert_not_called()
+
+            # 复制和序列化后的游戏板同样能发现直接修改
+            for clone in (board.copy(), pickle.loads(pickle.dumps(board))):
+                self.assertIsInstance(clone, backend)
+                for col in range(10):
+                    clone.grid[19][col] = (255, 0, 0)
+                self.assertEqual(clone.clear_lines(), 1)
+                self.assertEqual(board.row_counts[19], 2)
+                self.assert_counts_match_grid(clone)
+
+    def assert_heights_match_grid(self, board):
+        """检查列高度、空洞数和最高列高度与按网格计算的结果一致"""
+        heights = []
+        holes = 0
+        for col in range(board.width):
+            cells = [board.grid[row][col] for row in range(board.height)]
+            filled = [row for row, cell in enumerate(cells) if cell is not None]
+            top = filled[0] if filled else board.height
+            heights.append(board.height - top)
+            holes += cells[top:].count(None)
+        self.assertEqual(board.column_heights, tuple(heights))
+        self.assertEqual(board.aggregate_height, sum(heights))
+        self.assertEqual(board.max_height, max(heights))
+        self.assertEqual(board.holes, holes)
+        self.assertEqual(board.is_game_over(), any(cell is not None for cell in board.grid[0]))
+
+    def test_column_heights_and_holes(self):
+        """测试列高度和空洞数"""
+        self.board.place_piece(self.piece_t, 3, 17)
+        self.assertEqual(self.board.column_heights[3:6], (2, 3, 2))
+        self.assertEqual(self.board.get_column_height(4), 3)
+        self.assertEqual(self.board.max_height, 3)
+        # T型方块悬空：底部一行是空洞
+        self.assertEqual(self.board.holes, 3)
+
+        # 填到悬空方块下方后空洞消失
+        self.board.place_piece(self.piece_i, 2, 19)
+        self.assertEqual(self.board.holes, 0)
+        self.assertEqual(self.board.get_column_height(2), 1)
+        self.assert_heights_match_grid(self.board)
+
+        with self.assertRaises(AttributeError):
+            self.board.holes = 0
+
+    def test_stats_after_direct_grid_writes(self):
+        """测试直接修改网格后clear_lines或refresh更新列高度、空洞数、游戏结束、哈希和版本号"""
+        for backend in (Board, BitBoard):
+            board = backend(10, 20)
+            board.place_piece(self.piece_t, 3, 17)
+            version = board.version
+            grid = board.get_grid()
+            grid[10][0] = (255, 0, 0)
+            self.assertEqual(board.clear_lines(), 0)
+            self.assertEqual(board.get_column_height(0), 10)
+            self.assertEqual(board.max_height, 10)
+            self.assertEqual(board.holes, 9 + 3)
+            self.assertGreater(board.version, version)
+            self.assertEqual(board.zobrist_hash, hash_rows(
+                [sum(1 << col for col, cell in enumerate(row) if cell is not None) for row in grid], 10))
+            self.assert_heights_match_grid(board)
+            # 下落距离按新的列高度计算
+            self.assertEqual(board.drop_distance(Piece('I'), 0, 0), 9)
+
+            # 网格没有再被修改时clear_lines不重新统计，版本号不变
+            version = board.version
+            self.assertEqual(board.clear_lines(), 0)
+            self.assertEqual(board.version, version)
+
+            grid[0][5] = (255, 0, 0)
+            board.refresh()
+            self.assertTrue(board.is_game_over())
+            grid[0][5] = None
+            board.refresh()
+            self.assertFalse(board.is_game_over())
+
+    def test_heights_after_random_play(self):
+        """测试随机放置和消行后增量值与网格一致"""
+        rng = random.Random(19)
+        piece_types = list(PIECE_SHAPES.keys())
+        lines = 0
+        for backend, width, height in ((Board, 10, 20), (BitBoard, 10, 20), (Board, 6, 40)):
+            board = backend(width, height)
+            for step in range(1500):
+                piece = Piece(rng.choice(piece_types))
+                for _ in range(rng.randrange(4)):
+                    piece.rotate()
+                # 落到最低的位置，偶尔悬空一格留下空洞；放不下时换新游戏板
+                bottom, x = max((self.drop_y(board, piece, x) + piece.get_height(), x)
+                                for x in range(-2, width))
+                y = bottom - piece.get_height()
+                if y < 0:
+                    board = backend(width, height)
+                    continue
+                if y > 0 and rng.random() < 0.1:
+                    y -= 1
+                self.assertTrue(board.place_piece(piece, x, y))
+                lines += board.clear_lines()
+                if step % 50 == 0:
+                    self.assert_heights_match_grid(board)
+            self.assert_heights_match_grid(board)
+        self.assertGreater(lines, 200)
+
+    def drop_y(self, board, piece, x):
+        """方块从顶部落下后的y坐标，无法放入时返回-1"""
+        if not board.is_valid_position(piece, x, 0):
+            return -1
+        y = 0
+        while board.is_valid_position(piece, x, y + 1):
+            y += 1
+        return y
+
+    def test_heights_after_clear_under_overhang(self):
+        """测试最高格子被消除的列向下查找新的高度"""
+        board = Board(4, 8)
+        # 第4行完整；第0列下方只有第7行一个格子，第1~3列在第3行还有格子
+        board.grid[4] = [(9, 9, 9)] * 4
+        board.grid[7][0] = (1, 0, 0)
+        for col in range(1, 4):
+            board.grid[3][col] = (2, 0, 0)
+        board.refresh()
+        self.assertEqual(board.column_heights, (4, 5, 5, 5))
+        self.assertEqual(board.holes, 2 + 3 * 3)
+
+        self.assertEqual(board.clear_lines(), 1)
+        self.assertEqual(board.column_heights, (1, 4, 4, 4))
+        self.assertEqual(board.holes, 3 * 3)
+        self.assert_heights_match_grid(board)
+
+    def test_tall_board_clears(self):
+        """测试高游戏板上逐行和多行消除"""
+        board = Board(4, 200)
+        bar = Piece('I')
+        for _ in range(50):
+            self.assertTrue(board.place_piece(bar, 0, 199))
+            self.assertEqual(board.clear_lines(), 1)
+        self.assertTrue(all(count == 0 for count in board.row_counts))
+
+        for row in range(199, 195, -1):
+            board.place_piece(bar, 0, row)
+        self.assertEqual(board.clear_lines(), 4)
+        self.assert_counts_match_grid(board)
+        self.assertEqual(len(board.grid), 200)
+
+
+    def get_full_state(self, board):
+        """游戏板的全部内部状态（版本号和撤销记录除外），用于比较撤销前后"""
+        grid = board.grid
+        state = {key: value for key, value in board.__dict__.items() if key not in ("_version", "_journal")}
+        state["grid"] = [row[:] for row in grid]
+        state["row_ids"] = [id(row) for row in grid]
+        for key in ("_row_counts", "_column_heights", "rows", "_row_hashes"):
+            if key in state:
+                state[key] = state[key][:]
+        return state
+
+    def drop_geometry(self, board, geometry, x):
+        """方块从顶部落下后的y坐标，无法放入时返回None"""
+        if not board.is_valid_geometry(geometry, x, 0):
+            return None
+        piece = Piece(geometry.piece_type)
+        piece.set_rotation(geometry.rotation)
+        return board.drop_distance(piece, x, 0)
+
+    def test_copy(self):
+        """测试复制游戏板"""
+        for backend in (Board, BitBoard):
+            board = backend(10, 20)
+            board.place_piece(self.piece_t, 3, 17)
+            board.place_piece(self.piece_i, 0, 19)
+            for clone in (board.copy(), copy.deepcopy(board)):
+                self.assertIsInstance(clone, backend)
+                self.assertEqual(clone.grid, board.grid)
+                self.assertEqual(clone.column_heights, board.column_heights)
+                self.assertEqual((clone.holes, clone.max_height), (board.holes, board.max_height))
+
+                # 修改复制品不影响原游戏板
+                clone.place_piece(self.piece_i, 4, 19)
+                self.assertEqual(clone.clear_lines(), 0)
+                clone.place_piece(self.piece_o, 8, 18)
+                self.assertEqual(clone.clear_lines(), 1)
+                self.assertIsNone(board.grid[19][4])
+                self.assertEqual(board.row_counts[19], 4)
+                self.assert_counts_match_grid(clone)
+                self.assert_heights_match_grid(clone)
+                self.assert_heights_match_grid(board)
+                if backend is BitBoard:
+                    self.assertEqual(clone.rows[19], 0b1100111000)
+                    self.assertEqual(board.rows[19], 0b0000001111)
+
+    def test_apply_and_undo_move(self):
+        """测试随机落点的放置、消行和撤销"""
+        rng = random.Random(24)
+        geometries = [geometry for items in PIECE_GEOMETRY.values() for geometry in items]
+        lines = 0
+        for backend in (Board, BitBoard):
+            board = backend(10, 20)
+            for _ in range(200):
+                # 在当前游戏板上搜索两层落点，每层撤销后状态不变
+                before = self.get_full_state(board)
+                depth = board.journal_depth
+                for first in rng.sample(geometries, 6):
+                    x = rng.randrange(-1, board.width)
+                    y = self.drop_geometry(board, first, x)
+                    if y is None:
+                        continue
+                    lines += board.apply_move(first, x, y)
+                    self.assert_counts_match_grid(board)
+                    self.assert_heights_match_grid(board)
+                    middle = self.get_full_state(board)
+                    for second in rng.sample(geometries, 3):
+                        x = rng.randrange(-1, board.width)
+                        y = self.drop_geometry(board, second, x)
+                        if y is not None:
+                            lines += board.apply_move(second, x, y)
+                            self.assertEqual(board.journal_depth, depth + 2)
+                            board.undo_move()
+                            self.assertEqual(self.get_full_state(board), middle)
+                    board.undo_move()
+                    self.assertEqual(self.get_full_state(board), before)
+                self.assertEqual(board.journal_depth, depth)
+
+                # 继续游戏：方块落到最低的位置，放不下时换新游戏板
+                geometry = rng.choice(geometries)
+                drops = [(y, x) for x in range(-2, board.width)
+                         for y in [self.drop_geometry(board, geometry, x)] if y is not None]
+                if not drops:
+                    board = backend(10, 20)
+                    continue
+                y, x = max(drops)
+                self.assertIsNotNone(board.apply_move(geometry, x, y))
+            self.assertGreater(board.journal_depth, 0)
+        self.assertGreater(lines, 30)
+
+        board = Board(10, 20)
+        self.assertIsNone(board.apply_move(PIECE_GEOMETRY['I'][0], 9, 0))
+        self.assertEqual(board.journal_depth, 0)
+
+
+    def test_zobrist_hash(self):
+        """测试Zobrist哈希的增量维护"""
+        rng = random.Random(25)
+        geometries = [geometry for items in PIECE_GEOMETRY.values() for geometry in items]
+        seen = {}
+        lines = 0
+        for backend, width, height in ((Board, 10, 20), (BitBoard, 10, 20), (Board, 6, 100)):
+            board = backend(width, height)
+            self.assertEqual(board.zobrist_hash, 0)
+            for _ in range(600):
+                geometry = rng.choice(geometries)
+                drops = [(y, x) for x in range(-2, width)
+                         for y in [self.drop_geometry(board, geometry, x)] if y is not None]
+                if not drops:
+                    board = backend(width, height)
+                    continue
+                y, x = rng.choice(sorted(drops)[-3:])
+                lines += board.apply_move(geometry, x, y)
+
+                rows = tuple(sum(1 << col for col, cell in enumerate(row) if cell is not None)
+                             for row in board.grid)
+                self.assertEqual(board.zobrist_hash, hash_rows(rows, width))
+                # 不同的占用情况哈希不同
+                self.assertEqual(seen.setdefault((width, board.zobrist_hash), rows), rows)
+
+            clone = board.copy()
+            clone.refresh()
+            self.assertEqual(clone.zobrist_hash, board.zobrist_hash)
+        self.assertGreater(lines, 20)
+
+        # 颜色不影响哈希
+        board = Board(10, 20)
+        board.place_piece(self.piece_t, 3, 17)
+        other = BitBoard(10, 20)
+        other.grid[17][4] = other.grid[18][3] = other.grid[18][4] = other.grid[18][5] = (1, 2, 3)
+        other.refresh()
+        self.assertEqual(board.zobrist_hash, other.zobrist_hash)
+        self.assertNotEqual(board.zobrist_hash, Board(10, 20).zobrist_hash)
 
 if __name__ == '__main__':
     unittest.main()
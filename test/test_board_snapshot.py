@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+游戏板快照的单元测试
+"""
+
+import unittest
+import multiprocessing
+import mmap
+import random
+import tempfile
+import sys
+import os
+
+# 添加src目录到Python路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from core.board import Board
+from core.bit_board import BitBoard
+from core.board_snapshot import (BoardSnapshot, PIECE_TYPES, UNKNOWN_CELL, decode_grid,
+                                 get_snapshot_size)
+from core.game_state import GameState
+from core.headless import HeadlessGame
+from core.piece import Piece
+from utils.constants import GRAY, PIECE_COLORS
+
+
+def make_filled_board(piece_type: str, rows: int) -> Board:
+    """底部rows行除最后一列外填满同一种颜色的游戏板"""
+    board = Board(10, 20)
+    for row in range(20 - rows, 20):
+        for col in range(9):
+            board.grid[row][col] = PIECE_COLORS[piece_type]
+    board.refresh()
+    return board
+
+
+def encode_cells(piece_type: str, rows: int) -> bytearray:
+    """make_filled_board对应的快照格子"""
+    snapshot = BoardSnapshot(bytearray(get_snapshot_size(10, 20)), 10, 20)
+    snapshot.write(make_filled_board(piece_type, rows), GameState())
+    return bytearray(snapshot.cells)
+
+
+def write_alternating(name: str, writes: int, done):
+    """子进程：交替写入两种游戏板，分数记录格子的类型编号"""
+    snapshot = BoardSnapshot.attach(name)
+    boards = [make_filled_board("I", 3), make_filled_board("Z", 15)]
+    state = GameState()
+    for index in range(writes):
+        state.score = index % 2 + 1
+        snapshot.write(boards[index % 2], state)
+    done.set()
+    snapshot.close()
+
+
+class TestBoardSnapshot(unittest.TestCase):
+    """游戏板快照的单元测试"""
+    # 测试思路说明：
+    # 1. 写入后读出的格子还原成的网格与Board.grid一致，游戏状态字段一致，两种游戏板后端都支持。
+    # 2. 游戏板版本未变化时只写游戏状态。
+    # 3. 读取者可以通过共享内存名称或同一个mmap文件打开快照，尺寸从头部读取。
+    # 4. 另一个进程高频写入时，读取者不会读到半新半旧的数据。
+
+    def test_round_trip(self):
+        """测试写入和读取"""
+        game = HeadlessGame(tick_ms=50)
+        game.reset(seed=6)
+        rng = random.Random(6)
+        snapshot = BoardSnapshot(bytearray(get_snapshot_size(10, 20)), 10, 20)
+        cells = bytearray(200)
+        for _ in range(400):
+            game.step(rng.choice(HeadlessGame.ACTIONS))
+            if game.is_done():
+                game.reset(seed=rng.randrange(100))
+            engine = game.engine
+            state = engine.game_state
+            snapshot.write(engine.board, state)
+
+            snapshot_state, result = snapshot.read(cells)
+            self.assertIs(result, cells)
+            self.assertEqual(decode_grid(cells, 10, 20), engine.board.grid)
+            self.assertEqual(snapshot_state.board_version, engine.board.version)
+            self.assertEqual((snapshot_state.score, snapshot_state.level, snapshot_state.lines_cleared),
+                             (state.score, state.level, state.lines_cleared))
+            self.assertEqual((snapshot_state.piece, snapshot_state.rotation),
+                             (state.current_piece.type, state.current_piece.rotation))
+            self.assertEqual((snapshot_state.x, snapshot_state.y), state.get_piece_position())
+            self.assertEqual(snapshot_state.next_piece, state.next_piece.type)
+            self.assertEqual(snapshot_state.game_over, state.game_over)
+            self.assertEqual(snapshot_state.game_mode, "classic")
+        self.assertEqual(snapshot.read_state().writes, 400)
+
+        board = BitBoard(10, 20)
+        board.grid[19][0] = (1, 2, 3)
+        board.grid[19][1] = PIECE_COLORS["T"]
+        board.refresh()
+        snapshot.write(board, GameState())
+        state, cells = snapshot.read()
+        self.assertEqual(cells[190:192], bytes([UNKNOWN_CELL, PIECE_TYPES.index("T") + 1]))
+        self.assertEqual(decode_grid(cells, 10, 20)[19][:2], [GRAY, PIECE_COLORS["T"]])
+        self.assertIsNone(state.piece)
+
+    def test_unchanged_board_skips_cells(self):
+        """测试游戏板版本未变化时不重写格子"""
+        snapshot = BoardSnapshot(bytearray(get_snapshot_size(10, 20)), 10, 20)
+        board = make_filled_board("O", 2)
+        state = GameState()
+        snapshot.write(board, state)
+        snapshot.cells[0] = 7
+        state.score = 50
+        snapshot.write(board, state)
+        self.assertEqual(snapshot.cells[0], 7)
+        self.assertEqual(snapshot.read_state().score, 50)
+
+        board.place_piece(Piece("I"), 0, 0)
+        snapshot.write(board, state)
+        self.assertEqual(snapshot.cells[0], PIECE_TYPES.index("I") + 1)
+
+    def test_attach_and_mmap(self):
+        """测试通过共享内存名称和mmap文件打开快照"""
+        writer = BoardSnapshot.create(12, 22)
+        try:
+            board = Board(12, 22)
+            board.grid[21][3] = PIECE_COLORS["L"]
+            board.refresh()
+            writer.write(board, GameState())
+
+            reader = BoardSnapshot.attach(writer.name)
+            self.assertEqual((reader.width, reader.height), (12, 22))
+            _, cells = reader.read()
+            self.assertEqual(decode_grid(cells, 12, 22), board.grid)
+            reader.close()
+        finally:
+            writer.close()
+            writer.unlink()
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "board.snap")
+            with open(path, "wb") as f:
+                f.write(bytes(get_snapshot_size(10, 20)))
+            with open(path, "r+b") as f, mmap.mmap(f.fileno(), 0) as buffer:
+                writer = BoardSnapshot(buffer, 10, 20)
+                writer.write(make_filled_board("S", 1), GameState())
+                writer.close()
+            with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                reader = BoardSnapshot(buffer)
+                _, cells = reader.read()
+                self.assertEqual(decode_grid(cells, 10, 20), make_filled_board("S", 1).grid)
+                reader.close()
+
+        with self.assertRaises(ValueError):
+            BoardSnapshot(bytearray(get_snapshot_size(10, 20)))
+        with self.assertRaises(ValueError):
+            BoardSnapshot(bytearray(100), 10, 20)
+
+    def test_no_torn_reads(self):
+        """测试另一个进程写入时读取的数据完整"""
+        snapshot = BoardSnapshot.create(10, 20)
+        try:
+            done = multiprocessing.Event()
+            process = multiprocessing.Process(target=write_alternating, args=(snapshot.name, 3000, done))
+            process.start()
+            expected = {1: encode_cells("I", 3), 2: encode_cells("Z", 15)}
+            cells = bytearray(200)
+            reads = 0
+            while process.is_alive() and not done.is_set():
+                state, _ = snapshot.read(cells)
+                if state.writes:
+                    self.assertEqual(cells, expected[state.score])
+                    reads += 1
+            process.join(timeout=10)
+            self.assertEqual(process.exitcode, 0)
+            state, _ = snapshot.read(cells)
+            self.assertEqual(state.writes, 3000)
+            self.assertEqual(cells, expected[state.score])
+        finally:
+            snapshot.close()
+            snapshot.unlink()
+
+
+if __name__ == '__main__':
+    unittest.main()
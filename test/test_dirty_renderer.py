@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+脏矩形渲染器的单元测试
+"""
+
+import unittest
+from unittest.mock import patch
+import random
+import sys
+import os
+
+# 使用无窗口的视频驱动
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+# 添加src目录到Python路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import pygame
+from config.game_config import GameConfig
+from core.headless import HeadlessGame
+from core.piece import Piece
+from ui.renderer import Renderer, create_renderer
+from ui.dirty_renderer import DirtyRectRenderer
+from utils.font_utils import FontManager
+
+
+class TestDirtyRectRenderer(unittest.TestCase):
+    """脏矩形渲染器的单元测试"""
+    # 测试思路说明：
+    # 1. 每一帧的画面与全屏重绘的Renderer逐像素一致。
+    # 2. 与上一帧相比发生变化的像素都在返回的区域内；画面不变时不返回任何区域。
+    # 3. 消行、棋盘上方的方块格子、状态文字的出现和消失都能正确擦除。
+    # 4. create_renderer按RENDER_MODE创建渲染器。
+
+    @classmethod
+    def setUpClass(cls):
+        pygame.init()
+        # 不读写用户目录下的字体索引文件
+        cls.font_index_patch = patch.object(FontManager, "INDEX_PATH", None)
+        cls.font_index_patch.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.font_index_patch.stop()
+
+    def setUp(self):
+        """测试前的设置"""
+        self.config = GameConfig()
+        size = (self.config.SCREEN_WIDTH, self.config.SCREEN_HEIGHT)
+        self.full = Renderer(pygame.Surface(size), self.config)
+        self.dirty = DirtyRectRenderer(pygame.Surface(size), self.config)
+        self.game = HeadlessGame(tick_ms=50)
+        self.game.reset(seed=7)
+
+    def pixels(self, renderer):
+        """获取渲染器画面的像素数据"""
+        return pygame.image.tobytes(renderer.screen, "RGB")
+
+    def render_and_compare(self):
+        """两个渲染器各渲染一帧，检查画面一致且变化都在返回的区域内，返回区域列表"""
+        before = self.dirty.screen.copy()
+        engine = self.game.engine
+        self.full.render_frame(engine.board, engine.game_state)
+        rects = self.dirty.render_frame(engine.board, engine.game_state)
+        self.assertEqual(self.pixels(self.dirty), self.pixels(self.full))
+
+        # 把返回区域以外的像素还原为上一帧，画面应保持不变
+        masked = before.copy()
+        for rect in rects:
+            masked.blit(self.dirty.screen, rect, rect)
+        self.assertEqual(pygame.image.tobytes(masked, "RGB"), self.pixels(self.dirty))
+        return rects
+
+    def test_matches_full_render(self):
+        """测试随机对局中每帧都与全屏重绘一致"""
+        rng = random.Random(1)
+        self.render_and_compare()
+        for _ in range(300):
+            self.game.step(rng.choice(HeadlessGame.ACTIONS))
+            self.render_and_compare()
+            if self.game.is_done():
+                break
+
+    def test_unchanged_frame(self):
+        """测试画面不变时不返回区域"""
+        first = self.render_and_compare()
+        self.assertEqual(first, [self.dirty.screen.get_rect()])
+        self.assertEqual(self.render_and_compare(), [])
+
+        # 移动一格只更新当前方块和底部阴影预览所在的行
+        self.game.engine.handle_piece_movement(1, 0)
+        rects = self.render_and_compare()
+        piece = self.game.engine.game_state.current_piece
+        self.assertEqual(len(rects), 2 * piece.get_height())
+
+        # 关闭阴影预览后只更新当前方块所在的行
+        self.dirty.config.SHOW_GHOST_PIECE = False
+        self.render_and_compare()
+        self.game.engine.handle_piece_movement(-1, 0)
+        self.assertEqual(len(self.render_and_compare()), piece.get_height())
+
+    def test_overflow_and_status(self):
+        """测试棋盘上方的方块和状态文字"""
+        state = self.game.engine.game_state
+        self.render_and_compare()
+
+        state.current_piece = Piece('I')
+        state.current_piece.rotate()
+        state.set_piece_position(4, -2)
+        self.render_and_compare()
+        state.set_piece_position(0, -1)
+        self.render_and_compare()
+
+        state.paused = True
+        self.render_and_compare()
+        state.paused = False
+        state.game_over = True
+        self.render_and_compare()
+        self.game.reset(seed=8)
+        self.render_and_compare()
+
+    def test_line_clear(self):
+        """测试消行后整块区域下移"""
+        engine = self.game.engine
+        for row in range(16, 20):
+            for col in range(9):
+                engine.board.grid[row][col] = (0, 255, 0)
+        self.render_and_compare()
+
+        piece = Piece('I')
+        piece.rotate()
+        engine.board.place_piece(piece, 9, 16)
+        self.render_and_compare()
+        self.assertEqual(engine.board.clear_lines(), 4)
+        self.render_and_compare()
+
+    def test_invalidate(self):
+        """测试丢弃记录后全屏重绘"""
+        self.render_and_compare()
+        self.dirty.screen.fill((255, 255, 255))
+        self.dirty.invalidate()
+        self.assertEqual(self.render_and_compare(), [self.dirty.screen.get_rect()])
+
+    def test_create_renderer(self):
+        """测试按配置创建渲染器"""
+        screen = pygame.Surface((10, 10))
+        self.assertIs(type(create_renderer(screen, self.config)), Renderer)
+        self.config.RENDER_MODE = "dirty"
+        self.assertIsInstance(create_renderer(screen, self.config), DirtyRectRenderer)
+        self.config.RENDER_MODE = "unknown"
+        with self.assertRaises(ValueError):
+            create_renderer(screen, self.config)
+
+
+if __name__ == '__main__':
+    unittest.main()
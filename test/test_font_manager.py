@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+字体管理器缓存的单元测试
+"""
+
+import unittest
+from unittest.mock import patch
+import json
+import tempfile
+import threading
+import sys
+import os
+
+# 使用无窗口的视频驱动
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+# 添加src目录到Python路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import pygame
+from config.game_config import GameConfig
+from ui.renderer import Renderer
+from utils.font_utils import FontManager
+
+
+class TestFontManager(unittest.TestCase):
+    """字体管理器缓存的单元测试"""
+    # 测试思路说明：
+    # 1. 相同(字号, 粗体)返回同一个字体对象，字体来源在进程内只查找一次。
+    # 2. 查找结果写入索引文件，下次启动直接读取；版本或平台不符、字体文件不存在的索引被忽略。
+    # 3. 后台查找完成前返回默认字体且不缓存，完成后返回缓存的字体；
+    #    查找期间创建的渲染器等待查找完成，保存的是缓存的字体。
+    # 4. pygame.quit()之后丢弃已失效的字体对象。
+    # 5. 后台线程只读取索引和查找候选字体，所有字体对象都在调用get_font的线程中创建。
+
+    @classmethod
+    def setUpClass(cls):
+        pygame.init()
+
+    def setUp(self):
+        """测试前的设置：使用临时索引文件"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.index_path = os.path.join(self.temp_dir.name, "font_index.json")
+        self.index_patch = patch.object(FontManager, "INDEX_PATH", self.index_path)
+        self.index_patch.start()
+        FontManager.clear_cache()
+
+    def tearDown(self):
+        """测试后的清理"""
+        FontManager.clear_cache()
+        self.index_patch.stop()
+        self.temp_dir.cleanup()
+
+    def test_font_memoized(self):
+        """测试字体对象按(字号, 粗体)复用"""
+        font = FontManager.get_font(36)
+        self.assertIs(FontManager.get_font(36), font)
+        self.assertIs(FontManager.get_chinese_font(36), font)
+        self.assertIsNot(FontManager.get_font(24), font)
+        self.assertIs(FontManager.get_font(48, bold=True), FontManager.get_font(48, bold=True))
+        self.assertEqual(len(FontManager._fonts), 3)
+
+        # 字体来源只查找一次
+        with patch.object(FontManager, "_find_candidates") as find_sources:
+            FontManager.get_font(20)
+            find_sources.assert_not_called()
+
+    def test_index_written_and_reused(self):
+        """测试索引文件的写入和读取"""
+        FontManager.get_font(36)
+        with open(self.index_path, encoding='utf-8') as f:
+            data = json.load(f)
+        self.assertEqual(data["version"], FontManager.INDEX_VERSION)
+        self.assertEqual(data["platform"], sys.platform)
+        sources = FontManager._sources
+
+        # 新进程（清空进程内缓存）直接使用索引，不重新查找
+        FontManager.clear_cache()
+        with patch.object(FontManager, "_find_candidates") as find_sources:
+            FontManager.get_font(36)
+            find_sources.assert_not_called()
+        self.assertEqual(FontManager._sources, sources)
+
+    def test_invalid_index_ignored(self):
+        """测试失效的索引被忽略并重新查找"""
+        invalid_indexes = [
+            "not json",
+            json.dumps({"version": 0, "platform": sys.platform,
+                        "regular": ["default", None], "bold": None}),
+            json.dumps({"version": FontManager.INDEX_VERSION, "platform": "other",
+                        "regular": ["default", None], "bold": None}),
+            json.dumps({"version": FontManager.INDEX_VERSION, "platform": sys.platform,
+                        "regular": ["file", os.path.join(self.temp_dir.name, "missing.ttf")],
+                        "bold": None}),
+        ]
+        for content in invalid_indexes:
+            with open(self.index_path, 'w', encoding='utf-8') as f:
+                f.write(content)
+            FontManager.clear_cache()
+            self.assertIsNone(FontManager._load_index())
+            FontManager.get_font(24)
+            # 重新查找后覆盖为有效的索引
+            self.assertEqual(FontManager._load_index(), FontManager._sources)
+
+    def test_index_disabled(self):
+        """测试不使用索引文件"""
+        with patch.object(FontManager, "INDEX_PATH", None):
+            FontManager.get_font(24)
+        self.assertFalse(os.path.exists(self.index_path))
+
+    def test_background_discovery(self):
+        """测试后台查找字体"""
+        started = threading.Event()
+        release = threading.Event()
+        find_sources = FontManager._find_candidates
+
+        def slow_find_candidates():
+            started.set()
+            release.wait(5)
+            return find_sources()
+
+        with patch.object(FontManager, "_find_candidates", side_effect=slow_find_candidates):
+            FontManager.start_discovery()
+            self.assertTrue(started.wait(5))
+            # 查找完成前返回默认字体，不缓存
+            font = FontManager.get_font(36)
+            self.assertIsInstance(font, pygame.font.Font)
+            self.assertEqual(FontManager._fonts, {})
+
+            release.set()
+            FontManager.wait_for_discovery()
+
+        # 没有索引时后台只找到候选字体，由第一次get_font尝试加载
+        self.assertIsNotNone(FontManager._candidates)
+        self.assertIs(FontManager.get_font(36), FontManager.get_font(36))
+        self.assertIsNotNone(FontManager._sources)
+        self.assertIsNone(FontManager._candidates)
+        # 已经查找过时不再启动线程
+        FontManager.start_discovery()
+        self.assertIsNone(FontManager._discovery_thread)
+
+    def test_renderer_waits_for_discovery(self):
+        """测试查找期间创建的渲染器使用查找到的字体"""
+        release = threading.Event()
+        find_sources = FontManager._find_candidates
+
+        def slow_find_candidates():
+            release.wait(5)
+            return find_sources()
+
+        with patch.object(FontManager, "_find_candidates", side_effect=slow_find_candidates):
+            FontManager.start_discovery()
+            threading.Timer(0.05, release.set).start()
+            config = GameConfig()
+            renderer = Renderer(pygame.Surface((config.SCREEN_WIDTH, config.SCREEN_HEIGHT)), config)
+
+        self.assertIsNone(FontManager._discovery_thread)
+        self.assertIs(renderer.font, FontManager.get_font(36))
+        self.assertIs(renderer.small_font, FontManager.get_font(24))
+
+    def test_fonts_created_on_calling_thread(self):
+        """测试后台查找不创建字体对象"""
+        threads = []
+        font_class = pygame.font.Font
+        sys_font = pygame.font.SysFont
+
+        def record_font(*args):
+            threads.append(threading.current_thread())
+            return font_class(*args)
+
+        def record_sys_font(*args):
+            threads.append(threading.current_thread())
+            return sys_font(*args)
+
+        with patch.object(pygame.font, "Font", side_effect=record_font), \
+                patch.object(pygame.font, "SysFont", side_effect=record_sys_font):
+            # 没有索引时查找候选字体，有索引时只读取索引
+            for _ in range(2):
+                FontManager.start_discovery()
+                FontManager.wait_for_discovery()
+                FontManager.get_font(36)
+                FontManager.get_font(24, bold=True)
+                FontManager._sources = None
+                FontManager._fonts = {}
+
+        self.assertTrue(threads)
+        self.assertEqual(set(threads), {threading.current_thread()})
+
+    def test_forget_fonts_on_quit(self):
+        """测试pygame.quit()时丢弃字体对象"""
+        FontManager.get_font(36)
+        sources = FontManager._sources
+        FontManager._forget_fonts()
+        self.assertEqual(FontManager._fonts, {})
+        self.assertEqual(FontManager._sources, sources)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+固定时间步长游戏循环的单元测试
+"""
+
+import unittest
+from unittest.mock import patch
+import sys
+import os
+
+# 使用无窗口的视频驱动
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+# 添加src目录到Python路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import pygame
+from core.game_loop import FixedTimestep
+from core.headless import HeadlessGame
+from utils.font_utils import FontManager
+from main import TetrisGame
+from ui.input_handler import GameEvent
+
+
+class TestGameLoop(unittest.TestCase):
+    """固定时间步长游戏循环的单元测试"""
+    # 测试思路说明：
+    # 1. 逻辑tick数只取决于累计经过的时间，与帧的切分方式无关；不足一个tick的时间留在累加器中作为插值比例。
+    # 2. 慢帧执行多个tick追赶并计入掉帧；超过单帧上限的时间被丢弃并计数。
+    # 3. TetrisGame的逻辑tick推进游戏时钟，重力与相同tick数的无界面游戏一致。
+    # 4. 插值位置在上一个和当前tick的方块位置之间，换方块或旋转后不插值；
+    #    两个tick之间的玩家操作立即生效，只有逻辑tick中的移动被插值。
+
+    @classmethod
+    def setUpClass(cls):
+        pygame.init()
+        # 不读写用户目录下的字体索引文件
+        cls.font_index_patch = patch.object(FontManager, "INDEX_PATH", None)
+        cls.font_index_patch.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.font_index_patch.stop()
+
+    def test_ticks_independent_of_frame_rate(self):
+        """测试tick数与帧率无关"""
+        results = []
+        for frame_ms in (5, 16, 40, 100):
+            loop = FixedTimestep(20, max_frame_ms=1000, max_ticks_per_frame=100)
+            ticks = sum(loop.advance(frame_ms / 1000.0) for _ in range(2000 // frame_ms))
+            results.append(ticks)
+        self.assertEqual(results, [100, 100, 100, 100])
+
+        loop = FixedTimestep(20)
+        self.assertEqual(loop.advance(0.025), 1)
+        self.assertAlmostEqual(loop.alpha, 0.25)
+        self.assertEqual(loop.advance(0.010), 0)
+        self.assertAlmostEqual(loop.alpha, 0.75)
+        self.assertEqual(loop.advance(0.010), 1)
+        self.assertAlmostEqual(loop.alpha, 0.25)
+
+    def test_catch_up_and_dropped_frames(self):
+        """测试追赶tick和掉帧统计"""
+        loop = FixedTimestep(10, frame_ms=10, max_frame_ms=1000, max_ticks_per_frame=5)
+        self.assertEqual(loop.advance(0.010), 1)
+        self.assertEqual(loop.advance(0.0305), 3)
+        self.assertEqual(loop.get_stats(), {"frames": 2, "ticks": 4, "catch_up_ticks": 2,
+                                            "skipped_ticks": 0, "dropped_frames": 2})
+
+        # 超过单帧最多tick数，多出的tick被丢弃
+        self.assertEqual(loop.advance(0.080), 5)
+        self.assertEqual(loop.skipped_ticks, 3)
+        self.assertLess(loop.alpha, 1.0)
+
+        # 超过单帧最长时间
+        loop = FixedTimestep(10, max_frame_ms=50, max_ticks_per_frame=10)
+        self.assertEqual(loop.advance(0.200), 5)
+        self.assertEqual(loop.skipped_ticks, 15)
+        loop.reset_stats()
+        self.assertEqual(loop.get_stats()["frames"], 0)
+
+    def test_game_ticks_match_headless(self):
+        """测试TetrisGame的逻辑tick与无界面游戏一致"""
+        game = TetrisGame()
+        headless = HeadlessGame(tick_ms=game.loop.tick_ms)
+        headless.reset(seed=9)
+        game.game_engine.reset_game(seed=9)
+
+        for _ in range(600):
+            game.update()
+            headless.step()
+        self.assertEqual(game.tick_clock.ticks, 600)
+        self.assertEqual(game.game_engine.get_board().grid, headless.engine.board.grid)
+        self.assertEqual(game.game_engine.get_game_state().get_piece_position(),
+                         headless.engine.game_state.get_piece_position())
+
+    def test_render_position_interpolation(self):
+        """测试方块位置插值"""
+        game = TetrisGame()
+        engine = game.game_engine
+        game.update()
+        x, y = engine.get_game_state().get_piece_position()
+        self.assertEqual(game.get_render_position(0.5), (x, y))
+
+        game.previous_piece_state = game.get_piece_state()
+        engine.handle_piece_movement(0, 1)
+        self.assertEqual(game.get_render_position(0.0), (x, y))
+        self.assertEqual(game.get_render_position(0.5), (x, y + 0.5))
+        game.render(0.5)
+
+        # 旋转后直接使用当前位置（O方块旋转后状态不变）
+        piece = engine.get_game_state().current_piece
+        rotation = piece.rotation
+        if engine.handle_piece_rotation() and piece.rotation != rotation:
+            self.assertEqual(game.get_render_position(0.5), engine.get_game_state().get_piece_position())
+
+    def test_input_not_interpolated(self):
+        """测试两个tick之间的玩家操作不被插值"""
+        game = TetrisGame()
+        engine = game.game_engine
+        game.update()
+        x, y = engine.get_game_state().get_piece_position()
+
+        def press(event_type):
+            with patch.object(game.input_handler, "handle_events", return_value=[GameEvent(event_type)]):
+                game.handle_input()
+
+        # 没有逻辑tick的帧中左移：直接显示在新位置
+        press("move_left")
+        self.assertEqual(game.get_render_position(0.0), (x - 1, y))
+        self.assertEqual(game.get_render_position(0.5), (x - 1, y))
+
+        # 逻辑tick中下落一格后右移：只插值下落
+        game.previous_piece_state = game.get_piece_state()
+        engine.handle_piece_movement(0, 1)
+        press("move_right")
+        self.assertEqual(game.get_render_position(0.5), (x, y + 0.5))
+
+        # 硬降换了方块，不插值
+        press("hard_drop")
+        self.assertEqual(game.get_render_position(0.5), engine.get_game_state().get_piece_position())
+
+
+if __name__ == '__main__':
+    unittest.main()
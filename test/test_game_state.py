@@ -295,6 +295,30 @@ class TestGameState(unittest.TestCase):
         self.assertIsNone(self.game_state.current_piece)
         self.assertEqual(self.game_state.piece_position, (0, 0))
 
+    
+    def test_copy(self):
+        """测试复制游戏状态"""
+        self.game_state.spawn_piece('T')
+        self.game_state.next_piece = self.game_state.current_piece.copy()
+        self.game_state.update_score(2)
+        self.game_state.set_piece_position(4, 6)
+        
+        clone = self.game_state.copy()
+        self.assertEqual(clone.score, self.game_state.score)
+        self.assertEqual(clone.get_piece_position(), (4, 6))
+        self.assertIsNot(clone.current_piece, self.game_state.current_piece)
+        self.assertIsNot(clone.next_piece, self.game_state.next_piece)
+        
+        # 修改复制品不影响原状态
+        clone.current_piece.rotate()
+        clone.update_score(4)
+        clone.set_piece_position(0, 0)
+        self.assertEqual(self.game_state.current_piece.rotation, 0)
+        self.assertEqual(self.game_state.lines_cleared, 2)
+        self.assertEqual(self.game_state.get_piece_position(), (4, 6))
+        
+        self.assertIsNone(GameState().copy().current_piece)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+硬降和阴影预览的单元测试
+"""
+
+import unittest
+from unittest.mock import patch
+import random
+import tempfile
+import sys
+import os
+
+# 使用无窗口的视频驱动
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+# 添加src目录到Python路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import pygame
+from config.game_config import GameConfig
+from core.board import Board
+from core.bit_board import BitBoard
+from core.headless import HeadlessGame
+from core.piece import Piece
+from core.replay import ReplayHeader, ReplayRecorder, replay
+from ui.input_handler import InputHandler
+from ui.renderer import Renderer, get_ghost_color
+from utils.constants import PIECE_SHAPES
+from utils.font_utils import FontManager
+
+
+class TestHardDrop(unittest.TestCase):
+    """硬降和阴影预览的单元测试"""
+    # 测试思路说明：
+    # 1. drop_distance与逐行检查的结果一致，包括方块位于悬空块下方的情况。
+    # 2. 硬降把方块放在阴影预览的位置并生成下一个方块，暂停时不生效。
+    # 3. 无界面游戏和回放支持hard_drop动作，InputHandler把回车键转换为hard_drop事件。
+    # 4. Renderer在落地位置绘制阴影预览，方块已着地或关闭配置时不绘制。
+
+    @classmethod
+    def setUpClass(cls):
+        pygame.init()
+        # 不读写用户目录下的字体索引文件
+        cls.font_index_patch = patch.object(FontManager, "INDEX_PATH", None)
+        cls.font_index_patch.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.font_index_patch.stop()
+
+    def scan_distance(self, board, piece, x, y):
+        """逐行检查方块能下落的行数"""
+        distance = 0
+        while board.is_valid_position(piece, x, y + distance + 1):
+            distance += 1
+        return distance
+
+    def test_drop_distance_matches_scan(self):
+        """测试随机游戏板上的下落距离"""
+        rng = random.Random(20)
+        piece_types = list(PIECE_SHAPES.keys())
+        for backend in (Board, BitBoard):
+            board = backend(10, 20)
+            checked = 0
+            for _ in range(300):
+                # 随机位置放置方块，形成悬空块和空洞
+                piece = Piece(rng.choice(piece_types))
+                board.place_piece(piece, rng.randrange(-1, 10), rng.randrange(4, 20))
+                board.clear_lines()
+
+                probe = Piece(rng.choice(piece_types))
+                for _ in range(rng.randrange(4)):
+                    probe.rotate()
+                for x in range(-2, 10):
+                    for y in range(-2, 20):
+                        if board.is_valid_position(probe, x, y):
+                            self.assertEqual(board.drop_distance(probe, x, y),
+                                             self.scan_distance(board, probe, x, y))
+                            checked += 1
+            self.assertGreater(checked, 1000)
+
+    def test_drop_distance_under_overhang(self):
+        """测试方块位于悬空块下方时的下落距离"""
+        board = Board(10, 20)
+        bar = Piece('I')
+        board.place_piece(bar, 0, 10)
+        piece = Piece('O')
+        self.assertEqual(board.drop_distance(piece, 1, 11), 7)
+        self.assertEqual(board.drop_distance(piece, 1, 0), 8)
+        self.assertEqual(board.drop_distance(piece, 4, 0), 18)
+
+    def test_hard_drop(self):
+        """测试硬降放置方块"""
+        game = HeadlessGame(tick_ms=50)
+        game.reset(seed=3)
+        engine = game.engine
+        state = engine.game_state
+        piece = state.current_piece
+        ghost_x, ghost_y = engine.get_ghost_position()
+        self.assertEqual(ghost_x, state.get_piece_position()[0])
+        self.assertEqual(ghost_y + piece.get_height(), 20)
+
+        self.assertTrue(engine.hard_drop())
+        self.assertIsNot(state.current_piece, piece)
+        for col, row in piece.geometry.cells:
+            self.assertEqual(engine.board.grid[ghost_y + row][ghost_x + col], piece.color)
+
+        state.paused = True
+        piece = state.current_piece
+        self.assertFalse(engine.hard_drop())
+        self.assertIs(state.current_piece, piece)
+
+    def test_hard_drop_action_and_replay(self):
+        """测试无界面游戏的hard_drop动作可以录制和重放"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "game.trpl")
+            rng = random.Random(5)
+            game = HeadlessGame(tick_ms=20)
+            game.reset(seed=77)
+            engine = game.engine
+            recorder = ReplayRecorder(path, ReplayHeader(engine.seed, "classic", 1, "uniform"))
+            engine.recorder = recorder
+
+            while not game.is_done():
+                action = rng.choice(HeadlessGame.ACTIONS)
+                if action != "none":
+                    recorder.record(action)
+                game.step(action)
+                recorder.next_frame()
+            recorder.close(engine.game_state)
+
+            result = replay(path)
+            self.assertTrue(result.matches)
+            self.assertEqual(result.board.get_grid(), engine.board.get_grid())
+
+    def test_input_handler_hard_drop_key(self):
+        """测试回车键产生hard_drop事件"""
+        pygame.display.set_mode((1, 1))
+        handler = InputHandler(GameConfig())
+        pygame.event.clear()
+        pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_RETURN))
+        events = [event.event_type for event in handler.handle_events()]
+        self.assertEqual(events, ["hard_drop"])
+
+    def test_render_ghost(self):
+        """测试阴影预览的绘制"""
+        config = GameConfig()
+        # 默认配置下游戏板底部超出屏幕
+        config.CELL_SIZE = 20
+        renderer = Renderer(pygame.Surface((config.SCREEN_WIDTH, config.SCREEN_HEIGHT)), config)
+        game = HeadlessGame(tick_ms=50)
+        game.reset(seed=3)
+        engine = game.engine
+        piece = engine.game_state.current_piece
+        ghost_x, ghost_y = engine.get_ghost_position()
+
+        cells = renderer.get_ghost_cells(engine.board, engine.game_state)
+        self.assertEqual(sorted(cells), sorted((ghost_x + col, ghost_y + row)
+                                               for col, row in piece.geometry.cells))
+
+        renderer.render_frame(engine.board, engine.game_state)
+        col, row = cells[0]
+        center = (config.BOARD_X + col * config.CELL_SIZE + config.CELL_SIZE // 2,
+                  config.BOARD_Y + row * config.CELL_SIZE + config.CELL_SIZE // 2)
+        self.assertEqual(tuple(renderer.screen.get_at(center))[:3], get_ghost_color(piece.color))
+
+        # 方块着地后没有阴影
+        engine.game_state.set_piece_position(ghost_x, ghost_y)
+        self.assertEqual(renderer.get_ghost_cells(engine.board, engine.game_state), [])
+
+        engine.game_state.set_piece_position(ghost_x, 0)
+        config.SHOW_GHOST_PIECE = False
+        self.assertEqual(renderer.get_ghost_cells(engine.board, engine.game_state), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+HeadlessGame和时钟注入的单元测试
+"""
+
+import unittest
+import subprocess
+import sys
+import os
+
+# 添加src目录到Python路径
+SRC_DIR = os.path.join(os.path.dirname(__file__), '..', 'src')
+sys.path.insert(0, SRC_DIR)
+
+from core.clock import TickClock
+from core.headless import HeadlessGame
+from level.level_manager import LevelManager
+
+
+class TestHeadlessGame(unittest.TestCase):
+    """HeadlessGame的单元测试"""
+    # 测试思路说明：
+    # 1. TickClock只随tick推进，与系统时间无关。
+    # 2. 重力由模拟tick驱动：drop_delay对应的tick数过后方块下落一格。
+    # 3. 关卡时间限制由模拟tick驱动，超时后关卡失败。
+    # 4. 无界面模式不导入pygame。
+    # 5. 关卡速度倍数只在level_speed=True时生效，默认按正常重力运行。
+
+    def setUp(self):
+        """测试前的设置"""
+        self.game = HeadlessGame(tick_ms=100)
+        self.game.reset()
+
+    def test_tick_clock(self):
+        """测试模拟时钟"""
+        clock = TickClock(tick_ms=50)
+        self.assertEqual(clock.now(), 0.0)
+        clock.advance(3)
+        self.assertAlmostEqual(clock.now(), 0.15)
+        clock.reset()
+        self.assertEqual(clock.now(), 0.0)
+
+    def test_gravity_driven_by_ticks(self):
+        """测试重力由tick驱动"""
+        _, start_y = self.game.engine.game_state.get_piece_position()
+
+        # drop_delay为1000ms，tick为100ms，第11个tick才超过下落间隔
+        for _ in range(10):
+            self.game.step()
+        self.assertEqual(self.game.engine.game_state.get_piece_position()[1], start_y)
+
+        self.game.step()
+        self.assertEqual(self.game.engine.game_state.get_piece_position()[1], start_y + 1)
+
+    def test_step_actions(self):
+        """测试动作执行"""
+        x, _ = self.game.engine.game_state.get_piece_position()
+        self.game.step("move_left")
+        self.assertEqual(self.game.engine.game_state.get_piece_position()[0], x - 1)
+        self.game.step("move_right")
+        self.assertEqual(self.game.engine.game_state.get_piece_position()[0], x)
+
+        with self.assertRaises(ValueError):
+            self.game.step("hard_jump")
+
+    def test_run_until_game_over(self):
+        """测试不操作时游戏最终结束"""
+        game = HeadlessGame(tick_ms=1000)
+        game.reset()
+        ticks = game.run(max_ticks=100000)
+        self.assertTrue(game.engine.game_state.game_over)
+        self.assertLess(ticks, 100000)
+
+    def test_level_time_limit_driven_by_ticks(self):
+        """测试关卡时间限制由tick驱动"""
+        game = HeadlessGame(tick_ms=5000)
+        game.reset(game_mode="level", level_id=11)
+        self.assertEqual(game.engine.level_manager.get_time_remaining(), 120)
+
+        # 120秒的时间限制约为24个tick，远不足以让游戏先结束
+        ticks = game.run(max_ticks=1000)
+        self.assertTrue(game.engine.game_state.level_failed)
+        self.assertFalse(game.engine.game_state.game_over)
+        self.assertEqual(ticks, 24)
+
+    def test_level_speed(self):
+        """测试按关卡速度倍数加快重力"""
+        def ticks_to_first_drop(level_speed):
+            state = self.game.reset(game_mode="level", level_id=11, seed=1, level_speed=level_speed)
+            _, start_y = state.get_piece_position()
+            ticks = 0
+            while state.get_piece_position()[1] == start_y:
+                self.game.step()
+                ticks += 1
+            return ticks
+
+        # 关卡11的速度倍数为2.0，下落间隔从1000ms缩短为500ms
+        self.assertEqual(ticks_to_first_drop(False), 11)
+        self.assertEqual(ticks_to_first_drop(True), 6)
+        # 复用同一个游戏时倍数不会残留
+        self.assertEqual(ticks_to_first_drop(False), 11)
+        self.game.reset()
+        self.assertEqual(self.game.engine.speed_multiplier, 1.0)
+
+    def test_level_manager_does_not_persist(self):
+        """测试仿真使用的关卡管理器不读写进度文件"""
+        manager = self.game.engine.level_manager
+        self.assertIsInstance(manager, LevelManager)
+        self.assertFalse(manager.persist_progress)
+        self.assertEqual(manager.completed_levels, [])
+
+    def test_no_pygame_import(self):
+        """测试无界面模式不导入pygame"""
+        code = ("import sys; from core.headless import HeadlessGame; "
+                "game = HeadlessGame(); game.reset(); game.step(); "
+                "print('pygame' in sys.modules)")
+        output = subprocess.check_output([sys.executable, "-c", code], cwd=SRC_DIR)
+        self.assertEqual(output.decode().strip(), "False")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+分层渲染器的单元测试
+"""
+
+import unittest
+from unittest.mock import patch
+import random
+import sys
+import os
+
+# 使用无窗口的视频驱动
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+# 添加src目录到Python路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import pygame
+from config.game_config import GameConfig
+from core.board import Board
+from core.bit_board import BitBoard
+from core.headless import HeadlessGame
+from core.piece import Piece
+from ui.renderer import Renderer, create_renderer
+from ui.layered_renderer import LayeredRenderer
+from utils.font_utils import FontManager
+
+
+class TestLayeredRenderer(unittest.TestCase):
+    """分层渲染器的单元测试"""
+    # 测试思路说明：
+    # 1. 每一帧的画面与全屏重绘的Renderer逐像素一致。
+    # 2. 放置方块和消行时Board/BitBoard的version递增，放置失败或没有消行时不变。
+    # 3. 棋盘层只在version变化或换了新的游戏板时重建。
+
+    @classmethod
+    def setUpClass(cls):
+        pygame.init()
+        # 不读写用户目录下的字体索引文件
+        cls.font_index_patch = patch.object(FontManager, "INDEX_PATH", None)
+        cls.font_index_patch.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.font_index_patch.stop()
+
+    def setUp(self):
+        """测试前的设置"""
+        self.config = GameConfig()
+        size = (self.config.SCREEN_WIDTH, self.config.SCREEN_HEIGHT)
+        self.full = Renderer(pygame.Surface(size), self.config)
+        self.layered = LayeredRenderer(pygame.Surface(size), self.config)
+        self.game = HeadlessGame(tick_ms=50)
+        self.game.reset(seed=11)
+
+    def render_and_compare(self):
+        """两个渲染器各渲染一帧，检查画面一致"""
+        engine = self.game.engine
+        self.full.render_frame(engine.board, engine.game_state)
+        self.layered.render_frame(engine.board, engine.game_state)
+        self.assertEqual(pygame.image.tobytes(self.layered.screen, "RGB"),
+                         pygame.image.tobytes(self.full.screen, "RGB"))
+
+    def test_matches_full_render(self):
+        """测试随机对局中每帧都与全屏重绘一致"""
+        rng = random.Random(2)
+        for _ in range(300):
+            self.game.step(rng.choice(HeadlessGame.ACTIONS))
+            self.render_and_compare()
+            if self.game.is_done():
+                break
+
+    def test_board_version(self):
+        """测试游戏板版本号"""
+        for board in (Board(10, 20), BitBoard(10, 20)):
+            self.assertEqual(board.version, 0)
+            self.assertTrue(board.place_piece(Piece('O'), 0, 18))
+            self.assertEqual(board.version, 1)
+            self.assertFalse(board.place_piece(Piece('O'), 0, 18))
+            self.assertEqual(board.clear_lines(), 0)
+            self.assertEqual(board.version, 1)
+
+            for x in range(2, 10, 2):
+                board.place_piece(Piece('O'), x, 18)
+            self.assertEqual(board.clear_lines(), 2)
+            self.assertEqual(board.version, 6)
+
+    def test_rebuild_only_on_change(self):
+        """测试棋盘层只在网格变化时重建"""
+        engine = self.game.engine
+        for _ in range(5):
+            self.render_and_compare()
+        self.assertEqual(self.layered.layer_rebuilds, 1)
+
+        # 方块移动不重建，放置后重建
+        engine.handle_piece_movement(1, 0)
+        self.render_and_compare()
+        self.assertEqual(self.layered.layer_rebuilds, 1)
+        while engine.drop_piece():
+            pass
+        engine.place_current_piece()
+        self.render_and_compare()
+        self.assertEqual(self.layered.layer_rebuilds, 2)
+
+        # 重置游戏后换了新的游戏板
+        self.game.reset(seed=12)
+        self.render_and_compare()
+        self.assertEqual(self.layered.layer_rebuilds, 3)
+
+    def test_create_renderer(self):
+        """测试按配置创建渲染器"""
+        self.config.RENDER_MODE = "layered"
+        self.assertIsInstance(create_renderer(pygame.Surface((10, 10)), self.config), LayeredRenderer)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+主菜单的单元测试
+"""
+
+import unittest
+from unittest.mock import patch
+import sys
+import os
+
+# 使用无窗口的视频驱动
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+# 添加src目录到Python路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import pygame
+from config.game_config import GameConfig
+from ui.main_menu import MainMenu
+from utils.font_utils import FontManager
+
+
+class TestMainMenu(unittest.TestCase):
+    """主菜单的单元测试"""
+    # 测试思路说明：
+    # 1. 所有说明文字都完整显示在屏幕内、按钮下方，互不重叠。
+    # 2. 按数字键选择对应的模式。
+
+    @classmethod
+    def setUpClass(cls):
+        pygame.init()
+        # 不读写用户目录下的字体索引文件
+        cls.font_index_patch = patch.object(FontManager, "INDEX_PATH", None)
+        cls.font_index_patch.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.font_index_patch.stop()
+
+    def setUp(self):
+        """测试前的设置"""
+        self.screen = pygame.Surface((GameConfig.SCREEN_WIDTH, GameConfig.SCREEN_HEIGHT))
+        self.menu = MainMenu(self.screen)
+
+    def test_instructions_visible(self):
+        """测试说明文字都在屏幕内且不与按钮重叠"""
+        self.menu.render()
+        layout = self.menu._layout_instructions()
+        self.assertEqual(len(layout), len(MainMenu.INSTRUCTIONS))
+
+        buttons_bottom = max(button["y"] for button in self.menu.buttons) + 50
+        screen_rect = self.screen.get_rect()
+        rects = [text.get_rect(topleft=position) for text, position in layout]
+        for instruction, rect in zip(MainMenu.INSTRUCTIONS, rects):
+            self.assertTrue(screen_rect.contains(rect), instruction)
+            self.assertGreater(rect.top, buttons_bottom, instruction)
+        for index, rect in enumerate(rects):
+            self.assertEqual(rect.collidelist(rects[index + 1:]), -1)
+
+    def test_number_keys(self):
+        """测试数字键选择模式"""
+        for key, action in ((pygame.K_1, "classic"), (pygame.K_2, "level"), (pygame.K_3, "ai")):
+            event = pygame.event.Event(pygame.KEYDOWN, key=key)
+            self.assertEqual(self.menu.handle_input(event), action)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -239,6 +239,19 @@ class TestPiece(unittest.TestCase):
         self.piece_t.rotate()
         self.assertEqual(self.piece_t.shape, [[0, 1], [1, 1], [0, 1]])
 
+    
+    def test_piece_copy(self):
+        """测试复制方块"""
+        self.piece_t.rotate()
+        clone = self.piece_t.copy()
+        self.assertEqual((clone.type, clone.rotation, clone.color), ('T', 1, self.piece_t.color))
+        self.assertIs(clone.geometry, self.piece_t.geometry)
+        
+        # 旋转复制品不影响原方块
+        clone.rotate()
+        self.assertEqual(self.piece_t.rotation, 1)
+        self.assertEqual(self.piece_t.shape, [[1, 0], [1, 1], [1, 0]])
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+方块几何表的单元测试
+"""
+
+import unittest
+import sys
+import os
+
+# 添加src目录到Python路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from core.piece import Piece
+from core.piece_geometry import (PIECE_GEOMETRY, ROTATION_COUNTS, WALL_KICK_OFFSETS,
+                                 get_geometry, get_next_geometry)
+from utils.constants import PIECE_SHAPES
+
+
+class TestPieceGeometry(unittest.TestCase):
+    """方块几何表的单元测试"""
+    # 测试思路说明：
+    # 1. 几何表与PIECE_SHAPES一一对应：格子、包围盒、行掩码、列高度、占用范围均由形状矩阵推出。
+    # 2. 几何表只读，不能被修改。
+    # 3. Piece旋转时几何数据与shape保持同步，且不分配新的形状对象。
+
+    def test_table_covers_all_shapes(self):
+        """测试几何表覆盖所有方块和旋转状态"""
+        self.assertEqual(set(PIECE_GEOMETRY.keys()), set(PIECE_SHAPES.keys()))
+        for piece_type, shapes in PIECE_SHAPES.items():
+            self.assertEqual(ROTATION_COUNTS[piece_type], len(shapes))
+            for rotation, shape in enumerate(shapes):
+                geometry = get_geometry(piece_type, rotation)
+                self.assertEqual(geometry.width, len(shape[0]))
+                self.assertEqual(geometry.height, len(shape))
+                self.assertEqual(len(geometry.cells), 4)
+                for col, row in geometry.cells:
+                    self.assertEqual(shape[row][col], 1)
+
+    def test_t_piece_geometry(self):
+        """测试T型方块的几何数据"""
+        # [[0, 1, 0],
+        #  [1, 1, 1]]
+        geometry = get_geometry('T', 0)
+        self.assertEqual(geometry.cells, ((1, 0), (0, 1), (1, 1), (2, 1)))
+        self.assertEqual(geometry.row_masks, (0b010, 0b111))
+        self.assertEqual(geometry.column_heights, (1, 2, 1))
+        self.assertEqual(geometry.column_bottoms, (1, 1, 1))
+        self.assertEqual((geometry.left, geometry.right, geometry.bottom), (0, 2, 1))
+        self.assertEqual(geometry.filled_rows, ((0, 0b010), (1, 0b111)))
+
+        # [[1, 1, 1],
+        #  [0, 1, 0]]
+        geometry = get_geometry('T', 2)
+        self.assertEqual(geometry.column_heights, (2, 2, 2))
+        self.assertEqual(geometry.column_bottoms, (0, 1, 0))
+
+    def test_next_geometry_wraps(self):
+        """测试旋转到最后一个状态后回到初始状态"""
+        for piece_type in PIECE_SHAPES:
+            geometry = get_geometry(piece_type, 0)
+            for _ in range(ROTATION_COUNTS[piece_type]):
+                geometry = get_next_geometry(geometry)
+            self.assertIs(geometry, get_geometry(piece_type, 0))
+
+    def test_table_is_read_only(self):
+        """测试几何表不可修改"""
+        with self.assertRaises(TypeError):
+            PIECE_GEOMETRY['T'] = ()
+        with self.assertRaises(AttributeError):
+            get_geometry('T', 0).width = 5
+        self.assertIsInstance(WALL_KICK_OFFSETS, tuple)
+
+    def test_piece_uses_shared_geometry(self):
+        """测试Piece旋转时共享几何表中的对象"""
+        piece = Piece('J')
+        for rotation in (1, 2, 3, 0):
+            piece.rotate()
+            self.assertEqual(piece.rotation, rotation)
+            self.assertIs(piece.geometry, get_geometry('J', rotation))
+            self.assertIs(piece.shape, PIECE_SHAPES['J'][rotation])
+            self.assertEqual(piece.get_dimensions(),
+                             (piece.geometry.width, piece.geometry.height))
+
+
+if __name__ == '__main__':
+    unittest.main()
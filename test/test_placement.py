@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+PlacementFinder类的单元测试
+"""
+
+import unittest
+import sys
+import os
+
+# 添加src目录到Python路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from core.board import Board
+from core.bit_board import BitBoard
+from core.piece import Piece
+from core.collision import CollisionDetector
+from core.placement import PlacementFinder
+from core.game_engine import GameEngine
+from config.game_config import GameConfig
+from utils.constants import PIECE_SHAPES
+
+
+class TestPlacementFinder(unittest.TestCase):
+    """PlacementFinder类的单元测试"""
+    # 测试思路说明：
+    # 1. 空棋盘上各方块的落点数量等于每个旋转状态的可选列数之和（去重后）。
+    # 2. 每个落点的操作序列用CollisionDetector和Board逐步执行后，能到达该落点且无法再下落。
+    # 3. 可以找到需要在悬空块下方横移才能到达的落点。
+    # 4. 搜索不修改方块和棋盘。
+
+    def setUp(self):
+        """测试前的设置"""
+        self.finder = PlacementFinder()
+        self.board = Board(10, 20)
+
+    def follow_path(self, board, piece_type, x, y, path):
+        """按操作序列移动一个新方块，返回最终(x, y, 旋转)"""
+        piece = Piece(piece_type)
+        detector = CollisionDetector()
+        for action in path:
+            if action == "rotate":
+                ok, (x, y) = detector.can_rotate(piece, board, x, y)
+            else:
+                dx, dy = {"move_left": (-1, 0), "move_right": (1, 0), "move_down": (0, 1)}[action]
+                ok = board.is_valid_position(piece, x + dx, y + dy)
+                if ok:
+                    x, y = x + dx, y + dy
+            self.assertTrue(ok)
+        return x, y, piece.rotation
+
+    def test_empty_board_counts(self):
+        """测试空棋盘上的落点数量"""
+        expected = {'I': 7 + 10, 'O': 9, 'T': 8 + 9 + 8 + 9, 'S': 8 + 9, 'Z': 8 + 9,
+                    'J': 8 + 9 + 8 + 9, 'L': 8 + 9 + 8 + 9}
+        for piece_type in PIECE_SHAPES:
+            placements = self.finder.find_placements(self.board, Piece(piece_type), 4, 0)
+            self.assertEqual(len(placements), expected[piece_type], piece_type)
+            for placement in placements:
+                self.assertEqual(placement.y + placement.geometry.height, 20)
+
+    def test_paths_reach_placements(self):
+        """测试操作序列能到达对应落点"""
+        for i in range(0, 8, 2):
+            self.board.place_piece(Piece('O'), i, 18)
+        self.board.place_piece(Piece('T'), 3, 16)
+
+        for piece_type in PIECE_SHAPES:
+            for placement in self.finder.find_placements(self.board, Piece(piece_type), 4, 0):
+                final = self.follow_path(self.board, piece_type, 4, 0, placement.path)
+                self.assertEqual(final, (placement.x, placement.y, placement.rotation))
+                self.assertFalse(self.board.is_valid_geometry(placement.geometry,
+                                                              placement.x, placement.y + 1))
+
+    def test_tuck_under_overhang(self):
+        """测试横移到悬空块下方的落点"""
+        # 第16行的0-5列形成悬空，下方17-19行为空
+        for col in range(0, 6):
+            self.board.grid[16][col] = (255, 0, 0)
+
+        placements = self.finder.find_placements(self.board, Piece('O'), 6, 0)
+        positions = {(p.x, p.y) for p in placements}
+        self.assertIn((0, 18), positions)
+        path = [p for p in placements if (p.x, p.y) == (0, 18)][0].path
+        self.assertIn("move_left", path)
+        self.assertEqual(path.count("move_left"), 6)
+
+    def test_no_mutation_and_dedup(self):
+        """测试不修改方块和棋盘，落点不重复"""
+        board = BitBoard(10, 20)
+        piece = Piece('S')
+        piece.rotate()
+        placements = self.finder.find_placements(board, piece, 4, 0)
+        self.assertEqual(piece.rotation, 1)
+        self.assertEqual(board.rows, [0] * 20)
+
+        cell_sets = [frozenset(p.get_cells()) for p in placements]
+        self.assertEqual(len(cell_sets), len(set(cell_sets)))
+
+    def test_blocked_spawn(self):
+        """测试出生位置无效时没有落点"""
+        self.board.place_piece(Piece('O'), 4, 0)
+        self.assertEqual(self.finder.find_placements(self.board, Piece('O'), 4, 0), [])
+
+    def test_engine_get_placements(self):
+        """测试引擎获取当前方块的落点"""
+        engine = GameEngine(GameConfig(), seed=1)
+        engine.spawn_new_piece()
+        placements = engine.get_placements()
+        self.assertGreater(len(placements), 0)
+
+        # 步数最少的落点就是直接下落
+        x, _ = engine.game_state.get_piece_position()
+        self.assertEqual(placements[0].x, x)
+        self.assertEqual(placements[0].path, ("move_down",) * placements[0].y)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+帧时间分析器的单元测试
+"""
+
+import unittest
+from unittest.mock import patch
+import csv
+import json
+import tempfile
+import sys
+import os
+
+# 使用无窗口的视频驱动
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+# 添加src目录到Python路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import pygame
+from config.game_config import GameConfig
+from ui.dirty_renderer import DirtyRectRenderer
+from utils.font_utils import FontManager
+from utils.profiler import FrameProfiler
+from utils.text_cache import get_text_cache
+
+
+class FakeTimer:
+    """可控的计时器，代替time.perf_counter"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestProfiler(unittest.TestCase):
+    """帧时间分析器的单元测试"""
+    # 测试思路说明：
+    # 1. 用可控的计时器模拟每帧各阶段耗时，检查记录、FPS、百分位数和最慢阶段。
+    # 2. 环形缓冲只保留最近的帧。
+    # 3. 未启用时不记录；切换叠加显示时开始或停止记录。
+    # 4. CSV和JSON导出的内容与记录一致。
+    # 5. 叠加显示绘制在屏幕右上角，区域在显示期间不缩小；文字使用单独的缓存，不进入共享的文字缓存。
+
+    @classmethod
+    def setUpClass(cls):
+        pygame.init()
+        # 不读写用户目录下的字体索引文件
+        cls.font_index_patch = patch.object(FontManager, "INDEX_PATH", None)
+        cls.font_index_patch.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.font_index_patch.stop()
+
+    def setUp(self):
+        """测试前的设置"""
+        self.timer = FakeTimer()
+        self.timer_patch = patch("utils.profiler.time.perf_counter", self.timer)
+        self.timer_patch.start()
+        self.profiler = FrameProfiler(capacity=4, enabled=True)
+
+    def tearDown(self):
+        """测试后的清理"""
+        self.timer_patch.stop()
+
+    def run_frame(self, input_ms, update_ms, render_ms, flip_ms, idle_ms=0.0):
+        """模拟一帧：各阶段依次耗时，最后空闲等待"""
+        self.profiler.begin_frame()
+        for section, ms in zip(FrameProfiler.SECTIONS, (input_ms, update_ms, render_ms, flip_ms)):
+            self.timer.now += ms / 1000.0
+            self.profiler.mark(section)
+        self.timer.now += idle_ms / 1000.0
+
+    def test_record_and_stats(self):
+        """测试记录和统计"""
+        self.run_frame(1, 2, 5, 1, idle_ms=11)
+        self.run_frame(1, 4, 3, 1, idle_ms=11)
+        self.profiler.begin_frame()
+
+        frames = self.profiler.get_frames()
+        self.assertEqual(len(frames), 2)
+        self.assertAlmostEqual(frames[0][0], 0.020)
+        self.assertAlmostEqual(frames[1][2], 0.004)
+
+        stats = self.profiler.get_stats()
+        self.assertAlmostEqual(stats["fps"], 50.0)
+        self.assertAlmostEqual(stats["p50_ms"], 20.0)
+        self.assertAlmostEqual(stats["sections_ms"]["render"], 4.0)
+        self.assertEqual(stats["slowest"], "render")
+        self.assertEqual(len(self.profiler.get_overlay_lines()), 3)
+
+    def test_ring_buffer(self):
+        """测试环形缓冲只保留最近的帧"""
+        for index in range(7):
+            self.run_frame(0, 0, index + 1, 0)
+        self.profiler.begin_frame()
+
+        frames = self.profiler.get_frames()
+        self.assertEqual(self.profiler.total_frames, 7)
+        self.assertEqual([round(frame[3] * 1000) for frame in frames], [4, 5, 6, 7])
+        # p99取最慢的一帧，p50取中间偏小的一帧
+        self.assertAlmostEqual(self.profiler.get_stats()["p99_ms"], 7.0)
+        self.assertAlmostEqual(self.profiler.get_stats()["p50_ms"], 5.0)
+
+    def test_disabled(self):
+        """测试未启用时不记录"""
+        profiler = FrameProfiler(enabled=False)
+        profiler.begin_frame()
+        profiler.mark("input")
+        profiler.begin_frame()
+        self.assertEqual(profiler.count, 0)
+        self.assertIsNone(profiler.get_stats()["slowest"])
+        self.assertIsNone(profiler.render_overlay(pygame.Surface((100, 100)), pygame.font.Font(None, 24)))
+
+        profiler.toggle_overlay()
+        self.assertTrue(profiler.enabled)
+        profiler.toggle_overlay(keep_recording=True)
+        self.assertTrue(profiler.enabled)
+        profiler.toggle_overlay()
+        profiler.toggle_overlay()
+        self.assertFalse(profiler.enabled)
+
+    def test_dump(self):
+        """测试导出CSV和JSON"""
+        self.run_frame(1, 2, 3, 4, idle_ms=10)
+        self.profiler.begin_frame()
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            csv_path = os.path.join(temp_dir, "frames.csv")
+            json_path = os.path.join(temp_dir, "frames.json")
+            self.profiler.dump(csv_path)
+            self.profiler.dump(json_path)
+
+            with open(csv_path, newline='', encoding='utf-8') as f:
+                rows = list(csv.reader(f))
+            self.assertEqual(rows[0], ["frame", "frame_ms", "input_ms", "update_ms", "render_ms", "flip_ms"])
+            self.assertEqual([float(value) for value in rows[1]], [0, 20, 1, 2, 3, 4])
+
+            with open(json_path, encoding='utf-8') as f:
+                data = json.load(f)
+            self.assertEqual(data["frames"], [[20, 1, 2, 3, 4]])
+            self.assertEqual(data["stats"]["slowest"], "flip")
+
+    def test_overlay(self):
+        """测试叠加显示"""
+        config = GameConfig()
+        screen = pygame.Surface((config.SCREEN_WIDTH, config.SCREEN_HEIGHT))
+        font = pygame.font.Font(None, 24)
+        self.profiler.toggle_overlay()
+        self.run_frame(1, 20, 3, 4)
+        self.profiler.begin_frame()
+
+        shared_cache = get_text_cache()
+        misses = shared_cache.misses
+        rect = self.profiler.render_overlay(screen, font)
+        self.assertEqual(shared_cache.misses, misses)
+        self.assertLessEqual(len(self.profiler._text_cache._surfaces), FrameProfiler.OVERLAY_CACHE_ENTRIES)
+        self.assertEqual(rect.top, 10)
+        self.assertEqual(rect.right, config.SCREEN_WIDTH - 10)
+        # 文字变短后区域不缩小
+        self.profiler.clear()
+        self.assertTrue(self.profiler.render_overlay(screen, font).contains(rect))
+
+        # 叠加显示不与游戏板重叠
+        renderer = DirtyRectRenderer(screen, config)
+        self.assertFalse(rect.colliderect(renderer.board_rect))
+
+
+if __name__ == '__main__':
+    unittest.main()
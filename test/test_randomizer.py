@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+方块序列生成器的单元测试
+"""
+
+import unittest
+import sys
+import os
+
+# 添加src目录到Python路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from core.randomizer import (PieceRandomizer, UniformRandomizer, BagRandomizer, HistoryRandomizer,
+                             create_randomizer)
+from core.game_engine import GameEngine
+from core.headless import HeadlessGame
+from config.game_config import GameConfig
+from utils.constants import PIECE_SHAPES
+
+
+ALL_TYPES = list(PIECE_SHAPES.keys())
+
+
+class TestRandomizer(unittest.TestCase):
+    """方块序列生成器的单元测试"""
+    # 测试思路说明：
+    # 1. 相同种子产生相同序列，reset后从头开始。
+    # 2. peek不消耗队列，且与随后next的结果一致。
+    # 3. 7-bag每袋恰好包含每种方块各一个；历史随机不会连续重复太多。
+    # 4. 只生成可用的方块类型；GameEngine使用自己的生成器并遵守关卡的方块限制；基类PieceRandomizer是抽象类，不能直接创建。
+
+    def draw(self, randomizer, count):
+        """连续取出count个方块"""
+        return [randomizer.next() for _ in range(count)]
+
+    def test_seed_is_deterministic(self):
+        """测试种子决定序列"""
+        for name in ("uniform", "bag", "history"):
+            first = create_randomizer(name, ALL_TYPES, seed=99)
+            second = create_randomizer(name, ALL_TYPES, seed=99)
+            sequence = self.draw(first, 50)
+            self.assertEqual(sequence, self.draw(second, 50))
+
+            first.reset(99)
+            self.assertEqual(self.draw(first, 50), sequence)
+
+    def test_peek_does_not_consume(self):
+        """测试查看后续方块"""
+        randomizer = BagRandomizer(ALL_TYPES, seed=3)
+        preview = randomizer.peek(10)
+        self.assertEqual(len(preview), 10)
+        self.assertEqual(randomizer.peek(10), preview)
+        self.assertEqual(self.draw(randomizer, 10), preview)
+
+    def test_bag_contains_each_piece_once(self):
+        """测试7-bag每袋包含所有方块"""
+        randomizer = BagRandomizer(ALL_TYPES, seed=5)
+        for _ in range(20):
+            self.assertEqual(sorted(self.draw(randomizer, 7)), sorted(ALL_TYPES))
+
+    def test_history_reduces_repeats(self):
+        """测试历史随机减少重复"""
+        def repeats(randomizer):
+            sequence = self.draw(randomizer, 5000)
+            return sum(a == b for a, b in zip(sequence, sequence[1:]))
+
+        self.assertLess(repeats(HistoryRandomizer(ALL_TYPES, seed=1)),
+                        repeats(UniformRandomizer(ALL_TYPES, seed=1)))
+
+    def test_set_piece_types(self):
+        """测试限制可用方块类型"""
+        randomizer = BagRandomizer(ALL_TYPES, seed=11)
+        randomizer.peek(5)
+        randomizer.set_piece_types(["I", "O"])
+        self.assertEqual(set(self.draw(randomizer, 100)), {"I", "O"})
+
+        with self.assertRaises(ValueError):
+            create_randomizer("unknown", ALL_TYPES)
+
+        # 基类没有生成策略，不能直接创建
+        with self.assertRaises(TypeError):
+            PieceRandomizer(ALL_TYPES)
+
+    def test_engine_sequence_is_reproducible(self):
+        """测试相同种子的引擎产生相同的方块序列"""
+        config = GameConfig()
+        config.PIECE_RANDOMIZER = "bag"
+
+        def sequence(seed):
+            engine = GameEngine(config, seed=seed)
+            engine.spawn_new_piece()
+            types = [engine.game_state.current_piece.type]
+            for _ in range(20):
+                engine.spawn_new_piece()
+                types.append(engine.game_state.current_piece.type)
+            return types
+
+        self.assertEqual(sequence(2024), sequence(2024))
+        self.assertEqual(sorted(sequence(2024)[:7]), sorted(ALL_TYPES))
+
+    def test_engine_peek_matches_spawn(self):
+        """测试引擎预览与后续生成一致"""
+        engine = GameEngine(GameConfig(), seed=8)
+        engine.reset_game(seed=8)
+        self.assertEqual(engine.seed, 8)
+        upcoming = engine.peek_pieces(3)
+        for piece_type in upcoming:
+            engine.spawn_new_piece()
+            self.assertEqual(engine.game_state.next_piece.type, piece_type)
+
+    def test_level_piece_types(self):
+        """测试关卡模式只生成关卡允许的方块"""
+        game = HeadlessGame()
+        game.reset(game_mode="level", level_id=14, seed=1)
+        types = set()
+        for _ in range(50):
+            game.engine.spawn_new_piece()
+            types.add(game.engine.game_state.current_piece.type)
+        self.assertEqual(types, {"I", "O"})
+
+
+if __name__ == '__main__':
+    unittest.main()
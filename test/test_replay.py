@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+回放录制和重放的单元测试
+"""
+
+import unittest
+import random
+import tempfile
+import sys
+import os
+
+# 添加src目录到Python路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from core.headless import HeadlessGame
+from core.replay import (ReplayHeader, ReplayRecorder, encode_varint, decode_varint,
+                         encode_header, load_replay, read_replay, replay)
+
+
+class TestReplay(unittest.TestCase):
+    """回放录制和重放的单元测试"""
+    # 测试思路说明：
+    # 1. 变长整数编码往返一致，小数值只占1字节。
+    # 2. 录制器写出的文件可以被完整解析，tick使用增量编码。
+    # 3. 录制一局无界面游戏后重放，最终网格、分数、行数与录制时一致。
+
+    def setUp(self):
+        """测试前的设置"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, "game.trpl")
+
+    def tearDown(self):
+        """测试后的清理"""
+        self.temp_dir.cleanup()
+
+    def test_varint_round_trip(self):
+        """测试变长整数编码"""
+        for value in (0, 1, 127, 128, 300, 2 ** 32 - 1, 2 ** 63):
+            out = bytearray()
+            encode_varint(value, out)
+            self.assertEqual(decode_varint(bytes(out), 0), (value, len(out)))
+
+        out = bytearray()
+        encode_varint(100, out)
+        self.assertEqual(len(out), 1)
+
+    def test_recorder_file_format(self):
+        """测试录制文件格式"""
+        header = ReplayHeader(123456, "level", 7, "bag")
+        recorder = ReplayRecorder(self.path, header)
+        recorder.record("rotate")
+        recorder.next_frame()
+        recorder.next_frame()
+        recorder.record("gravity")
+        recorder.record("reset_game", 99)
+        recorder.next_frame()
+
+        class FinalState:
+            score = 1500
+            lines_cleared = 12
+        recorder.close(FinalState())
+
+        loaded_header, records = load_replay(self.path)
+        self.assertEqual(loaded_header, header)
+        self.assertEqual([(r.tick, r.action, r.payload) for r in records],
+                         [(0, "rotate", ()), (2, "gravity", ()),
+                          (2, "reset_game", (99,)), (3, "end", (1500, 12))])
+
+        # 每条无参数记录只占2字节
+        self.assertEqual(os.path.getsize(self.path),
+                         len(encode_header(header)) + 2 + 2 + 3 + 5)
+
+    def test_invalid_file(self):
+        """测试无效的回放数据"""
+        with self.assertRaises(ValueError):
+            read_replay(b"NOPE")
+
+    def test_record_and_replay_game(self):
+        """测试录制并重放一局游戏"""
+        rng = random.Random(3)
+        game = HeadlessGame(tick_ms=20)
+        game.reset(seed=2024)
+        engine = game.engine
+        recorder = ReplayRecorder(self.path, ReplayHeader(engine.seed, "classic", 1, "uniform"))
+        engine.recorder = recorder
+
+        actions = ["none", "move_left", "move_right", "move_down", "rotate"]
+        while not game.is_done():
+            action = rng.choice(actions)
+            if action != "none":
+                recorder.record(action)
+            game.step(action)
+            recorder.next_frame()
+        recorder.close(engine.game_state)
+
+        result = replay(self.path)
+        self.assertTrue(result.matches)
+        self.assertEqual(result.game_state.score, engine.game_state.score)
+        self.assertEqual(result.game_state.lines_cleared, engine.game_state.lines_cleared)
+        self.assertTrue(result.game_state.game_over)
+        self.assertEqual(result.board.get_grid(), engine.board.get_grid())
+        self.assertEqual(result.ticks, recorder.tick)
+
+
+if __name__ == '__main__':
+    unittest.main()
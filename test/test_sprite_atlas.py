@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+格子图集的单元测试
+"""
+
+import unittest
+from unittest.mock import patch
+import random
+import sys
+import os
+
+# 使用无窗口的视频驱动
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+# 添加src目录到Python路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import pygame
+from config.game_config import GameConfig
+from core.board import Board
+from core.piece import Piece
+from ui.renderer import Renderer
+from ui.sprite_atlas import CellAtlas, get_cell_atlas
+from utils.constants import BLACK, GRAY, PIECE_COLORS
+from utils.font_utils import FontManager
+
+
+def draw_cell(surface, color, rect):
+    """用两次pygame.draw.rect绘制格子（图集之前的画法）"""
+    pygame.draw.rect(surface, color, rect)
+    pygame.draw.rect(surface, BLACK, rect, 1)
+
+
+class TestSpriteAtlas(unittest.TestCase):
+    """格子图集的单元测试"""
+    # 测试思路说明：
+    # 1. 图集中的每个格子与两次pygame.draw.rect画出的格子逐像素一致。
+    # 2. 未预生成的颜色在第一次使用时加入图集，已有的格子不变。
+    # 3. Renderer用图集绘制的游戏板、当前方块和预览方块与逐格绘制的结果一致。
+
+    @classmethod
+    def setUpClass(cls):
+        pygame.init()
+        # 不读写用户目录下的字体索引文件
+        cls.font_index_patch = patch.object(FontManager, "INDEX_PATH", None)
+        cls.font_index_patch.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.font_index_patch.stop()
+
+    def setUp(self):
+        """测试前的设置"""
+        self.config = GameConfig()
+        size = (self.config.SCREEN_WIDTH, self.config.SCREEN_HEIGHT)
+        self.renderer = Renderer(pygame.Surface(size), self.config)
+        self.expected = pygame.Surface(size)
+
+    def assert_same(self, surface, expected):
+        """检查两个表面逐像素一致"""
+        self.assertEqual(pygame.image.tobytes(surface, "RGB"), pygame.image.tobytes(expected, "RGB"))
+
+    def test_cell_sprites(self):
+        """测试图集中的格子画法"""
+        atlas = CellAtlas(30)
+        for color in list(PIECE_COLORS.values()) + [GRAY]:
+            sprite = pygame.Surface((30, 30))
+            atlas.blit_cell(sprite, color, (0, 0))
+            expected = pygame.Surface((30, 30))
+            draw_cell(expected, color, (0, 0, 30, 30))
+            self.assert_same(sprite, expected)
+
+    def test_new_color(self):
+        """测试新颜色加入图集"""
+        atlas = CellAtlas(20)
+        width = atlas.surface.get_width()
+        cyan_area = atlas.get_area(PIECE_COLORS['I'])
+        target = pygame.Surface((60, 20))
+        atlas.blit_cells(target, [((10, 20, 30), (0, 0)), (PIECE_COLORS['I'], (20, 0)), ((10, 20, 30), (40, 0))])
+
+        self.assertEqual(atlas.surface.get_width(), width + 20)
+        self.assertEqual(atlas.get_area(PIECE_COLORS['I']), cyan_area)
+        expected = pygame.Surface((60, 20))
+        draw_cell(expected, (10, 20, 30), (0, 0, 20, 20))
+        draw_cell(expected, PIECE_COLORS['I'], (20, 0, 20, 20))
+        draw_cell(expected, (10, 20, 30), (40, 0, 20, 20))
+        self.assert_same(target, expected)
+
+    def test_shared_atlas(self):
+        """测试按格子大小共享图集"""
+        self.assertIs(get_cell_atlas(30), get_cell_atlas(30))
+        self.assertIsNot(get_cell_atlas(30), get_cell_atlas(20))
+        self.assertIs(self.renderer.cell_atlas, get_cell_atlas(self.config.CELL_SIZE))
+
+    def test_render_matches_draw_rect(self):
+        """测试Renderer的绘制结果与逐格绘制一致"""
+        config = self.config
+        board = Board(config.BOARD_WIDTH, config.BOARD_HEIGHT)
+        rng = random.Random(5)
+        colors = list(PIECE_COLORS.values())
+        for row in range(8, board.height):
+            for col in range(board.width):
+                if rng.random() < 0.6:
+                    board.grid[row][col] = rng.choice(colors)
+
+        piece = Piece('T')
+        next_piece = Piece('L')
+        self.renderer.render_board(board)
+        self.renderer.render_piece(piece, (4, -1))
+        self.renderer.render_next_piece(next_piece)
+
+        size = config.CELL_SIZE
+        pygame.draw.rect(self.expected, GRAY, (config.BOARD_X - 2, config.BOARD_Y - 2,
+                                               config.BOARD_WIDTH * size + 4, config.BOARD_HEIGHT * size + 4))
+        for row in range(board.height):
+            for col in range(board.width):
+                rect = (config.BOARD_X + col * size, config.BOARD_Y + row * size, size, size)
+                if board.grid[row][col]:
+                    draw_cell(self.expected, board.grid[row][col], rect)
+                else:
+                    pygame.draw.rect(self.expected, BLACK, rect, 1)
+        for col, row in piece.geometry.cells:
+            draw_cell(self.expected, piece.color,
+                      (config.BOARD_X + (4 + col) * size, config.BOARD_Y + (row - 1) * size, size, size))
+        preview = Renderer.PREVIEW_CELL_SIZE
+        for col, row in next_piece.geometry.cells:
+            draw_cell(self.expected, next_piece.color,
+                      (Renderer.PREVIEW_X + col * preview, Renderer.PREVIEW_Y + row * preview, preview, preview))
+
+        self.assert_same(self.renderer.screen, self.expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+强化学习环境的单元测试
+"""
+
+import unittest
+import random
+import sys
+import os
+
+# 添加src目录到Python路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+try:
+    import numpy as np
+    from ai.tetris_env import PIECE_IDS, TetrisEnv, VectorTetrisEnv
+except ImportError:
+    np = None
+
+
+@unittest.skipIf(np is None, "需要安装numpy")
+class TestTetrisEnv(unittest.TestCase):
+    """强化学习环境的单元测试"""
+    # 测试思路说明：
+    # 1. 观测与Board.grid和GameState一致，每步原地更新同一组数组。
+    # 2. 奖励等于分数增量，游戏结束或达到最大tick数时done为True；每步返回新的信息字典。
+    # 3. 相同种子和动作序列得到相同的观测。
+    # 4. 多进程环境的结果与逐个运行单个环境一致，结束的环境自动开始新的一局。
+
+    def assert_observation(self, env, observation):
+        """检查观测与游戏状态一致"""
+        board = env.engine.board
+        state = env.engine.game_state
+        expected = [[cell is not None for cell in row] for row in board.grid]
+        self.assertEqual(observation["board"].astype(bool).tolist(), expected)
+
+        piece = state.current_piece
+        x, y = state.get_piece_position()
+        cells = {(x + col, y + row) for col, row in piece.geometry.cells if y + row >= 0}
+        self.assertEqual({(int(col), int(row)) for row, col in zip(*np.nonzero(observation["piece"]))},
+                         cells)
+        self.assertEqual(observation["state"].tolist(),
+                         [PIECE_IDS[piece.type], piece.rotation, x, y, PIECE_IDS[state.next_piece.type],
+                          state.score, state.lines_cleared, state.level])
+
+    def test_observation(self):
+        """测试观测内容和缓冲区复用"""
+        env = TetrisEnv()
+        observation = env.reset(seed=4)
+        buffers = {key: array for key, array in observation.items()}
+        self.assert_observation(env, observation)
+
+        rng = random.Random(4)
+        for _ in range(300):
+            observation, reward, done, info = env.step(rng.randrange(len(TetrisEnv.ACTIONS)))
+            for key, array in observation.items():
+                self.assertIs(array, buffers[key])
+            self.assert_observation(env, observation)
+            if done:
+                env.reset()
+
+        with self.assertRaises(ValueError):
+            env.step("jump")
+
+    def test_reward_and_done(self):
+        """测试奖励和结束标记"""
+        env = TetrisEnv()
+        env.reset(seed=8)
+        total = 0.0
+        done = False
+        infos = []
+        while not done:
+            _, reward, done, info = env.step("hard_drop")
+            infos.append(info)
+            total += reward
+        self.assertTrue(env.engine.game_state.game_over)
+        self.assertEqual(total, info["score"])
+        self.assertFalse(info["truncated"])
+        # 每步返回新的信息字典，保存的信息不会被后面的步骤修改
+        ticks = [saved["ticks"] for saved in infos]
+        self.assertEqual(ticks, sorted(set(ticks)))
+        self.assertEqual(len({id(saved) for saved in infos}), len(infos))
+
+        env = TetrisEnv(max_ticks=30)
+        env.reset(seed=8)
+        steps = 0
+        done = False
+        while not done:
+            _, _, done, info = env.step("none")
+            steps += 1
+        self.assertTrue(info["truncated"])
+        self.assertEqual(steps, -(-30 // env.action_ticks))
+
+    def test_deterministic(self):
+        """测试相同种子的结果相同"""
+        def run(seed):
+            env = TetrisEnv()
+            env.reset(seed)
+            rng = random.Random(1)
+            history = []
+            for _ in range(200):
+                observation, reward, done, _ = env.step(rng.choice(TetrisEnv.ACTIONS))
+                history.append((observation["board"].tobytes(), observation["state"].tobytes(), reward))
+                if done:
+                    env.reset(seed)
+            return history
+
+        self.assertEqual(run(12), run(12))
+
+    def test_vector_env(self):
+        """测试多进程环境"""
+        num_envs = 4
+        rng = random.Random(3)
+        with VectorTetrisEnv(num_envs, num_workers=2) as vector:
+            observation = vector.reset(seed=50)
+            singles = [TetrisEnv() for _ in range(num_envs)]
+            for index, env in enumerate(singles):
+                env.reset(50 + index)
+                self.assertEqual(observation["board"][index].tolist(), env.observation["board"].tolist())
+                self.assertEqual(observation["state"][index].tolist(), env.observation["state"].tolist())
+
+            # 不使用硬降，前几十步不会结束
+            for _ in range(40):
+                actions = [rng.randrange(len(TetrisEnv.ACTIONS) - 1) for _ in range(num_envs)]
+                observation, rewards, dones, infos = vector.step(actions)
+                for index, env in enumerate(singles):
+                    expected, reward, done, info = env.step(actions[index])
+                    self.assertFalse(done)
+                    self.assertEqual(observation["board"][index].tolist(), expected["board"].tolist())
+                    self.assertEqual(observation["piece"][index].tolist(), expected["piece"].tolist())
+                    self.assertEqual(observation["state"][index].tolist(), expected["state"].tolist())
+                    self.assertEqual(rewards[index], reward)
+                    self.assertEqual(infos["score"][index], info["score"])
+
+            # 一直硬降直到游戏结束，结束的环境自动开始新的一局
+            finished = np.zeros(num_envs, dtype=bool)
+            for _ in range(200):
+                observation, _, dones, infos = vector.step(["hard_drop"] * num_envs)
+                for index in np.nonzero(dones)[0]:
+                    finished[index] = True
+                    self.assertEqual(observation["state"][index, 5], 0)
+                    self.assertEqual(int(observation["board"][index].sum()), 0)
+                if finished.all():
+                    break
+            self.assertTrue(finished.all())
+
+            with self.assertRaises(ValueError):
+                vector.step(["none"])
+        self.assertTrue(vector.closed)
+
+
+if __name__ == '__main__':
+    unittest.main()
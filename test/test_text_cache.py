@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+文字渲染缓存的单元测试
+"""
+
+import unittest
+from unittest.mock import patch
+import sys
+import os
+
+# 使用无窗口的视频驱动
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+# 添加src目录到Python路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import pygame
+from config.game_config import GameConfig
+from core.headless import HeadlessGame
+from ui.renderer import Renderer
+from ui.dirty_renderer import DirtyRectRenderer
+from utils.text_cache import TextCache, get_text_cache
+from utils.font_utils import FontManager
+
+WHITE = (255, 255, 255)
+RED = (255, 0, 0)
+
+
+class TestTextCache(unittest.TestCase):
+    """文字渲染缓存的单元测试"""
+    # 测试思路说明：
+    # 1. 相同(字体, 文字, 颜色)只渲染一次，任一项不同都是不同的缓存项。
+    # 2. 超过容量时淘汰最久未使用的项。
+    # 3. 数字字形模式：数字由预渲染字形拼接，测量的尺寸与实际绘制区域一致，计数器变化不产生新的缓存项。
+    # 4. 开启数字字形模式后脏矩形渲染器仍与全屏重绘一致。
+
+    @classmethod
+    def setUpClass(cls):
+        pygame.init()
+        # 不读写用户目录下的字体索引文件
+        cls.font_index_patch = patch.object(FontManager, "INDEX_PATH", None)
+        cls.font_index_patch.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.font_index_patch.stop()
+
+    def setUp(self):
+        """测试前的设置"""
+        self.cache = TextCache(max_entries=3)
+        self.font = pygame.font.Font(None, 36)
+        self.small_font = pygame.font.Font(None, 24)
+
+    def test_render_cached(self):
+        """测试渲染结果缓存"""
+        surface = self.cache.render(self.font, "Score: 0", WHITE)
+        self.assertIs(self.cache.render(self.font, "Score: 0", WHITE), surface)
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 1))
+
+        self.assertIsNot(self.cache.render(self.font, "Score: 0", RED), surface)
+        self.assertIsNot(self.cache.render(self.small_font, "Score: 0", WHITE), surface)
+        self.assertEqual(self.cache.misses, 3)
+
+        self.cache.clear()
+        self.assertEqual((self.cache.hits, self.cache.misses), (0, 0))
+
+    def test_lru_eviction(self):
+        """测试按最久未使用淘汰"""
+        first = self.cache.render(self.font, "a", WHITE)
+        self.cache.render(self.font, "b", WHITE)
+        self.cache.render(self.font, "c", WHITE)
+        # 访问a后，最久未使用的是b
+        self.cache.render(self.font, "a", WHITE)
+        self.cache.render(self.font, "d", WHITE)
+
+        self.assertIs(self.cache.render(self.font, "a", WHITE), first)
+        misses = self.cache.misses
+        self.cache.render(self.font, "b", WHITE)
+        self.assertEqual(self.cache.misses, misses + 1)
+
+    def test_digit_glyphs(self):
+        """测试数字字形拼接"""
+        cache = TextCache()
+        target = pygame.Surface((400, 100))
+        for value in (0, 7, 1234, 99999):
+            text = f"Time: {value}s"
+            rect = cache.blit_digits(target, self.font, text, WHITE, (10, 20))
+            self.assertEqual(rect.topleft, (10, 20))
+            self.assertEqual(rect.size, cache.measure(self.font, text, WHITE, digits=True))
+
+        # 只缓存了"Time: "和"s"两个非数字片段，数字字形只渲染一次
+        self.assertEqual(cache.misses, 2)
+        self.assertEqual(len(cache.get_digit_glyphs(self.font, WHITE)), 10)
+        self.assertEqual(cache.blit_digits(target, self.font, "", WHITE, (0, 0)).width, 0)
+
+    def test_shared_cache(self):
+        """测试共享缓存"""
+        self.assertIs(get_text_cache(), get_text_cache())
+
+    def test_dirty_renderer_with_digit_glyphs(self):
+        """测试数字字形模式下脏矩形渲染与全屏重绘一致"""
+        config = GameConfig()
+        config.HUD_DIGIT_ATLAS = True
+        size = (config.SCREEN_WIDTH, config.SCREEN_HEIGHT)
+        full = Renderer(pygame.Surface(size), config)
+        dirty = DirtyRectRenderer(pygame.Surface(size), config)
+
+        game = HeadlessGame(tick_ms=50)
+        game.reset(seed=4)
+        state = game.engine.game_state
+        for score in (0, 100, 1500, 20, 20):
+            state.score = score
+            game.step("move_down")
+            full.render_frame(game.engine.board, state)
+            dirty.render_frame(game.engine.board, state)
+            self.assertEqual(pygame.image.tobytes(dirty.screen, "RGB"),
+                             pygame.image.tobytes(full.screen, "RGB"))
+
+
+if __name__ == '__main__':
+    unittest.main()
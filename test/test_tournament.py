@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+锦标赛运行器的单元测试
+"""
+
+import unittest
+import io
+import sys
+import os
+from contextlib import redirect_stdout, redirect_stderr
+
+# 添加src目录到Python路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from ai.tournament import (GameRecord, TournamentStats, game_seed, get_distribution, main,
+                           make_tasks, parse_levels, play_game, run_tournament)
+
+
+class TestTournament(unittest.TestCase):
+    """锦标赛运行器的单元测试"""
+    # 测试思路说明：
+    # 1. 对局种子只由基础种子、关卡、机器人和局序号决定，相同种子的对局结果相同。
+    # 2. 多进程运行的结果与单进程运行一致（按种子排序后比较）。
+    # 3. 汇总结果的完成情况、星级和分布统计正确。
+    # 4. 只有加--level-speed时对局才按关卡速度倍数运行，输出中才显示速度倍数。
+
+    def test_game_seed(self):
+        """测试对局种子"""
+        self.assertEqual(game_seed(0, 1, "ai0", 5), game_seed(0, 1, "ai0", 5))
+        seeds = {game_seed(base, level, bot, index)
+                 for base in (0, 1) for level in (1, 2) for bot in ("ai0", "random")
+                 for index in range(10)}
+        self.assertEqual(len(seeds), 80)
+
+    def test_play_game_deterministic(self):
+        """测试相同种子的对局结果相同"""
+        first = play_game(1, "random", 42, max_ticks=2000)
+        self.assertEqual(play_game(1, "random", 42, max_ticks=2000), first)
+        self.assertEqual(first.level_id, 1)
+        self.assertIn(first.outcome, ("game_over", "timeout"))
+
+        record = play_game(1, "ai0", 7, max_ticks=30000)
+        self.assertEqual(record.outcome, "complete")
+        self.assertGreaterEqual(record.lines, 5)
+        self.assertGreaterEqual(record.stars, 1)
+
+    def test_pool_matches_single_process(self):
+        """测试多进程结果与单进程一致"""
+        tasks = make_tasks([1, 2], ["random"], 3, base_seed=9, max_ticks=1500)
+        self.assertEqual(len(tasks), 6)
+        single = sorted(run_tournament(tasks, workers=1))
+        pooled = sorted(run_tournament(tasks, workers=2))
+        self.assertEqual(pooled, single)
+
+    def test_stats(self):
+        """测试汇总结果"""
+        stats = TournamentStats(tick_ms=100)
+        for index, (score, stars, outcome) in enumerate([(100, 0, "game_over"), (900, 1, "complete"),
+                                                         (500, 3, "complete"), (300, 0, "failed")]):
+            stats.add(GameRecord(3, "ai0", index, score, index, index * 10, stars, outcome))
+        stats.add(GameRecord(1, "random", 0, 0, 0, 5, 0, "timeout"))
+
+        first, second = stats.get_summaries()
+        self.assertEqual((first.level_id, first.bot, first.games), (1, "random", 1))
+        self.assertEqual(second.games, 4)
+        self.assertEqual(second.outcomes, {"complete": 2, "failed": 1, "game_over": 1, "timeout": 0})
+        self.assertEqual(second.stars, {0: 2, 1: 1, 2: 0, 3: 1})
+        self.assertEqual(second.score.mean, 450)
+        self.assertEqual((second.score.minimum, second.score.p50, second.score.maximum), (100, 500, 900))
+        self.assertEqual(second.seconds.maximum, 3.0)
+
+        dist = get_distribution(range(1, 101))
+        self.assertEqual((dist.p10, dist.p50, dist.p90), (11, 51, 91))
+        self.assertEqual(get_distribution([]).mean, 0.0)
+
+    def test_parse_levels_and_main(self):
+        """测试关卡列表解析和命令行输出"""
+        self.assertEqual(parse_levels("1-3,11"), [1, 2, 3, 11])
+        with self.assertRaises(ValueError):
+            parse_levels("0")
+
+        output = io.StringIO()
+        with redirect_stdout(output), redirect_stderr(io.StringIO()):
+            self.assertEqual(main(["--levels", "2", "--bots", "random", "--games", "2",
+                                   "--workers", "1", "--max-ticks", "500"]), 0)
+        self.assertIn("关卡 2", output.getvalue())
+        self.assertIn("[random]", output.getvalue())
+        self.assertNotIn("速度x", output.getvalue())
+
+        output = io.StringIO()
+        with redirect_stdout(output), redirect_stderr(io.StringIO()):
+            self.assertEqual(main(["--levels", "2", "--bots", "random", "--games", "2",
+                                   "--workers", "1", "--max-ticks", "500", "--level-speed"]), 0)
+        self.assertIn("速度x0.9", output.getvalue())
+
+    def test_level_speed(self):
+        """测试关卡速度倍数只在level_speed为True时生效"""
+        # 关卡20的速度倍数为3.0，不操作时方块堆满得更快
+        normal = play_game(20, "random", 3, max_ticks=36000, action_ms=10 ** 9)
+        fast = play_game(20, "random", 3, max_ticks=36000, action_ms=10 ** 9, level_speed=True)
+        self.assertLess(fast.ticks, normal.ticks)
+        self.assertEqual(play_game(20, "random", 3, max_ticks=36000, action_ms=10 ** 9), normal)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+置换表的单元测试
+"""
+
+import unittest
+import sys
+import os
+
+# 添加src目录到Python路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from ai.player import AIPlayer
+from ai.transposition import TranspositionTable
+from core.game_engine import GameEngine
+from core.piece import Piece
+from config.game_config import GameConfig
+
+
+class TestTranspositionTable(unittest.TestCase):
+    """置换表的单元测试"""
+    # 测试思路说明：
+    # 1. 保存后按键查到得分和落点，未保存的键不命中，命中和未命中分别计数。
+    # 2. 同一个桶中深度大的结果保留在深度优先槽，新的结果进入总是替换槽并计一次替换；
+    #    new_search之后旧结果不再受深度保护；结果数不超过容量。
+    # 3. AI搜索使用置换表：搜索中的重复局面和再次选择落点时命中，置换表很小时选择的落点不变。
+
+    def test_get_and_put(self):
+        """测试保存、查找和计数"""
+        table = TranspositionTable(bits=4)
+        self.assertIsNone(table.get(123))
+        table.put(123, 2, 1.5, (3, 18, 1))
+        entry = table.get(123)
+        self.assertEqual((entry.value, entry.move, entry.depth), (1.5, (3, 18, 1), 2))
+
+        # 同一局面更新结果
+        table.put(123, 1, -0.5)
+        self.assertEqual(table.get(123).value, -0.5)
+        stats = table.stats
+        self.assertEqual((stats.hits, stats.misses, stats.stores, stats.size), (2, 1, 2, 1))
+        self.assertAlmostEqual(stats.hit_rate, 2 / 3)
+        self.assertEqual(stats.capacity, 32)
+
+        table.clear()
+        self.assertIsNone(table.get(123))
+        self.assertEqual(table.stats.size, 0)
+        self.assertEqual(table.hits, 0)
+
+    def test_replacement(self):
+        """测试替换策略"""
+        table = TranspositionTable(bits=2)
+        # 四个键落在同一个桶
+        keys = [1 + (index << 2) for index in range(4)]
+        table.put(keys[0], 3, 0.0)
+        table.put(keys[1], 1, 1.0)
+        table.put(keys[2], 1, 2.0)
+        # 深度大的结果保留，总是替换槽被覆盖
+        self.assertIsNotNone(table.get(keys[0]))
+        self.assertIsNone(table.get(keys[1]))
+        self.assertEqual(table.get(keys[2]).value, 2.0)
+        self.assertEqual(table.replacements, 1)
+
+        # 深度相同或更大时进入深度优先槽，原来的结果降到总是替换槽
+        table.put(keys[3], 3, 3.0)
+        self.assertEqual(table.get(keys[3]).value, 3.0)
+        self.assertEqual(table.get(keys[0]).value, 0.0)
+        self.assertIsNone(table.get(keys[2]))
+
+        # 新一次搜索中深度小的结果也能替换上一次的结果
+        table.new_search()
+        table.put(keys[1], 0, 1.0)
+        self.assertEqual(table.get(keys[1]).value, 1.0)
+        self.assertEqual(table.get(keys[3]).value, 3.0)
+        self.assertIsNone(table.get(keys[0]))
+
+        for key in range(100):
+            table.put(key, key % 3, 0.0)
+        self.assertEqual(table.stats.size, table.capacity)
+        self.assertEqual(table.stats.stores, 105)
+
+    def test_player_uses_table(self):
+        """测试AI搜索命中置换表"""
+        engine = GameEngine(GameConfig(), seed=9)
+        engine.spawn_new_piece()
+        engine.game_state.current_piece = Piece('O')
+        engine.game_state.next_piece = Piece('O')
+        engine.game_state.set_piece_position(4, 0)
+        player = AIPlayer(10, lookahead=2)
+        placement = player.choose_placement(engine)
+        stores = player.table.stores
+        self.assertGreater(stores, 0)
+        # 两个O方块交换放置的列得到相同局面
+        self.assertGreater(player.table.hits, 0)
+
+        # 相同局面直接取出最佳落点
+        hits = player.table.hits
+        self.assertEqual(player.choose_placement(engine), placement)
+        self.assertEqual(player.table.hits, hits + 1)
+        self.assertEqual(player.table.stores, stores)
+
+        # 容量很小的置换表频繁替换，选择的落点不变
+        small = AIPlayer(10, lookahead=2, table=TranspositionTable(bits=2))
+        self.assertEqual(small.choose_placement(engine), placement)
+        self.assertGreater(small.table.replacements, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()